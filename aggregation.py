@@ -0,0 +1,153 @@
+"""
+Fused aggregation engine for the Job Market Explorer
+One call computes every requested statistic, touching each column once:
+numeric columns are converted and NaN-filtered once and all their quantiles
+come from a single partition, while distinct counts, modes and top-k values
+of text columns all come from one count per distinct value
+"""
+
+import re
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Union
+
+NUMERIC_METRICS = {'count', 'sum', 'mean', 'min', 'max', 'median', 'std'}
+CATEGORY_METRICS = {'nunique', 'mode'}
+_QUANTILE_RE = re.compile(r'^(?:q|p)(\d{1,2}(?:\.\d+)?)$')
+_TOP_RE = re.compile(r'^top(\d+)$')
+
+MetricSpec = Union[Dict[str, List[str]], List[str]]
+
+def parse_metrics(metrics: MetricSpec) -> Dict[str, List[str]]:
+    """
+    Normalize a metric request to {column: [metric, ...]}
+
+    Accepts a dict of column -> metrics or a list of 'column:metric' strings.
+    Metrics: count, sum, mean, min, max, median, std, q<NN>/p<NN> (percentile),
+    nunique, mode and top<k>.
+    """
+    if isinstance(metrics, dict):
+        parsed = {column: list(names) for column, names in metrics.items()}
+    else:
+        parsed = {}
+        for item in metrics:
+            column, sep, name = item.rpartition(':')
+            if not sep:
+                raise ValueError(f"Metric '{item}' must look like 'column:metric'")
+            parsed.setdefault(column, []).append(name)
+
+    for column, names in parsed.items():
+        for name in names:
+            if not (name in NUMERIC_METRICS or name in CATEGORY_METRICS
+                    or _QUANTILE_RE.match(name) or _TOP_RE.match(name)):
+                raise ValueError(f"Unknown metric '{name}' for column '{column}'")
+    return parsed
+
+def _numeric_metrics(values: pd.Series, names: List[str]) -> Dict[str, Any]:
+    # Always float64: compact_job_data downcasts whole-number columns such as
+    # Salary to small integers, whose sums would overflow where NumPy
+    # accumulates in the input dtype, and whose min/max would change type
+    array = values.to_numpy(dtype=float, na_value=np.nan)
+    valid = array if values.to_numpy().dtype.kind in 'iub' else array[~np.isnan(array)]
+
+    result = {}
+    count = len(valid)
+    total = valid.sum() if count else 0
+    quantiles = {}
+    for name in names:
+        match = _QUANTILE_RE.match(name)
+        if match:
+            quantiles[name] = float(match.group(1)) / 100
+        elif name == 'median':
+            quantiles[name] = 0.5
+    if quantiles:
+        if count:
+            levels = np.quantile(valid, list(quantiles.values()))
+        else:
+            levels = [np.nan] * len(quantiles)
+        result.update(dict(zip(quantiles, levels)))
+
+    for name in names:
+        if name == 'count':
+            result[name] = count
+        elif name == 'sum':
+            result[name] = total
+        elif name == 'mean':
+            result[name] = total / count if count else np.nan
+        elif name == 'min':
+            result[name] = valid.min() if count else np.nan
+        elif name == 'max':
+            result[name] = valid.max() if count else np.nan
+        elif name == 'std':
+            result[name] = valid.std(ddof=1) if count > 1 else np.nan
+    return result
+
+def _distinct_counts(values: pd.Series):
+    """
+    Every distinct value with its count, in order of first appearance
+
+    Categoricals count their codes directly; they are ordered by first
+    appearance too, so a compacted column ranks ties like the plain column.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.cat.codes.to_numpy()
+        codes = codes[codes >= 0]
+        order = pd.unique(codes)
+        counts = np.bincount(codes, minlength=len(values.cat.categories))[order]
+        return values.cat.categories[order], counts.astype(np.int64)
+    # One hash-count pass; sort=False keeps first-appearance order
+    counted = values.value_counts(sort=False, dropna=True)
+    return counted.index, counted.to_numpy(dtype=np.int64)
+
+def _category_metrics(values: pd.Series, names: List[str]) -> Dict[str, Any]:
+    uniques, counts = _distinct_counts(values)
+
+    ranked = None
+    result = {}
+    for name in names:
+        match = _TOP_RE.match(name)
+        if name == 'nunique':
+            result[name] = int(np.count_nonzero(counts))
+        elif name == 'count':
+            result[name] = int(counts.sum())
+        elif name == 'mode':
+            # Like Series.mode().iloc[0] on plain values: the smallest of the most frequent values
+            tied = np.flatnonzero((counts == counts.max()) & (counts > 0)) if len(counts) else []
+            result[name] = min(uniques[i] for i in tied) if len(tied) else None
+        elif match:
+            if ranked is None:
+                # Rank the per-value counts exactly as value_counts does, so ties
+                # come out in the same order
+                ranked = pd.Series(counts).sort_values(ascending=False, kind='stable')
+                ranked = ranked[ranked > 0]
+            result[name] = {uniques[i]: int(count) for i, count in ranked.head(int(match.group(1))).items()}
+        else:
+            raise ValueError(f"Metric '{name}' needs a numeric column")
+    return result
+
+def aggregate_jobs(df: pd.DataFrame, metrics: MetricSpec) -> Dict[str, Any]:
+    """
+    Compute many statistics over a job DataFrame in one pass per column
+
+    Returns {'rows': <row count>, <column>: {<metric>: value, ...}, ...}.
+    Numeric columns get numeric metrics; nunique/mode/top<k> work on any column.
+    """
+    if hasattr(df, 'df') and isinstance(df.df, pd.DataFrame):
+        df = df.df
+    result = {'rows': len(df)}
+    for column, names in parse_metrics(metrics).items():
+        values = df[column]
+        numeric = [name for name in names if name in NUMERIC_METRICS or _QUANTILE_RE.match(name)]
+        categorical = [name for name in names if name not in numeric]
+        column_result = {}
+        if numeric:
+            if not pd.api.types.is_numeric_dtype(values.dtype):
+                if any(name != 'count' for name in numeric):
+                    raise ValueError(f"Column '{column}' is not numeric")
+                categorical.append('count')
+            else:
+                column_result.update(_numeric_metrics(values, numeric))
+        if categorical:
+            column_result.update(_category_metrics(values, categorical))
+        result[column] = {name: column_result[name] for name in names}
+    return result
@@ -0,0 +1,205 @@
+"""
+Benchmark harness for the Job Market Explorer functions
+Generates synthetic datasets at each requested size, records wall time and
+peak traced memory for every public function, writes the results to JSON and
+compares them with a stored baseline
+
+Usage:
+    python benchmark.py --sizes 10000 100000 --output benchmarks/benchmark_results.json
+    python benchmark.py --sizes 10000 100000 --save-baseline benchmark_baseline.json
+    python benchmark.py --sizes 10000 100000 --baseline benchmark_baseline.json --time-threshold 0.25
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_SIZES = [10_000, 100_000]
+DEFAULT_REPEAT = 3
+DEFAULT_TIME_THRESHOLD = 0.25
+DEFAULT_MEMORY_THRESHOLD = 0.25
+# Timings this short are too noisy to flag as regressions
+MIN_COMPARABLE_SECONDS = 0.005
+# Results go under benchmarks/ (ignored by git) unless --output says otherwise
+DEFAULT_OUTPUT = os.path.join('benchmarks', 'benchmark_results.json')
+# The xlsx export benchmark writes at most this many rows, a realistic
+# dashboard export; full-size exports are measured as Parquet instead
+EXPORT_XLSX_ROWS = 50_000
+
+def _close(fig: Any) -> None:
+    import matplotlib.pyplot as plt
+    plt.close(fig)
+
+def _benchmarks() -> Dict[str, Callable[[Dict[str, Any]], Any]]:
+    """
+    Benchmark name -> callable taking the per-size context
+    """
+    import python_functions as pf
+
+    return {
+        'load_job_data': lambda ctx: pf.load_job_data(ctx['path'], use_cache=False),
+        'filter_jobs': lambda ctx: pf.filter_jobs(ctx['df'], job_title='Engineer', location='New York',
+                                                  min_salary=90000, keyword='python'),
+        'calculate_salary_stats': lambda ctx: pf.calculate_salary_stats(ctx['df']),
+        'get_job_summary': lambda ctx: pf.get_job_summary(ctx['df']),
+        'create_salary_chart': lambda ctx: _close(pf.create_salary_chart(ctx['df'])),
+        'create_location_chart': lambda ctx: _close(pf.create_location_chart(ctx['df'])),
+        'create_experience_chart': lambda ctx: _close(pf.create_experience_chart(ctx['df'])),
+        'export_filtered_data': lambda ctx: pf.export_filtered_data(ctx['df'].head(EXPORT_XLSX_ROWS),
+                                                                    os.path.join(ctx['tmpdir'], 'export.xlsx')),
+        'export_parquet': lambda ctx: pf.export_filtered_data(ctx['df'], os.path.join(ctx['tmpdir'], 'export.parquet'))
+    }
+
+def measure(func: Callable[[], Any], repeat: int = DEFAULT_REPEAT) -> Dict[str, Any]:
+    """
+    Best and median wall time over repeat runs, plus peak traced memory of one extra run
+
+    Memory is measured separately because tracing slows the code down. It
+    covers allocations made through Python and NumPy; memory allocated
+    directly by Arrow is not traced.
+    """
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'seconds': min(timings),
+        'seconds_median': statistics.median(timings),
+        'peak_bytes': int(peak),
+        'repeat': repeat
+    }
+
+def run_benchmarks(sizes: List[int] = DEFAULT_SIZES,
+                   functions: List[str] = None,
+                   repeat: int = DEFAULT_REPEAT,
+                   seed: int = 0) -> Dict[str, Any]:
+    """
+    Run every benchmark at every size and return the results document
+    """
+    from synthetic_data import write_synthetic_jobs
+    import python_functions as pf
+
+    benchmarks = _benchmarks()
+    unknown = set(functions or []) - set(benchmarks)
+    if unknown:
+        raise ValueError(f"Unknown benchmark(s): {', '.join(sorted(unknown))}")
+    names = functions or list(benchmarks)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for size in sizes:
+            path = os.path.join(tmpdir, f"jobs_{size}.csv")
+            write_synthetic_jobs(path, size, seed=seed)
+            ctx = {'path': path, 'tmpdir': tmpdir, 'df': pf.load_job_data(path, use_cache=False)}
+            for name in names:
+                result = measure(lambda: benchmarks[name](ctx), repeat)
+                result.update({'function': name, 'rows': size})
+                results.append(result)
+                print(f"  {name:<26} {size:>10,} rows  {result['seconds']:9.4f} s  "
+                      f"{result['peak_bytes'] / 1024 ** 2:9.1f} MiB", flush=True)
+            del ctx
+            gc.collect()
+
+    return {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'environment': {
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count()
+        },
+        'seed': seed,
+        'results': results
+    }
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any],
+                    time_threshold: float = DEFAULT_TIME_THRESHOLD,
+                    memory_threshold: float = DEFAULT_MEMORY_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Compare each (function, rows) result with the baseline
+
+    A result regresses when its best time exceeds the baseline by more than
+    time_threshold (as a fraction) or its peak memory exceeds the baseline by
+    more than memory_threshold. Returns one row per matched result.
+    """
+    reference = {(item['function'], item['rows']): item for item in baseline.get('results', [])}
+    comparison = []
+    for item in current['results']:
+        base = reference.get((item['function'], item['rows']))
+        if base is None:
+            continue
+        time_ratio = item['seconds'] / base['seconds'] if base['seconds'] > 0 else 1.0
+        memory_ratio = item['peak_bytes'] / base['peak_bytes'] if base['peak_bytes'] > 0 else 1.0
+        slower = (time_ratio > 1 + time_threshold
+                  and max(item['seconds'], base['seconds']) >= MIN_COMPARABLE_SECONDS)
+        comparison.append({
+            'function': item['function'],
+            'rows': item['rows'],
+            'time_ratio': round(time_ratio, 3),
+            'memory_ratio': round(memory_ratio, 3),
+            'regressed': bool(slower or memory_ratio > 1 + memory_threshold)
+        })
+    return comparison
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the Job Market Explorer functions')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--functions', nargs='+')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--baseline', help='compare against this results file')
+    parser.add_argument('--save-baseline', help='also write the results here as the new baseline')
+    parser.add_argument('--time-threshold', type=float, default=DEFAULT_TIME_THRESHOLD)
+    parser.add_argument('--memory-threshold', type=float, default=DEFAULT_MEMORY_THRESHOLD)
+    args = parser.parse_args()
+
+    print("🏁 Running benchmarks...")
+    results = run_benchmarks(args.sizes, args.functions, args.repeat, args.seed)
+    for path in filter(None, [args.output, args.save_baseline]):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results written to {path}")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    comparison = compare_results(results, baseline, args.time_threshold, args.memory_threshold)
+    print(f"\n📊 Compared with {args.baseline}:")
+    for row in comparison:
+        status = '❌' if row['regressed'] else '✅'
+        print(f"  {status} {row['function']:<26} {row['rows']:>10,} rows  "
+              f"time x{row['time_ratio']:.2f}  memory x{row['memory_ratio']:.2f}")
+    regressions = [row for row in comparison if row['regressed']]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond the thresholds")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
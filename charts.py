@@ -0,0 +1,339 @@
+"""
+Chart aggregation and rendering for the Job Market Explorer
+Each chart is split into a cheap aggregation step, which reduces the rows to
+the few numbers a chart draws (group means, value counts, histogram bins), and
+a rendering step that only needs those aggregates. Rendered PNGs are cached on
+disk under a hash of the aggregates and the chart options, and render_charts
+produces several charts in parallel worker processes with a headless backend
+"""
+
+import hashlib
+import io
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from typing import TYPE_CHECKING, Any, Dict, List, Union
+from job_cache import CACHE_DIR_ENV_VAR, DEFAULT_CACHE_DIR, cache_enabled
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+CHART_KINDS = ['salary', 'location', 'experience']
+SALARY_BINS = 10
+DEFAULT_DPI = 300
+DEFAULT_MAX_BYTES = 256 * 1024 ** 2
+# Bump whenever rendering changes so cached images are redrawn
+CHART_VERSION = 1
+
+def _display_available() -> bool:
+    """
+    Whether an interactive plotting backend could open a window here
+    """
+    if sys.platform in ('win32', 'darwin'):
+        return True
+    return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
+def _pyplot():
+    """
+    Import matplotlib.pyplot on first use, choosing the headless Agg backend
+    when no display is present and no backend was configured
+    """
+    if 'matplotlib.pyplot' not in sys.modules and not os.environ.get('MPLBACKEND') and not _display_available():
+        import matplotlib
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+class ChartData:
+    """
+    Chart-ready aggregates: a chart kind plus the named Series it draws
+    """
+
+    def __init__(self, kind: str, parts: Dict[str, pd.Series] = None):
+        self.kind = kind
+        self.parts = parts or {}
+
+    @property
+    def empty(self) -> bool:
+        return not self.parts
+
+    def digest(self) -> str:
+        """
+        Content hash of the aggregates
+        """
+        digest = hashlib.sha1(self.kind.encode('utf-8'))
+        for name, series in sorted(self.parts.items()):
+            digest.update(name.encode('utf-8'))
+            digest.update(json.dumps([str(value) for value in series.index]).encode('utf-8'))
+            digest.update(np.ascontiguousarray(series.to_numpy(dtype=float)).tobytes())
+        return digest.hexdigest()
+
+def _observed_counts(values: pd.Series) -> pd.Series:
+    counts = values.value_counts()
+    # Categorical columns also count categories that no longer occur
+    return counts[counts > 0]
+
+def salary_chart_data(df: pd.DataFrame) -> ChartData:
+    """
+    Mean salary per job title and a 10-bin salary histogram
+    """
+    if df.empty:
+        return ChartData('salary')
+    salary = df['Salary'].to_numpy(dtype=float, na_value=np.nan)
+    counts, edges = np.histogram(salary[~np.isnan(salary)], bins=SALARY_BINS)
+    return ChartData('salary', {
+        'salary_by_title': df.groupby('Job Title', observed=True)['Salary'].mean().sort_values(ascending=True),
+        # Indexed by bin edges; the count after the last edge is always 0
+        'histogram': pd.Series(np.append(counts, 0), index=edges)
+    })
+
+def location_chart_data(df: pd.DataFrame) -> ChartData:
+    """
+    Job counts and mean salary per location
+    """
+    if df.empty:
+        return ChartData('location')
+    return ChartData('location', {
+        'location_counts': _observed_counts(df['Location']),
+        'salary_by_location': df.groupby('Location', observed=True)['Salary'].mean().sort_values(ascending=True)
+    })
+
+def experience_chart_data(df: pd.DataFrame) -> ChartData:
+    """
+    Job counts per experience level
+    """
+    if df.empty:
+        return ChartData('experience')
+    return ChartData('experience', {'experience_counts': _observed_counts(df['Experience'])})
+
+CHART_DATA = {
+    'salary': salary_chart_data,
+    'location': location_chart_data,
+    'experience': experience_chart_data
+}
+
+def chart_data(df: pd.DataFrame, kinds: List[str] = None) -> Dict[str, ChartData]:
+    """
+    Aggregates for several charts from one frame
+    """
+    return {kind: CHART_DATA[kind](df) for kind in (kinds or CHART_KINDS)}
+
+def _draw_salary(plt: Any, data: ChartData) -> 'Figure':
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+
+    # Salary by Job Title
+    data.parts['salary_by_title'].plot(kind='barh', ax=ax1, color='skyblue')
+    ax1.set_title('Average Salary by Job Title')
+    ax1.set_xlabel('Salary ($)')
+    ax1.tick_params(axis='y', labelsize=8)
+
+    # Salary Distribution, drawn from the precomputed bins
+    histogram = data.parts['histogram']
+    edges = histogram.index.to_numpy(dtype=float)
+    ax2.hist(edges[:-1], bins=edges, weights=histogram.to_numpy()[:-1],
+             color='lightgreen', alpha=0.7, edgecolor='black')
+    ax2.set_title('Salary Distribution')
+    ax2.set_xlabel('Salary ($)')
+    ax2.set_ylabel('Frequency')
+    return fig
+
+def _draw_location(plt: Any, data: ChartData) -> 'Figure':
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+
+    # Jobs by Location
+    data.parts['location_counts'].plot(kind='pie', ax=ax1, autopct='%1.1f%%')
+    ax1.set_title('Job Distribution by Location')
+    ax1.set_ylabel('')
+
+    # Average Salary by Location
+    data.parts['salary_by_location'].plot(kind='barh', ax=ax2, color='orange')
+    ax2.set_title('Average Salary by Location')
+    ax2.set_xlabel('Salary ($)')
+    return fig
+
+def _draw_experience(plt: Any, data: ChartData) -> 'Figure':
+    fig, ax = plt.subplots(figsize=(12, 6))
+
+    # Experience distribution
+    data.parts['experience_counts'].plot(kind='bar', ax=ax, color='purple', alpha=0.7)
+    ax.set_title('Job Distribution by Experience Level')
+    ax.set_xlabel('Experience Level')
+    ax.set_ylabel('Number of Jobs')
+    ax.tick_params(axis='x', rotation=45)
+    return fig
+
+DRAW = {
+    'salary': _draw_salary,
+    'location': _draw_location,
+    'experience': _draw_experience
+}
+
+def render_chart(data: ChartData, title: str = None) -> 'Figure':
+    """
+    Draw a chart from its aggregates; title is added as a figure suptitle
+    """
+    plt = _pyplot()
+    if data.empty:
+        fig, ax = plt.subplots(figsize=(10, 6))
+        ax.text(0.5, 0.5, 'No data to display', ha='center', va='center', transform=ax.transAxes)
+        return fig
+    fig = DRAW[data.kind](plt, data)
+    if title:
+        fig.suptitle(title, fontsize=16)
+    plt.tight_layout()
+    return fig
+
+def render_chart_png(data: ChartData, title: str = None, dpi: int = DEFAULT_DPI) -> bytes:
+    """
+    Render a chart to PNG bytes and close its figure
+    """
+    plt = _pyplot()
+    fig = render_chart(data, title=title)
+    try:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight')
+    finally:
+        plt.close(fig)
+    return buffer.getvalue()
+
+class ChartCache:
+    """
+    Size-bounded directory of rendered PNGs keyed by aggregate and option hash
+
+    Least recently used images are evicted once max_bytes is exceeded.
+    """
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        base = os.environ.get(CACHE_DIR_ENV_VAR) or DEFAULT_CACHE_DIR
+        self.cache_dir = cache_dir or os.path.join(base, 'charts')
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(data: ChartData, title: str = None, dpi: int = DEFAULT_DPI) -> str:
+        options = json.dumps({'title': title, 'dpi': dpi, 'version': CHART_VERSION}, sort_keys=True)
+        return hashlib.sha1((data.digest() + options).encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.png")
+
+    def get(self, key: str) -> bytes:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                image = f.read()
+        except OSError:
+            self.misses += 1
+            return None
+        os.utime(path)
+        self.hits += 1
+        return image
+
+    def put(self, key: str, image: bytes) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(image)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.png'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        if os.path.isdir(self.cache_dir):
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.endswith('.png'):
+                    os.remove(entry.path)
+
+    def stats(self) -> Dict[str, Any]:
+        return {'cache_dir': self.cache_dir, 'hits': self.hits, 'misses': self.misses}
+
+def get_default_chart_cache() -> ChartCache:
+    """
+    Chart cache in the job data cache directory, or None when caching is disabled
+    """
+    return ChartCache() if cache_enabled() else None
+
+def _init_worker() -> None:
+    # Workers never open windows. A forked worker inherits the parent's
+    # matplotlib, possibly with pyplot already on a GUI backend, which the
+    # environment variable alone would not change
+    os.environ['MPLBACKEND'] = 'Agg'
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+
+def _render_job(data: ChartData, title: str, dpi: int) -> bytes:
+    return render_chart_png(data, title=title, dpi=dpi)
+
+def render_charts(data: Union[pd.DataFrame, Dict[str, ChartData]],
+                  kinds: List[str] = None,
+                  output_dir: str = '.',
+                  filenames: Dict[str, str] = None,
+                  titles: Dict[str, str] = None,
+                  dpi: int = DEFAULT_DPI,
+                  workers: int = None,
+                  cache: ChartCache = None) -> Dict[str, str]:
+    """
+    Write several charts as PNG files and return {kind: path}
+
+    data is a DataFrame, aggregated once here, or precomputed chart_data
+    output. Images found in the cache (the default cache unless caching is
+    disabled) are copied without rendering; the rest are rendered in up to
+    `workers` processes (default one per chart, capped at the CPU count).
+    Files default to <kind>_analysis.png in output_dir.
+    """
+    if isinstance(data, pd.DataFrame):
+        data = chart_data(data, kinds)
+    kinds = kinds or list(data)
+    titles = titles or {}
+    filenames = filenames or {}
+    cache = cache if cache is not None else get_default_chart_cache()
+
+    images, keys, missing = {}, {}, []
+    for kind in kinds:
+        keys[kind] = ChartCache.key(data[kind], titles.get(kind), dpi)
+        image = cache.get(keys[kind]) if cache is not None else None
+        if image is None:
+            missing.append(kind)
+        else:
+            images[kind] = image
+
+    workers = min(workers or os.cpu_count() or 1, len(missing))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = {kind: pool.submit(_render_job, data[kind], titles.get(kind), dpi) for kind in missing}
+            rendered = {kind: future.result() for kind, future in futures.items()}
+    else:
+        rendered = {kind: _render_job(data[kind], titles.get(kind), dpi) for kind in missing}
+    for kind, image in rendered.items():
+        images[kind] = image
+        if cache is not None:
+            cache.put(keys[kind], image)
+
+    os.makedirs(output_dir or '.', exist_ok=True)
+    paths = {}
+    for kind in kinds:
+        path = os.path.join(output_dir, filenames.get(kind, f"{kind}_analysis.png"))
+        with open(path, 'wb') as f:
+            f.write(images[kind])
+        paths[kind] = path
+    return paths
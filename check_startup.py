@@ -0,0 +1,69 @@
+"""
+Startup budget check for python_functions
+Imports the module in fresh interpreters and fails when plotting libraries are
+loaded eagerly again or when the import costs more than the budget on top of
+pandas and numpy, which every Excel cell pays for anyway
+
+Usage: python check_startup.py [--budget-ms 150] [--runs 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import List
+
+DEFAULT_BUDGET_MS = 150.0
+DEFAULT_RUNS = 5
+# Modules that must only load when a chart is drawn
+LAZY_MODULES = ['matplotlib', 'seaborn']
+
+def _import_seconds(statement: str) -> float:
+    """
+    Wall time of one statement in a fresh interpreter, measured inside it
+    """
+    code = ("import time; start = time.perf_counter(); "
+            f"{statement}; print(time.perf_counter() - start)")
+    output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    return float(output.stdout.strip().splitlines()[-1])
+
+def eagerly_loaded(modules: List[str] = LAZY_MODULES) -> List[str]:
+    """
+    Which of the given modules are already imported after importing python_functions
+    """
+    code = ("import sys, python_functions; "
+            f"print(','.join(m for m in {modules!r} if m in sys.modules))")
+    output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    return [name for name in output.stdout.strip().split(',') if name]
+
+def import_overhead_ms(runs: int = DEFAULT_RUNS) -> float:
+    """
+    Median extra milliseconds python_functions costs over importing pandas and numpy
+    """
+    baseline = [_import_seconds('import pandas, numpy') for _ in range(runs)]
+    module = [_import_seconds('import pandas, numpy; import python_functions') for _ in range(runs)]
+    return (statistics.median(module) - statistics.median(baseline)) * 1000
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS)
+    args = parser.parse_args()
+
+    failed = False
+    loaded = eagerly_loaded()
+    if loaded:
+        print(f"❌ Imported at module load: {', '.join(loaded)}")
+        failed = True
+
+    overhead = import_overhead_ms(args.runs)
+    status = '✅' if overhead <= args.budget_ms else '❌'
+    print(f"{status} python_functions import overhead: {overhead:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    failed = failed or overhead > args.budget_ms
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+Compact in-memory representation of job datasets for the Job Market Explorer
+Low-cardinality text columns become categoricals, numeric columns are
+downcast only where the conversion is lossless and comparisons stay exact,
+and free-text columns can be stored as Arrow-backed strings
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from typing import List
+
+# Set to 0/false/off to load plain (uncompacted) frames by default
+COMPACT_ENV_VAR = 'JOB_EXPLORER_COMPACT'
+# A text column is dictionary-encoded when distinct values / rows is at most this
+MAX_CATEGORY_RATIO = 0.5
+TEXT_COLUMNS = ['Job Description']
+
+def compaction_enabled() -> bool:
+    """
+    Check whether compaction is enabled through the environment
+    """
+    return os.environ.get(COMPACT_ENV_VAR, '1').strip().lower() not in ('0', 'false', 'off', 'no')
+
+def _is_text(values: pd.Series) -> bool:
+    return pd.api.types.is_object_dtype(values.dtype) or pd.api.types.is_string_dtype(values.dtype)
+
+def _arrow_string_dtype():
+    """
+    The Arrow-backed string dtype pandas 3 uses by default, or None without pyarrow
+
+    pandas before 2.3 has no NaN-semantics variant; those versions get the
+    pd.NA-based 'string[pyarrow]' dtype instead.
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return None
+    try:
+        return pd.StringDtype('pyarrow', na_value=np.nan)
+    except TypeError:
+        return pd.StringDtype('pyarrow')
+
+def _downcast_integers(values: pd.Series) -> pd.Series:
+    """
+    Smallest integer dtype holding every value, for integer columns and whole-number
+    float columns without missing values; anything else is returned unchanged
+
+    Floats are never narrowed to float32: NumPy would round comparison bounds to
+    float32 too, so filters could match different rows.
+    """
+    array = values.to_numpy()
+    if array.dtype.kind == 'f':
+        if len(array) == 0 or np.isnan(array).any() or not np.array_equal(array, np.trunc(array)):
+            return values
+    elif array.dtype.kind not in 'iu':
+        return values
+    low, high = (array.min(), array.max()) if len(array) else (0, 0)
+    for dtype in (np.int8, np.int16, np.int32, np.int64):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            if array.dtype == dtype:
+                return values
+            return values.astype(dtype)
+    return values
+
+def compact_job_data(df: pd.DataFrame,
+                     category_columns: List[str] = None,
+                     max_category_ratio: float = MAX_CATEGORY_RATIO,
+                     arrow_strings: bool = False) -> pd.DataFrame:
+    """
+    Return a copy of df with a smaller memory footprint
+
+    Text columns other than Job Description (or exactly category_columns when
+    given) become categoricals when their distinct-value ratio is at most
+    max_category_ratio. Integer columns, and float columns holding only whole
+    numbers without missing values, get the smallest integer dtype that fits.
+    arrow_strings=True stores the remaining text columns as Arrow-backed
+    strings (already the default from pandas 3 on).
+    """
+    if 'Error' in df.columns and len(df.columns) == 1:
+        return df
+    result = df.copy(deep=False)
+    candidates = category_columns if category_columns is not None else \
+        [column for column in df.columns if column not in TEXT_COLUMNS]
+    string_dtype = _arrow_string_dtype() if arrow_strings else None
+
+    for column in df.columns:
+        values = df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            continue
+        if _is_text(values):
+            if column in candidates and len(values) and \
+                    values.nunique(dropna=True) <= max_category_ratio * len(values):
+                result[column] = values.astype('category')
+            elif string_dtype is not None and values.dtype != string_dtype:
+                result[column] = values.astype(string_dtype)
+        elif pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+            result[column] = _downcast_integers(values)
+    return result
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Bytes per column before and after compaction, with a Total row
+
+    after defaults to compact_job_data(before). Sizes include string contents.
+    """
+    if after is None:
+        after = compact_job_data(before)
+    before_bytes = before.memory_usage(index=False, deep=True)
+    after_bytes = after.memory_usage(index=False, deep=True).reindex(before_bytes.index)
+    report = pd.DataFrame({
+        'dtype_before': before.dtypes.astype(str),
+        'bytes_before': before_bytes,
+        'dtype_after': after.dtypes.reindex(before_bytes.index).astype(str),
+        'bytes_after': after_bytes
+    })
+    report.loc['Total'] = ['', int(before_bytes.sum()), '', int(after_bytes.sum())]
+    report['bytes_before'] = report['bytes_before'].astype(np.int64)
+    report['bytes_after'] = report['bytes_after'].astype(np.int64)
+    report['saved_pct'] = (100 * (1 - report['bytes_after'] / report['bytes_before'].where(report['bytes_before'] > 0))).round(1)
+    return report
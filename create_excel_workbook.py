@@ -56,10 +56,14 @@ def create_excel_workbook():
     # Add Python code for loading data
     python_code = """# Load job data
 import pandas as pd
-from python_functions import load_job_data
+from python_functions import load_job_data, prepare_job_data
 
 # Load the sample data
-df = load_job_data('sample_data/jobs_sample.csv')
+data_file = 'sample_data/jobs_sample.csv'
+df = load_job_data(data_file)
+
+# Build the filter and search indexes once; the Filter Controls sheet queries jobs
+jobs = prepare_job_data(df, source_path=data_file)
 df.head(10)"""
     
     ws1['A9'] = python_code
@@ -97,11 +101,11 @@ df.head(10)"""
     ws2['A12'].fill = python_cell_fill
     
     filter_code = """# Apply filters based on control values
-from python_functions import filter_jobs
+from python_functions import cached_filter_jobs
 
-# Get filter values from cells
-filtered_df = filter_jobs(
-    df,
+# Get filter values from cells; unchanged values reuse the previous result
+filtered_df = cached_filter_jobs(
+    jobs,
     job_title=xl("B2"),  # Reference to Job Title filter
     location=xl("B3"),   # Reference to Location filter
     min_salary=xl("B4"), # Reference to Min Salary
@@ -125,11 +129,11 @@ filtered_df"""
     
     # Dashboard sections
     dashboard_sections = [
-        ("A3", "Job Summary", "D2", "get_job_summary(filtered_df)"),
-        ("A6", "Salary Statistics", "D5", "calculate_salary_stats(filtered_df)"),
-        ("A9", "Top Job Titles", "D8", "filtered_df['Job Title'].value_counts().head(5)"),
-        ("A13", "Top Locations", "D12", "filtered_df['Location'].value_counts().head(5)"),
-        ("A17", "Top Companies", "D16", "filtered_df['Company'].value_counts().head(5)")
+        ("A3", "Job Summary", "D2", "cached_job_summary(filtered_df)"),
+        ("A6", "Salary Statistics", "D5", "cached_salary_stats(filtered_df)"),
+        ("A9", "Top Job Titles", "D8", "cached_top_values(filtered_df, 'Job Title', 5)"),
+        ("A13", "Top Locations", "D12", "cached_top_values(filtered_df, 'Location', 5)"),
+        ("A17", "Top Companies", "D16", "cached_top_values(filtered_df, 'Company', 5)")
     ]
     
     for i, (label_cell, title, code_cell, code) in enumerate(dashboard_sections):
@@ -141,7 +145,7 @@ filtered_df"""
         ws3[f'{label_cell[0]}{int(label_cell[1:])+1}'].font = Font(bold=True)
         ws3[f'{label_cell[0]}{int(label_cell[1:])+1}'].fill = python_cell_fill
         
-        ws3[f'{label_cell[0]}{int(label_cell[1:])+2}'] = f"from python_functions import get_job_summary, calculate_salary_stats\n\n{code}"
+        ws3[f'{label_cell[0]}{int(label_cell[1:])+2}'] = f"from python_functions import cached_job_summary, cached_salary_stats, cached_top_values\n\n{code}"
         ws3[f'{label_cell[0]}{int(label_cell[1:])+2}'].fill = python_cell_fill
         ws3[f'{label_cell[0]}{int(label_cell[1:])+2}'].alignment = Alignment(wrap_text=True, vertical='top')
     
@@ -199,15 +203,23 @@ result = export_filtered_data(filtered_df, 'filtered_jobs_export.xlsx')
 result"""
         else:  # Export summary report
             export_code = """import pandas as pd
+from python_functions import aggregate_jobs
+
+# Compute every report statistic in one pass
+stats = aggregate_jobs(filtered_df, {
+    'Salary': ['mean'],
+    'Location': ['mode'],
+    'Company': ['mode']
+})
 
 # Create summary report
 report_data = {
     'Metric': ['Total Jobs', 'Average Salary', 'Top Location', 'Top Company'],
     'Value': [
-        len(filtered_df),
-        f"${filtered_df['Salary'].mean():,.2f}",
-        filtered_df['Location'].mode().iloc[0] if not filtered_df.empty else 'N/A',
-        filtered_df['Company'].mode().iloc[0] if not filtered_df.empty else 'N/A'
+        stats['rows'],
+        f"${stats['Salary']['mean']:,.2f}",
+        stats['Location']['mode'] or 'N/A',
+        stats['Company']['mode'] or 'N/A'
     ]
 }
 
@@ -0,0 +1,436 @@
+"""
+Pre-materialized aggregate cube for the Job Market Explorer
+A JobCube holds one cell per observed combination of Location, Job Title,
+experience band and salary band, with the row count, salary count/sum/min/max
+and a small HyperLogLog sketch of companies. Dashboard queries whose filters
+only touch those dimensions (title/location patterns, salary and experience
+bounds that fall on band edges) are answered from the cells without reading
+any rows. Cells are mergeable, so a saved cube is brought up to date from just
+the rows appended to its source file
+"""
+
+import base64
+import json
+import os
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Tuple
+from incremental import IncrementalJobLoader, hash_ranks, hll_estimate
+from job_cache import CACHE_DIR_ENV_VAR, DEFAULT_CACHE_DIR, _short_hash
+from prepared_data import contains_mask
+from python_functions import normalize_filter_params
+from scenarios import _range_dimension
+
+# Band edges; a bound answerable from the cube must be one of these
+DEFAULT_SALARY_EDGES = [float(edge) for edge in range(0, 400_001, 10_000)]
+DEFAULT_EXPERIENCE_EDGES = [0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 7.0, 10.0, 15.0, 20.0]
+DEFAULT_SKETCH_PRECISION = 8
+CUBE_FORMAT_VERSION = 1
+
+DIMENSIONS = ['Location', 'Job Title', 'Experience_Band', 'Salary_Band']
+MEASURES = ['count', 'salary_count', 'salary_sum', 'salary_min', 'salary_max']
+
+# Bits per dimension in the packed cell key (codes are stored plus one so -1 fits)
+_KEY_BITS = [(40, 24), (16, 24), (8, 8), (0, 8)]
+# Band keys run up to 2 * edges, which must fit in 8 bits
+MAX_EDGES = 126
+
+class CubeMissError(ValueError):
+    """
+    A query the cube cannot answer exactly; run it against the rows instead
+    """
+
+def band_label(edges: List[float], key: int) -> str:
+    """
+    Readable name of a band key from _range_dimension: '100000', '(100000, 110000)' or 'missing'
+    """
+    if key < 0:
+        return 'missing'
+    if key % 2:
+        return f"{edges[key // 2]:g}"
+    low = f"{edges[key // 2 - 1]:g}" if key else '-inf'
+    high = f"{edges[key // 2]:g}" if key // 2 < len(edges) else 'inf'
+    return f"({low}, {high})"
+
+def _bound_key(edges: np.ndarray, value: float, name: str) -> int:
+    position = int(np.searchsorted(edges, value))
+    if position == len(edges) or edges[position] != value:
+        raise CubeMissError(f"{name}={value:g} is not a band edge of the cube")
+    return position
+
+class JobCube:
+    """
+    Mergeable aggregate cube over Location x Job Title x experience band x salary band
+
+    Build with JobCube.build(df) or JobCube().update(df) on cleaned job data;
+    save()/load() keep it on disk. query() and job_summary() accept the
+    filter_jobs arguments except keyword, and raise CubeMissError for
+    anything the cells cannot answer exactly (keywords, or salary/experience
+    bounds that are not band edges). Company counts are HyperLogLog estimates.
+    """
+
+    def __init__(self, salary_edges: List[float] = DEFAULT_SALARY_EDGES,
+                 experience_edges: List[float] = DEFAULT_EXPERIENCE_EDGES,
+                 sketch_precision: int = DEFAULT_SKETCH_PRECISION):
+        self.salary_edges = np.unique(np.asarray(salary_edges, dtype=float))
+        self.experience_edges = np.unique(np.asarray(experience_edges, dtype=float))
+        if max(len(self.salary_edges), len(self.experience_edges)) > MAX_EDGES:
+            raise ValueError(f"At most {MAX_EDGES} band edges per dimension")
+        self.sketch_precision = sketch_precision
+        self.dictionaries: Dict[str, List[str]] = {'Location': [], 'Job Title': []}
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.measures = {name: np.zeros(0, dtype=float) for name in MEASURES}
+        self.registers = np.zeros((0, 1 << sketch_precision), dtype=np.uint8)
+        self.source_state: Dict[str, Any] = {}
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, **options) -> 'JobCube':
+        return cls(**options).update(df)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def rows(self) -> int:
+        return int(self.measures['count'].sum())
+
+    # Building
+
+    def _codes(self, values: pd.Series, dimension: str) -> np.ndarray:
+        """
+        Codes of values in the dimension dictionary, extending it with new values
+        """
+        dictionary = self.dictionaries[dimension]
+        lookup = {value: code for code, value in enumerate(dictionary)}
+        codes, uniques = pd.factorize(values.astype(object) if isinstance(values.dtype, pd.CategoricalDtype)
+                                      else values)
+        mapping = np.empty(len(uniques), dtype=np.int64)
+        for i, value in enumerate(uniques):
+            value = str(value)
+            if value not in lookup:
+                lookup[value] = len(dictionary)
+                dictionary.append(value)
+            mapping[i] = lookup[value]
+        return np.where(codes >= 0, mapping[np.maximum(codes, 0)] if len(mapping) else -1, -1)
+
+    @staticmethod
+    def _pack(parts: List[np.ndarray]) -> np.ndarray:
+        key = np.zeros(len(parts[0]), dtype=np.int64)
+        for values, (shift, _) in zip(parts, _KEY_BITS):
+            key |= (values.astype(np.int64) + 1) << shift
+        return key
+
+    @staticmethod
+    def _unpack(keys: np.ndarray) -> List[np.ndarray]:
+        return [((keys >> shift) & ((1 << bits) - 1)) - 1 for shift, bits in _KEY_BITS]
+
+    def update(self, df: pd.DataFrame) -> 'JobCube':
+        """
+        Fold cleaned rows into the cells
+        """
+        if df.empty:
+            return self
+        salary = df['Salary'].to_numpy(dtype=float, na_value=np.nan)
+        experience = df['Experience_Years'].to_numpy(dtype=float, na_value=np.nan)
+        row_keys = self._pack([
+            self._codes(df['Location'], 'Location'),
+            self._codes(df['Job Title'], 'Job Title'),
+            _range_dimension(experience, self.experience_edges)[0],
+            _range_dimension(salary, self.salary_edges)[0]
+        ])
+
+        keys = np.union1d(self.keys, row_keys)
+        old_cells = np.searchsorted(keys, self.keys)
+        cells = np.searchsorted(keys, row_keys)
+        valid = ~np.isnan(salary)
+
+        measures = {
+            'count': np.zeros(len(keys)),
+            'salary_count': np.zeros(len(keys)),
+            'salary_sum': np.zeros(len(keys)),
+            'salary_min': np.full(len(keys), np.inf),
+            'salary_max': np.full(len(keys), -np.inf)
+        }
+        for name, values in measures.items():
+            values[old_cells] = self.measures[name]
+        measures['count'] += np.bincount(cells, minlength=len(keys))
+        measures['salary_count'] += np.bincount(cells[valid], minlength=len(keys))
+        measures['salary_sum'] += np.bincount(cells[valid], weights=salary[valid], minlength=len(keys))
+        np.minimum.at(measures['salary_min'], cells[valid], salary[valid])
+        np.maximum.at(measures['salary_max'], cells[valid], salary[valid])
+
+        registers = np.zeros((len(keys), self.registers.shape[1]), dtype=np.uint8)
+        registers[old_cells] = self.registers
+        if 'Company' in df.columns:
+            # Each distinct company is hashed once
+            codes, companies = pd.factorize(df['Company'])
+            known = codes >= 0
+            buckets, ranks = hash_ranks(np.asarray(companies, dtype=object), self.sketch_precision)
+            np.maximum.at(registers, (cells[known], buckets[codes[known]]), ranks[codes[known]])
+
+        self.keys, self.measures, self.registers = keys, measures, registers
+        return self
+
+    def merge(self, other: 'JobCube') -> 'JobCube':
+        """
+        Add another cube with the same bands (e.g. built from another file)
+        """
+        if not (np.array_equal(self.salary_edges, other.salary_edges) and
+                np.array_equal(self.experience_edges, other.experience_edges) and
+                self.sketch_precision == other.sketch_precision):
+            raise ValueError("Cannot merge cubes with different bands or sketch precision")
+        # Translate the other cube's dictionary codes into this cube's
+        parts = other._unpack(other.keys)
+        for index, dimension in enumerate(['Location', 'Job Title']):
+            mapping = self._codes(pd.Series(other.dictionaries[dimension], dtype=object), dimension)
+            parts[index] = np.where(parts[index] >= 0, mapping[np.maximum(parts[index], 0)]
+                                    if len(mapping) else -1, -1)
+        other_keys = self._pack(parts)
+
+        keys = np.union1d(self.keys, other_keys)
+        mine, theirs = np.searchsorted(keys, self.keys), np.searchsorted(keys, other_keys)
+        measures = {}
+        for name in MEASURES:
+            fill = np.inf if name == 'salary_min' else -np.inf if name == 'salary_max' else 0.0
+            values = np.full(len(keys), fill)
+            values[mine] = self.measures[name]
+            if name == 'salary_min':
+                values[theirs] = np.minimum(values[theirs], other.measures[name])
+            elif name == 'salary_max':
+                values[theirs] = np.maximum(values[theirs], other.measures[name])
+            else:
+                values[theirs] += other.measures[name]
+            measures[name] = values
+        registers = np.zeros((len(keys), self.registers.shape[1]), dtype=np.uint8)
+        registers[mine] = self.registers
+        registers[theirs] = np.maximum(registers[theirs], other.registers)
+        self.keys, self.measures, self.registers = keys, measures, registers
+        return self
+
+    # Querying
+
+    def _select(self, params: Dict[str, Any]) -> np.ndarray:
+        """
+        Boolean mask of the cells satisfying filter_jobs arguments
+        """
+        if params.get('keyword'):
+            raise CubeMissError("Keyword filters need the job descriptions")
+        location, title, experience, salary = self._unpack(self.keys)
+        selected = np.ones(len(self.keys), dtype=bool)
+        for codes, dimension, name in ((location, 'Location', 'location'), (title, 'Job Title', 'job_title')):
+            pattern = params.get(name)
+            if pattern is not None:
+                # The same substring/regex test filter_jobs applies, once per distinct value
+                dictionary = pd.Series(self.dictionaries[dimension] + [None], dtype=object)
+                matches = contains_mask(dictionary, pattern).to_numpy(dtype=bool, na_value=False)
+                selected &= matches[codes]
+        for keys, edges, low_name, high_name in ((salary, self.salary_edges, 'min_salary', 'max_salary'),
+                                                 (experience, self.experience_edges, 'min_experience', 'max_experience')):
+            low, high = params.get(low_name), params.get(high_name)
+            if low is not None:
+                selected &= keys >= 2 * _bound_key(edges, low, low_name) + 1
+            if high is not None:
+                selected &= (keys >= 0) & (keys <= 2 * _bound_key(edges, high, high_name) + 1)
+        return selected
+
+    def can_answer(self, **filters) -> bool:
+        try:
+            self._select(normalize_filter_params(filters))
+            return True
+        except CubeMissError:
+            return False
+
+    def _totals(self, cells: np.ndarray) -> Dict[str, Any]:
+        count = self.measures['count'][cells]
+        salary_count = self.measures['salary_count'][cells]
+        total = salary_count.sum()
+        return {
+            'count': int(count.sum()),
+            'salary_count': int(total),
+            'mean': float(self.measures['salary_sum'][cells].sum() / total) if total else np.nan,
+            'min': float(self.measures['salary_min'][cells].min()) if total else np.nan,
+            'max': float(self.measures['salary_max'][cells].max()) if total else np.nan,
+            'unique_companies': int(hll_estimate(self.registers[cells].max(axis=0))) if len(count) else 0
+        }
+
+    def query(self, group_by: List[str] = None, **filters) -> Any:
+        """
+        Totals for the rows matching filters, or a DataFrame of totals per group
+
+        Totals are count, salary_count, mean/min/max salary and an estimate of
+        unique_companies. group_by takes dimension names from DIMENSIONS;
+        band columns are labelled with their salary/experience range.
+        """
+        selected = np.flatnonzero(self._select(normalize_filter_params(filters)))
+        if not group_by:
+            return self._totals(selected)
+
+        unknown = [name for name in group_by if name not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown dimension(s): {', '.join(unknown)}")
+        parts = dict(zip(DIMENSIONS, self._unpack(self.keys[selected])))
+        groups = pd.DataFrame({name: parts[name] for name in group_by})
+        group_ids = groups.groupby(group_by, sort=True).ngroup().to_numpy()
+        order = np.argsort(group_ids, kind='stable')
+        starts = np.flatnonzero(np.r_[True, np.diff(group_ids[order]) != 0]) if len(order) else np.zeros(0, dtype=int)
+        cells = selected[order]
+
+        measures = {name: self.measures[name][cells] for name in MEASURES}
+        reduce = lambda ufunc, name: ufunc.reduceat(measures[name], starts) if len(starts) else np.zeros(0)
+        salary_count = reduce(np.add, 'salary_count')
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = reduce(np.add, 'salary_sum') / salary_count
+        result = pd.DataFrame({
+            'count': reduce(np.add, 'count').astype(np.int64),
+            'salary_count': salary_count.astype(np.int64),
+            'mean': mean,
+            'min': np.where(salary_count > 0, reduce(np.minimum, 'salary_min'), np.nan),
+            'max': np.where(salary_count > 0, reduce(np.maximum, 'salary_max'), np.nan),
+            'unique_companies': hll_estimate(np.maximum.reduceat(self.registers[cells], starts, axis=0))
+            if len(starts) else np.zeros(0, dtype=np.int64)
+        })
+
+        labels = groups.iloc[order[starts]] if len(starts) else groups
+        for position, name in enumerate(group_by):
+            codes = labels[name].to_numpy()
+            if name in self.dictionaries:
+                values = np.array(self.dictionaries[name] + [None], dtype=object)[codes]
+            else:
+                edges = self.experience_edges if name == 'Experience_Band' else self.salary_edges
+                values = np.array([band_label(edges, key) for key in codes], dtype=object)
+            result.insert(position, name, values)
+        return result.set_index(group_by)
+
+    def job_summary(self, **filters) -> Dict[str, Any]:
+        """
+        get_job_summary fields the cube can answer for the matching rows
+
+        unique_companies is an estimate and top_companies is not available
+        (Company is not a cube dimension).
+        """
+        selected = np.flatnonzero(self._select(normalize_filter_params(filters)))
+        totals = self._totals(selected)
+        if not totals['count']:
+            return {'total_jobs': 0, 'unique_companies': 0, 'unique_locations': 0, 'avg_salary': 0}
+        location = self._unpack(self.keys[selected])[0]
+        counts = pd.Series(self.measures['count'][selected]).groupby(location).sum()
+        counts = counts[counts.index >= 0].sort_values(ascending=False, kind='stable')
+        return {
+            'total_jobs': totals['count'],
+            'unique_companies': totals['unique_companies'],
+            'unique_locations': len(counts),
+            'avg_salary': round(totals['mean'], 2),
+            'salary_range': f"${totals['min']:,.0f} - ${totals['max']:,.0f}",
+            'top_locations': {self.dictionaries['Location'][code]: int(count)
+                              for code, count in counts.head(3).items()}
+        }
+
+    # Persistence
+
+    def save(self, path: str) -> None:
+        """
+        Write the cube to a .npz file (atomically)
+        """
+        meta = {
+            'version': CUBE_FORMAT_VERSION,
+            'salary_edges': self.salary_edges.tolist(),
+            'experience_edges': self.experience_edges.tolist(),
+            'sketch_precision': self.sketch_precision,
+            'dictionaries': self.dictionaries,
+            'source_state': self.source_state
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez_compressed(tmp_path, meta=np.array(json.dumps(meta)), keys=self.keys,
+                            registers=self.registers, **self.measures)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'JobCube':
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            if meta.get('version') != CUBE_FORMAT_VERSION:
+                raise ValueError(f"Unsupported cube format: {meta.get('version')}")
+            cube = cls(meta['salary_edges'], meta['experience_edges'], meta['sketch_precision'])
+            cube.dictionaries = meta['dictionaries']
+            cube.source_state = meta['source_state']
+            cube.keys = data['keys']
+            cube.registers = data['registers']
+            cube.measures = {name: data[name] for name in MEASURES}
+        return cube
+
+def _encode_watermark(value: Any) -> Dict[str, Any]:
+    if value is None:
+        return None
+    if isinstance(value, pd.Timestamp):
+        return {'kind': 'datetime', 'value': value.isoformat()}
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return {'kind': 'number', 'value': float(value)}
+    return {'kind': 'text', 'value': str(value)}
+
+def _decode_watermark(state: Dict[str, Any]) -> Any:
+    if state is None:
+        return None
+    if state['kind'] == 'datetime':
+        return pd.Timestamp(state['value'])
+    return state['value']
+
+def default_cube_path(file_path: str) -> str:
+    """
+    Location of the saved cube for a source file, in the job data cache directory
+    """
+    base = os.environ.get(CACHE_DIR_ENV_VAR) or DEFAULT_CACHE_DIR
+    return os.path.join(base, 'cubes', f"{_short_hash(os.path.abspath(file_path))}.cube.npz")
+
+def refresh_cube(file_path: str, cube_path: str = None, watermark_column: str = None,
+                 **options) -> Tuple[JobCube, Dict[str, Any]]:
+    """
+    Build or incrementally update the saved cube for a job file
+
+    The cube remembers how far it has read its source (a CSV byte offset, or
+    the largest watermark_column value), so later calls fold in only the new
+    rows. A file that was rewritten rather than appended to, or a cube saved
+    with different options, is rebuilt from scratch. Returns the cube and
+    {'rows_added', 'rebuilt', 'cube_path'}.
+    """
+    cube_path = cube_path or default_cube_path(file_path)
+    loader = IncrementalJobLoader(file_path, watermark_column=watermark_column, keep_data=False, summary_columns=[])
+    fresh = JobCube(**options)
+
+    cube = None
+    if os.path.exists(cube_path):
+        try:
+            cube = JobCube.load(cube_path)
+        except (OSError, ValueError, KeyError):
+            cube = None
+    state = cube.source_state if cube is not None else {}
+    compatible = (cube is not None and
+                  state.get('file_path') == os.path.abspath(file_path) and
+                  state.get('watermark_column') == watermark_column and
+                  np.array_equal(cube.salary_edges, fresh.salary_edges) and
+                  np.array_equal(cube.experience_edges, fresh.experience_edges) and
+                  cube.sketch_precision == fresh.sketch_precision)
+    if compatible:
+        loader.offset = state['offset']
+        loader.size = state.get('size')
+        loader.header = base64.b64decode(state['header']) if state.get('header') is not None else None
+        loader.watermark = _decode_watermark(state.get('watermark'))
+    else:
+        cube = fresh
+
+    delta = loader.refresh()
+    rebuilt = not compatible or loader.restarted
+    if loader.restarted:
+        cube = fresh
+    cube.update(delta)
+    cube.source_state = {
+        'file_path': os.path.abspath(file_path),
+        'watermark_column': watermark_column,
+        'offset': loader.offset,
+        'size': loader.size,
+        'header': base64.b64encode(loader.header).decode('ascii') if loader.header is not None else None,
+        'watermark': _encode_watermark(loader.watermark)
+    }
+    cube.save(cube_path)
+    return cube, {'rows_added': len(delta), 'rebuilt': rebuilt, 'cube_path': cube_path}
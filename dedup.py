@@ -0,0 +1,278 @@
+"""
+Near-duplicate posting detection for the Job Market Explorer
+The same job is often reposted by several aggregators with slightly different
+text. Each distinct job description is reduced to word shingles and a MinHash
+signature (both computed with array operations over all descriptions at
+once); locality-sensitive hashing over signature bands then proposes
+candidate pairs without comparing every pair of descriptions, and candidates
+whose signatures agree on at least `threshold` of their positions (an
+estimate of the shingle Jaccard similarity) are joined into one cluster
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from typing import List, Tuple
+
+CLUSTER_COLUMN = 'Cluster_ID'
+TEXT_COLUMN = 'Job Description'
+# Only postings with equal values in these columns can be duplicates
+MATCH_COLUMNS = ['Job Title', 'Company']
+
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_NUM_PERM = 128
+DEFAULT_SHINGLE_SIZE = 3
+TOKEN_PATTERN = r'[^a-z0-9]+'
+
+# Odd 64-bit multipliers used to combine token hashes into shingle and band keys
+_MIX = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93,
+                 0xFF51AFD7ED558CCD, 0xC4CEB9FE1A85EC53, 0x27D4EB2F165667C5, 0x85EBCA77C2B2AE63],
+                dtype=np.uint64)
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    """
+    Scramble 64-bit hashes (the murmur3 finalizer)
+    """
+    values = values ^ (values >> np.uint64(33))
+    values = values * _MIX[4]
+    values = values ^ (values >> np.uint64(33))
+    values = values * _MIX[5]
+    return values ^ (values >> np.uint64(33))
+
+def _tokenize(texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hash of every lower-cased alphanumeric token and the token count per text
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        pa = None
+    if pa is not None:
+        lists = pc.split_pattern_regex(pc.utf8_lower(pa.array(texts, type=pa.string())), TOKEN_PATTERN)
+        tokens = pc.list_flatten(lists)
+        owners = np.repeat(np.arange(len(texts)), pc.list_value_length(lists).to_numpy(zero_copy_only=False))
+        keep = pc.not_equal(tokens, '').to_numpy(zero_copy_only=False)
+        encoded = pc.dictionary_encode(tokens.filter(pa.array(keep)))
+        codes = encoded.indices.to_numpy(zero_copy_only=False)
+        vocabulary = encoded.dictionary.to_numpy(zero_copy_only=False)
+    else:
+        lists = pd.Series(texts, dtype=object).str.lower().str.split(TOKEN_PATTERN, regex=True)
+        tokens = lists.explode()
+        owners = tokens.index.to_numpy()
+        keep = (tokens.notna() & tokens.ne('')).to_numpy()
+        codes, vocabulary = pd.factorize(tokens[keep])
+    # Each distinct token is hashed once
+    hashes = pd.util.hash_array(np.asarray(vocabulary, dtype=object))[codes]
+    counts = np.bincount(owners[keep], minlength=len(texts))
+    return hashes, counts
+
+def shingle_hashes(texts: List[str], shingle_size: int = DEFAULT_SHINGLE_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    64-bit hashes of the word shingles of each text, concatenated, and the count per text
+
+    A text with fewer words than shingle_size is a single shingle of all its
+    words; a text without words has no shingles.
+    """
+    tokens, counts = _tokenize(texts)
+    ends = np.cumsum(counts)
+    starts = ends - counts
+    owner_ends = np.repeat(ends, counts)
+
+    combined = np.zeros(len(tokens), dtype=np.uint64)
+    for offset in range(min(shingle_size, len(tokens))):
+        shifted = np.zeros(len(tokens), dtype=np.uint64)
+        shifted[:len(tokens) - offset] = tokens[offset:]
+        # Words past the end of the text do not belong to the shingle
+        inside = np.arange(len(tokens)) + offset < owner_ends
+        combined += np.where(inside, shifted * _MIX[offset % len(_MIX)], np.uint64(0))
+
+    positions = np.arange(len(tokens))
+    valid = positions + shingle_size <= owner_ends
+    valid[starts[(counts > 0) & (counts < shingle_size)]] = True
+    shingle_counts = np.bincount(np.repeat(np.arange(len(texts)), counts)[valid], minlength=len(texts))
+    return _mix(combined[valid]), shingle_counts
+
+def _permutations(num_perm: int, seed: int) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    multipliers = rng.integers(0, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64, endpoint=True) | np.uint64(1)
+    increments = rng.integers(0, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64, endpoint=True)
+    return multipliers, increments
+
+def _signature_block(texts: List[str], num_perm: int, shingle_size: int, seed: int) -> np.ndarray:
+    shingles, counts = shingle_hashes(texts, shingle_size)
+    signatures = np.full((len(texts), num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+    present = counts > 0
+    if not present.any():
+        return signatures
+    starts = (np.cumsum(counts) - counts)[present]
+    multipliers, increments = _permutations(num_perm, seed)
+    minimums = np.empty((num_perm, len(starts)), dtype=np.uint32)
+    permuted = np.empty_like(shingles)
+    for j in range(num_perm):
+        # Multiply-shift hashing: the high 32 bits of a*x + b (mod 2**64)
+        np.multiply(shingles, multipliers[j], out=permuted)
+        permuted += increments[j]
+        permuted >>= np.uint64(32)
+        minimums[j] = np.minimum.reduceat(permuted, starts)
+    signatures[present] = minimums.T
+    return signatures
+
+def minhash_signatures(texts: List[str],
+                       num_perm: int = DEFAULT_NUM_PERM,
+                       shingle_size: int = DEFAULT_SHINGLE_SIZE,
+                       seed: int = 0,
+                       workers: int = None) -> np.ndarray:
+    """
+    MinHash signature (num_perm uint32 values) of each text
+
+    Texts without words get all-maximum signatures. With workers > 1 the
+    texts are split across that many processes.
+    """
+    texts = ['' if not isinstance(text, str) else text for text in texts]
+    workers = min(workers or 1, len(texts)) or 1
+    if workers == 1:
+        return _signature_block(texts, num_perm, shingle_size, seed)
+    blocks = np.array_split(np.arange(len(texts)), workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_signature_block, [texts[i] for i in block], num_perm, shingle_size, seed)
+                   for block in blocks]
+        return np.concatenate([future.result() for future in futures])
+
+def lsh_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    (bands, rows per band) with bands * rows == num_perm
+
+    Takes the most rows per band whose S-curve midpoint (1/bands)**(1/rows)
+    stays at or below threshold, so pairs at the threshold are likely to
+    share a bucket while much less similar pairs rarely do.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows == 0 and (rows / num_perm) ** (1 / rows) <= threshold:
+            best = (num_perm // rows, rows)
+    return best
+
+def _components(n: int, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """
+    Smallest member of each item's connected component under the given edges
+    """
+    labels = np.arange(n)
+    if not len(left):
+        return labels
+    while True:
+        lowest = np.minimum(labels[left], labels[right])
+        updated = labels.copy()
+        np.minimum.at(updated, left, lowest)
+        np.minimum.at(updated, right, lowest)
+        # Pointer jumping collapses chains of labels quickly
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+def _candidate_pairs(signatures: np.ndarray, group_keys: np.ndarray, bands: int, rows: int,
+                     threshold: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pairs of items that share a band bucket and whose signatures agree on at least threshold
+    """
+    lefts, rights = [], []
+    for band in range(bands):
+        key = group_keys.copy()
+        for offset, column in enumerate(range(band * rows, (band + 1) * rows)):
+            key = _mix(key + signatures[:, column].astype(np.uint64) * _MIX[offset % len(_MIX)])
+        order = np.argsort(key, kind='stable')
+        ordered = key[order]
+        first_of_run = np.r_[True, ordered[1:] != ordered[:-1]]
+        if first_of_run.all():
+            continue
+        # Each bucket member is checked against the bucket's first member
+        leaders = order[np.maximum.accumulate(np.where(first_of_run, np.arange(len(order)), 0))]
+        members = ~first_of_run
+        left, right = leaders[members], order[members]
+        agreement = (signatures[left] == signatures[right]).mean(axis=1)
+        similar = agreement >= threshold
+        lefts.append(left[similar])
+        rights.append(right[similar])
+    if not lefts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(lefts), np.concatenate(rights)
+
+def deduplicate_jobs(df: pd.DataFrame,
+                     threshold: float = DEFAULT_THRESHOLD,
+                     num_perm: int = DEFAULT_NUM_PERM,
+                     shingle_size: int = DEFAULT_SHINGLE_SIZE,
+                     match_columns: List[str] = MATCH_COLUMNS,
+                     text_column: str = TEXT_COLUMN,
+                     seed: int = 0,
+                     workers: int = None) -> pd.DataFrame:
+    """
+    Return a copy of df with a Cluster_ID column grouping near-duplicate postings
+
+    Postings are duplicates when their match_columns are equal and their
+    descriptions have an estimated word-shingle Jaccard similarity of at
+    least threshold (transitively). Cluster IDs are numbered from 0 in order
+    of first appearance; postings without a description are never merged.
+    Signatures are computed once per distinct description, in `workers`
+    processes when given.
+    """
+    result = df.copy(deep=False)
+    if df.empty:
+        result[CLUSTER_COLUMN] = pd.Series(dtype=np.int64)
+        return result
+
+    texts = df[text_column]
+    text_codes, distinct_texts = pd.factorize(texts.astype(object) if isinstance(texts.dtype, pd.CategoricalDtype)
+                                              else texts)
+    signatures = minhash_signatures(list(distinct_texts), num_perm, shingle_size, seed, workers)
+
+    # Items are distinct (description, match values) combinations
+    columns = [column for column in match_columns if column in df.columns]
+    if columns:
+        match_hash = pd.util.hash_pandas_object(df[columns].astype(object), index=False).to_numpy()
+    else:
+        match_hash = np.zeros(len(df), dtype=np.uint64)
+    item_frame = pd.DataFrame({'text': text_codes, 'match': match_hash})
+    item_codes = item_frame.groupby(['text', 'match'], sort=False).ngroup().to_numpy()
+    items = item_frame.drop_duplicates()
+    item_texts = items['text'].to_numpy()
+    item_matches = items['match'].to_numpy(dtype=np.uint64)
+
+    has_words = np.zeros(len(items), dtype=bool)
+    known = item_texts >= 0
+    has_words[known] = signatures[item_texts[known]].min(axis=1) < np.iinfo(np.uint32).max
+    candidates = np.flatnonzero(has_words)
+
+    bands, rows = lsh_bands(threshold, num_perm)
+    left, right = _candidate_pairs(signatures[item_texts[candidates]], item_matches[candidates],
+                                   bands, rows, threshold)
+    labels = np.arange(len(items))
+    labels[candidates] = candidates[_components(len(candidates), left, right)]
+
+    row_labels = labels[item_codes]
+    # Postings without words stay on their own, even when otherwise identical
+    alone = ~has_words[item_codes]
+    row_labels = np.where(alone, len(items) + np.arange(len(df)), row_labels)
+    result[CLUSTER_COLUMN] = pd.factorize(row_labels)[0].astype(np.int64)
+    return result
+
+def unique_postings(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    First posting of each duplicate cluster (see deduplicate_jobs)
+    """
+    if CLUSTER_COLUMN not in df.columns:
+        raise ValueError(f"No {CLUSTER_COLUMN} column: run deduplicate_jobs first")
+    return df[~df[CLUSTER_COLUMN].duplicated()]
+
+def duplicate_report(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Clusters with more than one posting: Cluster_ID, size and the first posting's columns
+    """
+    if CLUSTER_COLUMN not in df.columns:
+        raise ValueError(f"No {CLUSTER_COLUMN} column: run deduplicate_jobs first")
+    sizes = df[CLUSTER_COLUMN].value_counts()
+    repeated = sizes[sizes > 1]
+    first = unique_postings(df)
+    first = first[first[CLUSTER_COLUMN].isin(repeated.index)]
+    report = first.assign(Postings=first[CLUSTER_COLUMN].map(repeated).to_numpy())
+    return report.sort_values('Postings', ascending=False, kind='stable').reset_index(drop=True)
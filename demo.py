@@ -4,7 +4,6 @@ This demonstrates how the Python functions work with the sample data
 """
 
 import pandas as pd
-import matplotlib.pyplot as plt
 from python_functions import *
 
 def run_demo():
@@ -73,29 +72,15 @@ def run_demo():
     # Create visualizations
     print("\n📊 Creating Visualizations...")
     
-    # Salary chart
-    fig1 = create_salary_chart(df)
-    fig1.suptitle('Job Market Explorer - Salary Analysis', fontsize=16)
-    plt.tight_layout()
-    plt.savefig('salary_analysis.png', dpi=300, bbox_inches='tight')
-    print("✅ Salary chart saved as 'salary_analysis.png'")
-    plt.close()
-    
-    # Location chart
-    fig2 = create_location_chart(df)
-    fig2.suptitle('Job Market Explorer - Location Analysis', fontsize=16)
-    plt.tight_layout()
-    plt.savefig('location_analysis.png', dpi=300, bbox_inches='tight')
-    print("✅ Location chart saved as 'location_analysis.png'")
-    plt.close()
-    
-    # Experience chart
-    fig3 = create_experience_chart(df)
-    fig3.suptitle('Job Market Explorer - Experience Analysis', fontsize=16)
-    plt.tight_layout()
-    plt.savefig('experience_analysis.png', dpi=300, bbox_inches='tight')
-    print("✅ Experience chart saved as 'experience_analysis.png'")
-    plt.close()
+    # All three charts are aggregated once and rendered in parallel worker
+    # processes; unchanged charts are reused from the chart cache
+    titles = {
+        'salary': 'Job Market Explorer - Salary Analysis',
+        'location': 'Job Market Explorer - Location Analysis',
+        'experience': 'Job Market Explorer - Experience Analysis'
+    }
+    for kind, path in render_charts(df, titles=titles, dpi=300).items():
+        print(f"✅ {kind.title()} chart saved as '{path}'")
     
     print("\n🎉 Demo completed successfully!")
     print("\nNext steps:")
@@ -0,0 +1,138 @@
+"""
+Parallel ingestion of many job feed files for the Job Market Explorer
+Loads a directory, glob pattern or list of CSV/Excel files in a process pool,
+reconciles their schemas and reports per-file failures separately instead of
+replacing the whole result with an error frame
+"""
+
+import glob
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Tuple, Union
+
+FEED_EXTENSIONS = ('.csv', '.xlsx', '.xls')
+SOURCE_COLUMN = 'Source_File'
+ERROR_COLUMNS = ['file', 'error_type', 'message', 'traceback']
+
+def resolve_feed_files(source: Union[str, List[str]]) -> List[str]:
+    """
+    Expand a directory, glob pattern or list of paths to the feed files it names
+    """
+    if isinstance(source, (list, tuple)):
+        paths = list(source)
+    elif os.path.isdir(source):
+        paths = [os.path.join(source, name) for name in os.listdir(source)]
+    elif glob.has_magic(source):
+        paths = glob.glob(source, recursive=True)
+    else:
+        paths = [source]
+    return sorted(path for path in paths
+                  if path.lower().endswith(FEED_EXTENSIONS) and not os.path.basename(path).startswith('~$'))
+
+def _load_feed_file(file_path: str, use_cache: bool) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Worker: load and clean one file, returning (frame, error)
+    """
+    from python_functions import _load_cleaned_job_data
+
+    try:
+        df = _load_cleaned_job_data(file_path, use_cache=use_cache)
+        df.columns = [str(column).strip() for column in df.columns]
+        return df, None
+    except Exception as e:
+        error = {
+            'file': file_path,
+            'error_type': type(e).__name__,
+            'message': str(e),
+            'traceback': traceback.format_exc(limit=3)
+        }
+        return None, error
+
+def _reconcile_schemas(frames: List[pd.DataFrame]) -> List[pd.DataFrame]:
+    """
+    Give every frame the union of all columns with one dtype per column
+
+    Columns that are numeric everywhere stay numeric (float if any frame needs
+    it); columns mixing numbers and text become text.
+    """
+    columns = []
+    for frame in frames:
+        columns.extend(column for column in frame.columns if column not in columns)
+
+    targets = {}
+    for column in columns:
+        dtypes = [frame[column].dtype for frame in frames if column in frame.columns]
+        if all(pd.api.types.is_numeric_dtype(dtype) for dtype in dtypes):
+            missing_somewhere = any(column not in frame.columns for frame in frames)
+            if all(pd.api.types.is_integer_dtype(dtype) for dtype in dtypes) and not missing_somewhere:
+                targets[column] = np.int64
+            else:
+                targets[column] = np.float64
+        elif len({str(dtype) for dtype in dtypes}) > 1:
+            targets[column] = object
+
+    reconciled = []
+    for frame in frames:
+        frame = frame.reindex(columns=columns)
+        for column, dtype in targets.items():
+            if frame[column].dtype != dtype:
+                if dtype is object:
+                    values = frame[column]
+                    frame[column] = values.where(values.isna(), values.astype(str)).astype(object)
+                else:
+                    frame[column] = frame[column].astype(dtype)
+        reconciled.append(frame)
+    return reconciled
+
+def load_job_files(source: Union[str, List[str]],
+                   workers: int = None,
+                   use_cache: bool = None,
+                   source_column: str = SOURCE_COLUMN) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Load many job files in parallel into one DataFrame
+
+    source is a directory, a glob pattern (e.g. 'feeds/**/*.csv') or a list of
+    paths. Files are parsed and cleaned in a pool of `workers` processes
+    (default: one per CPU). Each row is tagged in source_column with its file
+    name relative to the files' common directory. Returns (data, errors);
+    errors has one row per file that could not be loaded, and those files are
+    simply left out of data.
+    """
+    paths = resolve_feed_files(source)
+    if not paths:
+        return pd.DataFrame(), pd.DataFrame(columns=ERROR_COLUMNS)
+
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(paths))
+    if workers == 1:
+        results = [_load_feed_file(path, use_cache) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map keeps the results in input order
+            results = list(pool.map(_load_feed_file, paths, [use_cache] * len(paths)))
+
+    frames, names, errors = [], [], []
+    try:
+        base = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in paths])
+    except ValueError:
+        # Files on different drives share no directory; tag rows with absolute paths
+        base = None
+    for path, (frame, error) in zip(paths, results):
+        if error is not None:
+            errors.append(error)
+        else:
+            frames.append(frame)
+            names.append(os.path.relpath(os.path.abspath(path), base) if base else os.path.abspath(path))
+
+    errors = pd.DataFrame(errors, columns=ERROR_COLUMNS)
+    if not frames:
+        return pd.DataFrame(), errors
+
+    data = pd.concat(_reconcile_schemas(frames), ignore_index=True)
+    # One categorical code per row instead of a repeated file-name string
+    lengths = [len(frame) for frame in frames]
+    data[source_column] = pd.Categorical.from_codes(np.repeat(np.arange(len(names)), lengths), categories=names)
+    return data, errors
@@ -0,0 +1,381 @@
+"""
+Incremental loading and running summaries for the Job Market Explorer
+An IncrementalJobLoader remembers how far it has read a job file, either as a
+byte offset (CSV files that are appended to) or as the largest value of a
+watermark column, and on refresh() parses only the new rows. The new rows are
+folded into a RunningJobSummary of mergeable aggregates (counts, sums,
+min/max, salary value counts, per-column top-k counters and HyperLogLog
+distinct sketches) so summaries never rescan the rows already seen
+"""
+
+import io
+import os
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional
+from aggregation import _distinct_counts
+from python_functions import JOB_DATA_DTYPES, _clean_job_data
+
+SUMMARY_COLUMNS = ['Company', 'Location', 'Job Title']
+DEFAULT_TOPK_CAPACITY = 10_000
+DEFAULT_HLL_PRECISION = 12
+
+def hash_ranks(values: np.ndarray, precision: int = DEFAULT_HLL_PRECISION):
+    """
+    HyperLogLog register index and rank for each value
+    """
+    hashes = pd.util.hash_array(np.asarray(values, dtype=object).astype(str).astype(object))
+    p = precision
+    buckets = (hashes >> np.uint64(64 - p)).astype(np.int64)
+    rest = hashes & np.uint64((1 << (64 - p)) - 1)
+    # Bit length of the remaining 64-p bits, exactly, via two 32-bit halves
+    high = (rest >> np.uint64(32)).astype(np.float64)
+    low = (rest & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    bit_length = np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+    ranks = (64 - p) - bit_length + 1
+    return buckets, ranks.astype(np.uint8)
+
+def hll_estimate(registers: np.ndarray) -> np.ndarray:
+    """
+    Distinct-count estimate from HyperLogLog registers (one sketch per row when 2-D)
+    """
+    m = registers.shape[-1]
+    alpha = 0.7213 / (1 + 1.079 / m)
+    raw = alpha * m * m / np.sum(np.ldexp(1.0, -registers.astype(np.int64)), axis=-1)
+    zeros = np.count_nonzero(registers == 0, axis=-1)
+    # Linear counting is more accurate for small cardinalities
+    with np.errstate(divide='ignore'):
+        linear = m * np.log(m / np.maximum(zeros, 1))
+    return np.round(np.where((raw <= 2.5 * m) & (zeros > 0), linear, raw)).astype(np.int64)
+
+class HyperLogLog:
+    """
+    Distinct-count sketch with 2**precision one-byte registers (~1.6% error at 12)
+    """
+
+    def __init__(self, precision: int = DEFAULT_HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, values: pd.Series) -> None:
+        uniques = pd.unique(values.dropna().to_numpy(dtype=object))
+        if not len(uniques):
+            return
+        buckets, ranks = hash_ranks(uniques, self.precision)
+        np.maximum.at(self.registers, buckets, ranks)
+
+    def merge(self, other: 'HyperLogLog') -> None:
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> int:
+        return int(hll_estimate(self.registers))
+
+class TopKCounter:
+    """
+    Per-value counts in first-appearance order, bounded by capacity
+
+    While fewer than capacity distinct values have been seen the counts are
+    exact and rank ties like value_counts on the full column. Beyond that the
+    smallest counters are dropped and `error` bounds how much any remaining
+    count may be underestimated.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_TOPK_CAPACITY):
+        self.capacity = capacity
+        self.counts: Dict[Any, int] = {}
+        self.error = 0
+
+    @property
+    def exact(self) -> bool:
+        return self.error == 0
+
+    def add(self, values: pd.Series) -> None:
+        uniques, counts = _distinct_counts(values)
+        self._add_counts(zip(uniques, counts.tolist()))
+
+    def _add_counts(self, pairs) -> None:
+        counts = self.counts
+        for value, count in pairs:
+            if count:
+                counts[value] = counts.get(value, 0) + int(count)
+        if len(counts) > self.capacity:
+            ranked = sorted(counts.items(), key=lambda item: -item[1])
+            self.error = max(self.error, ranked[self.capacity][1])
+            keep = {value for value, _ in ranked[:self.capacity]}
+            self.counts = {value: count for value, count in counts.items() if value in keep}
+
+    def merge(self, other: 'TopKCounter') -> None:
+        self.error = max(self.error, other.error)
+        self._add_counts(other.counts.items())
+
+    def top(self, n: int) -> Dict[Any, int]:
+        ranked = pd.Series(list(self.counts.values()), dtype=np.int64).sort_values(ascending=False, kind='stable')
+        keys = list(self.counts)
+        return {keys[i]: int(count) for i, count in ranked.head(n).items()}
+
+class RunningJobSummary:
+    """
+    Mergeable aggregates behind get_job_summary and calculate_salary_stats
+
+    Salary statistics, including the median, are exact: salaries are kept as
+    value counts, which stay small because postings use round amounts.
+    Distinct counts are exact while the top-k counters have not overflowed
+    and fall back to the HyperLogLog estimate afterwards.
+    """
+
+    def __init__(self, columns: List[str] = SUMMARY_COLUMNS, topk_capacity: int = DEFAULT_TOPK_CAPACITY,
+                 hll_precision: int = DEFAULT_HLL_PRECISION):
+        self.rows = 0
+        self.salary_counts = pd.Series(dtype=np.int64)
+        self.counters = {column: TopKCounter(topk_capacity) for column in columns}
+        self.sketches = {column: HyperLogLog(hll_precision) for column in columns}
+
+    def update(self, df: pd.DataFrame) -> 'RunningJobSummary':
+        """
+        Fold a batch of cleaned rows into the aggregates
+        """
+        self.rows += len(df)
+        if 'Salary' in df.columns:
+            salary = df['Salary'].to_numpy(dtype=float, na_value=np.nan)
+            values, counts = np.unique(salary[~np.isnan(salary)], return_counts=True)
+            self._add_salaries(pd.Series(counts, index=values, dtype=np.int64))
+        for column, counter in self.counters.items():
+            if column in df.columns:
+                counter.add(df[column])
+                self.sketches[column].add(df[column])
+        return self
+
+    def _add_salaries(self, counts: pd.Series) -> None:
+        if not len(counts):
+            return
+        merged = self.salary_counts.add(counts, fill_value=0) if len(self.salary_counts) else counts
+        self.salary_counts = merged.astype(np.int64).sort_index()
+
+    def merge(self, other: 'RunningJobSummary') -> 'RunningJobSummary':
+        """
+        Combine with a summary of other rows (e.g. another file or worker)
+        """
+        self.rows += other.rows
+        self._add_salaries(other.salary_counts)
+        for column, counter in other.counters.items():
+            if column in self.counters:
+                self.counters[column].merge(counter)
+                self.sketches[column].merge(other.sketches[column])
+        return self
+
+    def nunique(self, column: str) -> int:
+        counter = self.counters[column]
+        return len(counter.counts) if counter.exact else self.sketches[column].estimate()
+
+    def _salary_median(self) -> float:
+        counts = self.salary_counts.to_numpy()
+        values = self.salary_counts.index.to_numpy(dtype=float)
+        total = int(counts.sum())
+        positions = np.cumsum(counts)
+        lower = values[np.searchsorted(positions, (total - 1) // 2, side='right')]
+        upper = values[np.searchsorted(positions, total // 2, side='right')]
+        return (lower + upper) / 2
+
+    def salary_stats(self) -> Dict[str, Any]:
+        """
+        Same keys and values as calculate_salary_stats over every row seen
+        """
+        if not self.rows:
+            return {'mean': 0, 'median': 0, 'min': 0, 'max': 0, 'count': 0}
+        if not len(self.salary_counts):
+            return {'mean': np.nan, 'median': np.nan, 'min': np.nan, 'max': np.nan, 'count': self.rows}
+        values = self.salary_counts.index.to_numpy(dtype=float)
+        counts = self.salary_counts.to_numpy()
+        return {
+            'mean': round(float(np.dot(values, counts) / counts.sum()), 2),
+            'median': round(float(self._salary_median()), 2),
+            'min': round(float(values[0]), 2),
+            'max': round(float(values[-1]), 2),
+            'count': self.rows
+        }
+
+    def job_summary(self) -> Dict[str, Any]:
+        """
+        Same keys as get_job_summary over every row seen
+        """
+        if not self.rows:
+            return {'total_jobs': 0, 'unique_companies': 0, 'unique_locations': 0, 'avg_salary': 0}
+        salary = self.salary_stats()
+        return {
+            'total_jobs': self.rows,
+            'unique_companies': self.nunique('Company'),
+            'unique_locations': self.nunique('Location'),
+            'avg_salary': salary['mean'],
+            'salary_range': f"${salary['min']:,.0f} - ${salary['max']:,.0f}",
+            'top_locations': self.counters['Location'].top(3),
+            'top_companies': self.counters['Company'].top(3)
+        }
+
+# pandas 2 parses every value with the first value's format unless told the
+# formats are mixed; earlier versions infer each value's format by themselves
+_MIXED_DATES = {'format': 'mixed'} if int(pd.__version__.split('.')[0]) >= 2 else {}
+
+def _comparable(values: pd.Series) -> pd.Series:
+    """
+    Watermark values as numbers or timestamps when they all parse, else text
+    """
+    numbers = pd.to_numeric(values, errors='coerce')
+    if numbers.notna().sum() == values.notna().sum():
+        return numbers
+    try:
+        return pd.to_datetime(values, **_MIXED_DATES)
+    except (ValueError, TypeError):
+        return values.astype(str)
+
+class IncrementalJobLoader:
+    """
+    Load a growing job file in deltas
+
+    Without watermark_column the file must be a CSV that only grows at the
+    end: refresh() reads from the byte offset where the previous read stopped,
+    up to the last complete record. A last line without a line break is held
+    back until a refresh finds the file size unchanged. With watermark_column (CSV or Excel) rows
+    whose watermark is greater than the largest one seen are taken as new.
+    A file that shrank or whose header changed is reloaded from the start.
+    keep_data=False keeps only the running summary, not the rows.
+    """
+
+    def __init__(self, file_path: str, watermark_column: str = None, keep_data: bool = True,
+                 summary_columns: List[str] = SUMMARY_COLUMNS):
+        if watermark_column is None and not file_path.lower().endswith('.csv'):
+            raise ValueError("Offset tracking needs a CSV file; pass watermark_column for other formats")
+        self.file_path = file_path
+        self.watermark_column = watermark_column
+        self.keep_data = keep_data
+        self.summary_columns = summary_columns
+        # Set by refresh() when the file had to be reread from the start
+        self.restarted = False
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Forget everything read so far
+        """
+        self.offset = 0
+        # File size at the previous offset read, to tell a finished file from a growing one
+        self.size: Optional[int] = None
+        self.header: Optional[bytes] = None
+        self.watermark = None
+        self.data = pd.DataFrame()
+        self.summary = RunningJobSummary(self.summary_columns)
+        self.refreshes = 0
+
+    def state(self) -> Dict[str, Any]:
+        return {
+            'file_path': self.file_path,
+            'offset': self.offset,
+            'watermark': self.watermark,
+            'rows': self.summary.rows,
+            'refreshes': self.refreshes
+        }
+
+    def refresh(self) -> pd.DataFrame:
+        """
+        Parse rows added since the last refresh, update data and summary, and return them
+        """
+        self.restarted = False
+        delta = self._read_watermark_delta() if self.watermark_column else self._read_offset_delta()
+        self.refreshes += 1
+        if len(delta):
+            self.summary.update(delta)
+            if self.keep_data:
+                self.data = delta if self.data.empty else pd.concat([self.data, delta], ignore_index=True)
+        return delta
+
+    def _read_offset_delta(self) -> pd.DataFrame:
+        size = os.path.getsize(self.file_path)
+        with open(self.file_path, 'rb') as f:
+            header = f.readline()
+            if self.header is not None and (header != self.header or size < self.offset):
+                # Rewritten or truncated: start over
+                self.reset()
+                self.restarted = True
+            if self.header is None:
+                self.header = header
+                self.offset = len(header)
+            f.seek(self.offset)
+            block = f.read(size - self.offset)
+        settled, self.size = size == self.size, size
+
+        # Leave a partially written last record for the next refresh, unless the
+        # file stopped growing: then it is a last line without a line break
+        end = _complete_records_end(block)
+        if end < len(block) and settled and block.count(b'"') % 2 == 0:
+            end = len(block)
+        if end == 0:
+            return self._empty()
+        self.offset += end
+        columns = pd.read_csv(io.BytesIO(self.header), nrows=0).columns
+        dtype = {column: kind for column, kind in JOB_DATA_DTYPES.items() if column in columns}
+        delta = pd.read_csv(io.BytesIO(self.header + block[:end]), dtype=dtype)
+        return _clean_job_data(delta)
+
+    def _columns(self) -> pd.Index:
+        if self.file_path.lower().endswith('.csv'):
+            return pd.read_csv(self.file_path, nrows=0).columns
+        return pd.read_excel(self.file_path, nrows=0).columns
+
+    def _read_rows(self, skip: int = 0, usecols: List[str] = None) -> pd.DataFrame:
+        """
+        Parse the file as text from data row `skip` on, optionally only some columns
+        """
+        read = pd.read_csv if self.file_path.lower().endswith('.csv') else pd.read_excel
+        if not skip:
+            return read(self.file_path, dtype=str, usecols=usecols)
+        # An integer skiprows counts records (quoted line breaks included) and,
+        # unlike a list of row numbers, does not build a set of every skipped row
+        return read(self.file_path, dtype=str, header=None, names=list(self._columns()),
+                    skiprows=skip + 1, usecols=usecols)
+
+    def _read_watermark_delta(self) -> pd.DataFrame:
+        # Only the watermark column is parsed for every row; whole rows are
+        # parsed from the first new one on
+        marks = _comparable(self._read_rows(usecols=[self.watermark_column])[self.watermark_column])
+        new = np.ones(len(marks), dtype=bool)
+        if self.watermark is not None:
+            try:
+                new = (marks > self.watermark).to_numpy(dtype=bool, na_value=False)
+            except TypeError:
+                # The watermark column changed type: start over
+                self.reset()
+                self.restarted = True
+        if not new.any():
+            return self._empty(self._columns())
+        start = int(np.argmax(new))
+        # Rows appended after the watermarks were read wait for the next refresh
+        raw = self._read_rows(skip=start).iloc[:len(new) - start]
+        # Rows after the first new one may still be old (out-of-order watermarks)
+        keep = new[start:start + len(raw)]
+        raw, marks = raw[keep], marks.iloc[start:start + len(raw)][keep]
+        if marks.notna().any():
+            self.watermark = marks.max()
+        return _clean_job_data(raw.reset_index(drop=True))
+
+    def _empty(self, columns: pd.Index = None) -> pd.DataFrame:
+        if columns is None:
+            columns = pd.read_csv(io.BytesIO(self.header), nrows=0).columns
+        return _clean_job_data(pd.DataFrame({column: pd.Series(dtype=str) for column in columns}))
+
+def _complete_records_end(block: bytes) -> int:
+    """
+    Length of the leading complete CSV records in block, which starts at a record boundary
+
+    A line break inside a quoted field does not end a record: the cut is the
+    last line break with an even number of quote characters before it
+    (escaped quotes come in pairs, so they keep the count even).
+    """
+    end = block.rfind(b'\n')
+    quotes_after = block.count(b'"', end + 1)
+    total = block.count(b'"')
+    while end >= 0 and (total - quotes_after) % 2:
+        previous = block.rfind(b'\n', 0, end)
+        quotes_after += block.count(b'"', previous + 1, end + 1)
+        end = previous
+    return end + 1
@@ -0,0 +1,211 @@
+"""
+On-disk cache of cleaned job data for the Job Market Explorer
+Cleaned DataFrames are stored as uncompressed Feather files so that warm loads
+memory-map the cached columns instead of reparsing the source file
+"""
+
+import hashlib
+import json
+import os
+import pandas as pd
+from typing import Any, Dict, List
+
+# Set to 0/false/off to disable caching, or point the cache somewhere else
+CACHE_ENV_VAR = 'JOB_EXPLORER_CACHE'
+CACHE_DIR_ENV_VAR = 'JOB_EXPLORER_CACHE_DIR'
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'job_market_explorer')
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+CACHE_SUFFIX = '.feather'
+# Bump whenever python_functions._clean_job_data changes so cached results are rebuilt
+CLEANING_VERSION = 3
+ARTIFACT_SUFFIX = '.npz'
+
+def cache_enabled() -> bool:
+    """
+    Check whether caching is enabled through the environment
+    """
+    return os.environ.get(CACHE_ENV_VAR, '1').strip().lower() not in ('0', 'false', 'off', 'no')
+
+def source_fingerprint(file_path: str, mode: str = 'stat') -> str:
+    """
+    Fingerprint a source file by its mtime/size ('stat') or by its bytes ('content')
+    """
+    stat = os.stat(file_path)
+    if mode == 'stat':
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+    if mode == 'content':
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return f"{digest.hexdigest()}-{stat.st_size}"
+    raise ValueError(f"Unknown fingerprint mode: {mode}")
+
+def _short_hash(value: Any) -> str:
+    return hashlib.sha1(json.dumps(value, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+
+def _to_table(df: pd.DataFrame):
+    """
+    Arrow table for a cache entry, keeping missing floats as NaN values
+
+    Arrow nulls in a float column would have to be turned back into NaN, a
+    copy, on every warm load.
+    """
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for i, field in enumerate(table.schema):
+        if pa.types.is_floating(field.type) and table.column(i).null_count:
+            values = pa.array(df[field.name].to_numpy(dtype=field.type.to_pandas_dtype()), from_pandas=False)
+            table = table.set_column(i, field, values)
+    return table
+
+class JobDataCache:
+    """
+    Size-bounded cache of cleaned job DataFrames keyed by source fingerprint
+
+    Entries are named <path hash>-<state hash>.feather, where the state hash
+    covers the source fingerprint, the cleaning-logic version and any load
+    options. A changed source therefore misses and replaces its old entry.
+    Least recently used entries are evicted once max_bytes is exceeded.
+    """
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = DEFAULT_MAX_BYTES, fingerprint: str = 'stat'):
+        self.cache_dir = cache_dir or os.environ.get(CACHE_DIR_ENV_VAR) or DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.fingerprint = fingerprint
+        self.hits = 0
+        self.misses = 0
+
+    def _path_prefix(self, file_path: str) -> str:
+        return _short_hash(os.path.abspath(file_path))
+
+    def entry_path(self, file_path: str, version: Any, options: Dict[str, Any] = None) -> str:
+        """
+        Path of the cache entry for a source file in its current state
+        """
+        state = _short_hash([source_fingerprint(file_path, self.fingerprint), version, options or {}])
+        return os.path.join(self.cache_dir, f"{self._path_prefix(file_path)}-{state}{CACHE_SUFFIX}")
+
+    def artifact_path(self, file_path: str, version: Any, name: str, options: Dict[str, Any] = None) -> str:
+        """
+        Path for data derived from a cache entry, such as a search index
+
+        Artifacts share the entry's name, so they are replaced and invalidated with it.
+        """
+        path = self.entry_path(file_path, version, options)
+        return path[:-len(CACHE_SUFFIX)] + f".{name}{ARTIFACT_SUFFIX}"
+
+    def get(self, file_path: str, version: Any, options: Dict[str, Any] = None) -> pd.DataFrame:
+        """
+        Return the cached DataFrame for file_path, or None on a miss
+        """
+        path = self.entry_path(file_path, version, options)
+        if not os.path.exists(path):
+            self.misses += 1
+            return None
+
+        from pyarrow import feather
+
+        # split_blocks keeps each column its own block, so single-chunk numeric
+        # columns without nulls stay views of the mapped file instead of copies
+        df = feather.read_table(path, memory_map=True).to_pandas(split_blocks=True)
+        # Touch the entry so eviction sees it as recently used
+        os.utime(path)
+        self.hits += 1
+        return df
+
+    def put(self, file_path: str, df: pd.DataFrame, version: Any, options: Dict[str, Any] = None) -> str:
+        """
+        Store a cleaned DataFrame, replacing older entries for the same source
+        """
+        from pyarrow import feather
+
+        path = self.entry_path(file_path, version, options)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.invalidate(file_path)
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            # Uncompressed single-chunk Feather files can be memory-mapped on read
+            table = _to_table(df.reset_index(drop=True))
+            feather.write_feather(table, tmp_path, compression='uncompressed', chunksize=max(table.num_rows, 1))
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.evict()
+        return path
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """
+        List cache entries and artifacts with their size and last access time, oldest first
+        """
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith((CACHE_SUFFIX, ARTIFACT_SUFFIX)):
+                path = os.path.join(self.cache_dir, name)
+                stat = os.stat(path)
+                entries.append({'path': path, 'bytes': stat.st_size, 'last_used': stat.st_mtime})
+        return sorted(entries, key=lambda entry: entry['last_used'])
+
+    def invalidate(self, file_path: str = None) -> int:
+        """
+        Remove entries for one source file, or every entry when file_path is None
+        """
+        prefix = self._path_prefix(file_path) + '-' if file_path else ''
+        removed = 0
+        for entry in self.entries():
+            if os.path.basename(entry['path']).startswith(prefix):
+                os.remove(entry['path'])
+                removed += 1
+        return removed
+
+    def evict(self) -> int:
+        """
+        Drop least recently used entries until the cache fits in max_bytes
+        """
+        entries = self.entries()
+        total = sum(entry['bytes'] for entry in entries)
+        removed = 0
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            os.remove(entry['path'])
+            total -= entry['bytes']
+            removed += 1
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Summarize cache usage
+        """
+        entries = self.entries()
+        return {
+            'cache_dir': self.cache_dir,
+            'entries': len(entries),
+            'bytes': sum(entry['bytes'] for entry in entries),
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+_default_cache = None
+
+def get_default_cache() -> JobDataCache:
+    """
+    Return the process-wide cache, or None when caching is disabled or unavailable
+    """
+    global _default_cache
+    if not cache_enabled():
+        return None
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return None
+    if _default_cache is None:
+        _default_cache = JobDataCache()
+    return _default_cache
@@ -0,0 +1,320 @@
+"""
+Lazy job queries for the Job Market Explorer
+JobQuery(source).where(...).select(...).agg(...) only records a plan; collect()
+then reads just the columns the plan needs and keeps just the rows that pass
+its filters. Parquet sources skip row groups whose min/max statistics rule out
+the salary/experience ranges and filter the remaining groups in Arrow before
+converting to pandas; CSV and Excel sources are read in projected chunks that
+are filtered as they arrive
+"""
+
+import re
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Union
+from aggregation import aggregate_jobs, parse_metrics
+from compaction import compact_job_data, compaction_enabled
+from prepared_data import PreparedJobData
+from python_functions import (DEFAULT_CHUNKSIZE, _clean_job_data, filter_jobs,
+                              iter_job_data_chunks, normalize_filter_params)
+
+# Characters with a meaning in a regular expression; spaces and most
+# punctuation are literal
+_REGEX_SYNTAX = re.compile(r'[.^$*+?{}\[\]\\|()]')
+
+FILTER_PARAMS = ['job_title', 'location', 'min_salary', 'max_salary',
+                 'min_experience', 'max_experience', 'keyword']
+
+# Column each filter_jobs argument reads
+FILTER_COLUMNS = {
+    'job_title': 'Job Title',
+    'location': 'Location',
+    'min_salary': 'Salary',
+    'max_salary': 'Salary',
+    'min_experience': 'Experience_Years',
+    'max_experience': 'Experience_Years',
+    'keyword': 'Job Description'
+}
+
+# Columns produced by cleaning, and the raw column they are parsed from
+DERIVED_COLUMNS = {
+    'Salary_Min': 'Salary', 'Salary_Max': 'Salary', 'Salary_Mid': 'Salary',
+    'Experience_Years': 'Experience', 'Experience_Min': 'Experience', 'Experience_Max': 'Experience'
+}
+
+RANGE_PARAMS = {
+    'min_salary': ('Salary', 'min'), 'max_salary': ('Salary', 'max'),
+    'min_experience': ('Experience_Years', 'min'), 'max_experience': ('Experience_Years', 'max')
+}
+
+Source = Union[str, pd.DataFrame, PreparedJobData]
+
+class JobQuery:
+    """
+    Immutable query plan over a job data file, DataFrame or prepared dataset
+
+    where() takes the filter_jobs arguments and may be called repeatedly (the
+    conditions are ANDed); select() restricts the output columns and agg()
+    replaces the rows with aggregate_jobs statistics. Results match running
+    filter_jobs on the fully loaded data.
+    """
+
+    def __init__(self, source: Source, chunksize: int = DEFAULT_CHUNKSIZE):
+        self.source = source
+        self.chunksize = chunksize
+        self.filters: List[Dict[str, Any]] = []
+        self.columns: List[str] = None
+        self.metrics: Dict[str, List[str]] = None
+        self.last_stats: Dict[str, Any] = {}
+
+    def _copy(self) -> 'JobQuery':
+        query = JobQuery(self.source, self.chunksize)
+        query.filters = list(self.filters)
+        query.columns = self.columns
+        query.metrics = self.metrics
+        return query
+
+    def where(self, **params) -> 'JobQuery':
+        unknown = set(params) - set(FILTER_PARAMS)
+        if unknown:
+            raise ValueError(f"Unknown filter(s): {', '.join(sorted(unknown))}")
+        query = self._copy()
+        normalized = normalize_filter_params({name: params.get(name) for name in FILTER_PARAMS})
+        if any(value is not None for value in normalized.values()):
+            query.filters.append(normalized)
+        return query
+
+    def select(self, *columns: str) -> 'JobQuery':
+        query = self._copy()
+        query.columns = list(columns[0]) if len(columns) == 1 and isinstance(columns[0], (list, tuple)) \
+            else list(columns)
+        return query
+
+    def agg(self, metrics: Any) -> 'JobQuery':
+        query = self._copy()
+        query.metrics = parse_metrics(metrics)
+        return query
+
+    def _filter_columns(self) -> List[str]:
+        return [FILTER_COLUMNS[name] for spec in self.filters for name, value in spec.items() if value is not None]
+
+    def output_columns(self) -> List[str]:
+        """
+        Columns the result needs, or None for every column
+        """
+        if self.metrics is not None:
+            return list(self.metrics)
+        return self.columns
+
+    def needed_columns(self) -> List[str]:
+        """
+        Cleaned columns that must be read: the output plus every filtered column
+        """
+        output = self.output_columns()
+        if output is None:
+            return None
+        return list(dict.fromkeys(output + self._filter_columns()))
+
+    def _ranges(self) -> Dict[str, List[float]]:
+        """
+        Tightest [low, high] per range column across all where() calls
+        """
+        ranges = {}
+        for spec in self.filters:
+            for name, (column, side) in RANGE_PARAMS.items():
+                value = spec.get(name)
+                if value is None:
+                    continue
+                low, high = ranges.get(column, [-np.inf, np.inf])
+                ranges[column] = [max(low, value), high] if side == 'min' else [low, min(high, value)]
+        return ranges
+
+    def explain(self) -> str:
+        """
+        Human-readable description of the plan
+        """
+        source = self.source if isinstance(self.source, str) else type(self.source).__name__
+        lines = [f"Source: {source}"]
+        needed = self.needed_columns()
+        lines.append(f"Read columns: {', '.join(needed) if needed else 'all'}")
+        for column, (low, high) in self._ranges().items():
+            lines.append(f"Range pushdown: {low} <= {column} <= {high}")
+        for spec in self.filters:
+            lines.append("Filter: " + ', '.join(f"{name}={value!r}" for name, value in spec.items() if value is not None))
+        if self.metrics is not None:
+            lines.append("Aggregate: " + ', '.join(f"{column}:{name}" for column, names in self.metrics.items()
+                                                   for name in names))
+        elif self.columns is not None:
+            lines.append(f"Output columns: {', '.join(self.columns)}")
+        return '\n'.join(lines)
+
+    def _apply_filters(self, df: pd.DataFrame) -> pd.DataFrame:
+        for spec in self.filters:
+            df = filter_jobs(df, **spec)
+        return df
+
+    def _finish(self, df: pd.DataFrame) -> Any:
+        output = self.output_columns()
+        if output is not None:
+            df = df[[column for column in output if column in df.columns]]
+        if self.metrics is not None:
+            return aggregate_jobs(df, self.metrics)
+        return df
+
+    def collect(self) -> Any:
+        """
+        Execute the plan: a DataFrame, or the aggregate_jobs result when agg() was used
+        """
+        source = self.source
+        if isinstance(source, (pd.DataFrame, PreparedJobData)):
+            df = source
+            for spec in self.filters:
+                df = filter_jobs(df, **spec)
+            if isinstance(df, PreparedJobData):
+                df = df.df
+            self.last_stats = {'rows_read': len(source), 'rows_returned': len(df)}
+            return self._finish(df)
+
+        if source.lower().endswith('.parquet'):
+            df = self._collect_parquet(source)
+        else:
+            df = self._collect_chunks(source)
+        if compaction_enabled():
+            df = compact_job_data(df)
+        self.last_stats['rows_returned'] = len(df)
+        return self._finish(df)
+
+    def _raw_columns(self, available: List[str]) -> List[str]:
+        """
+        File columns to read for the needed cleaned columns
+        """
+        needed = self.needed_columns()
+        if needed is None:
+            return list(available)
+        columns = []
+        for column in needed:
+            if column not in available and column in DERIVED_COLUMNS:
+                column = DERIVED_COLUMNS[column]
+            if column in available and column not in columns:
+                columns.append(column)
+        return columns
+
+    def _collect_chunks(self, path: str) -> pd.DataFrame:
+        if path.lower().endswith('.csv'):
+            header = pd.read_csv(path, nrows=0).columns
+        else:
+            header = pd.read_excel(path, nrows=0).columns
+        usecols = self._raw_columns([str(column) for column in header])
+
+        rows_read, frames = 0, []
+        for chunk in iter_job_data_chunks(path, chunksize=self.chunksize, usecols=usecols):
+            rows_read += len(chunk)
+            chunk = self._apply_filters(chunk)
+            if len(chunk):
+                frames.append(chunk)
+        self.last_stats = {'columns_read': usecols, 'rows_read': rows_read}
+        if not frames:
+            # No row passed: clean an empty frame so the columns match a non-empty result
+            return _clean_job_data(pd.DataFrame({column: pd.Series(dtype=str) for column in usecols}))
+        return pd.concat(frames, ignore_index=True)
+
+    def _collect_parquet(self, path: str) -> pd.DataFrame:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(path)
+        schema = parquet.schema_arrow
+        available = list(schema.names)
+        columns = self._raw_columns(available)
+
+        # Range predicates can only be pushed down on columns stored as numbers;
+        # text salaries are parsed first and filtered afterwards
+        numeric = [name for name in available
+                   if pa.types.is_integer(schema.field(name).type) or pa.types.is_floating(schema.field(name).type)]
+        ranges = {column: bounds for column, bounds in self._ranges().items() if column in numeric}
+        # Statistics are per Parquet leaf column, whose numbering differs from the
+        # Arrow schema's when the file holds index or nested columns
+        leaves = {parquet.metadata.schema.column(i).path: i for i in range(parquet.metadata.num_columns)}
+        positions = {column: leaves[column] for column in ranges if column in leaves}
+        text = [name for name in available
+                if pa.types.is_string(schema.field(name).type) or pa.types.is_large_string(schema.field(name).type)]
+        literals = self._literal_patterns(text)
+
+        metadata = parquet.metadata
+        frames, groups_read, rows_read = [], 0, 0
+        for group in range(metadata.num_row_groups):
+            row_group = metadata.row_group(group)
+            if self._prune(row_group, ranges, positions):
+                continue
+            table = parquet.read_row_group(group, columns=columns)
+            groups_read += 1
+            rows_read += table.num_rows
+
+            mask = None
+            for column, (low, high) in ranges.items():
+                values = table.column(column)
+                condition = pc.and_(pc.greater_equal(values, low), pc.less_equal(values, high))
+                mask = condition if mask is None else pc.and_(mask, condition)
+            for column, pattern in literals:
+                condition = pc.match_substring(table.column(column), pattern, ignore_case=True)
+                mask = condition if mask is None else pc.and_(mask, condition)
+            if mask is not None:
+                table = table.filter(pc.fill_null(mask, False))
+            if table.num_rows:
+                frames.append(table.to_pandas())
+
+        self.last_stats = {
+            'columns_read': columns,
+            'row_groups': metadata.num_row_groups,
+            'row_groups_read': groups_read,
+            'rows_read': rows_read
+        }
+        if frames:
+            df = pd.concat(frames, ignore_index=True)
+        else:
+            df = schema.empty_table().select(columns).to_pandas()
+        # Raw files still need their salary/experience text parsed; cleaned
+        # files already hold the numeric columns
+        raw_salary = 'Salary' in df.columns and not pd.api.types.is_numeric_dtype(df['Salary'].dtype)
+        raw_experience = 'Experience' in df.columns and 'Experience_Years' not in df.columns
+        if raw_salary or raw_experience:
+            df = _clean_job_data(df)
+        return self._apply_filters(df).reset_index(drop=True)
+
+    def _literal_patterns(self, text_columns: List[str]) -> List[tuple]:
+        """
+        Substring filters that Arrow can evaluate before conversion
+
+        filter_jobs treats titles and locations as regular expressions, so
+        only patterns without regex syntax are pushed down.
+        """
+        literals = []
+        for spec in self.filters:
+            for name in ('job_title', 'location', 'keyword'):
+                value = spec.get(name)
+                column = FILTER_COLUMNS[name]
+                if value is None or column not in text_columns:
+                    continue
+                if name == 'keyword' or not _REGEX_SYNTAX.search(value):
+                    literals.append((column, value))
+        return literals
+
+    @staticmethod
+    def _prune(row_group: Any, ranges: Dict[str, List[float]], positions: Dict[str, int]) -> bool:
+        """
+        True when the row group's statistics show no row can satisfy the ranges
+        """
+        for column, (low, high) in ranges.items():
+            if column not in positions:
+                continue
+            stats = row_group.column(positions[column]).statistics
+            if stats is None:
+                continue
+            if stats.null_count == row_group.num_rows:
+                return True
+            if not stats.has_min_max:
+                continue
+            if stats.max < low or stats.min > high:
+                return True
+        return False
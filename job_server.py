@@ -0,0 +1,554 @@
+"""
+Local warm-process query server for the Job Market Explorer
+A JobServer loads and prepares job datasets once and answers filter_jobs,
+summary/statistics and chart requests for any number of local clients, so
+Excel sessions, demo runs and batch scripts share one warm process instead of
+each loading and cleaning its own copy. Messages are JSON objects framed with
+a 4-byte big-endian length; each request carries an id that its response
+echoes, so a JobClient can pipeline many requests over one connection
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import math
+import socket
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from aggregation import aggregate_jobs
+from charts import CHART_DATA, ChartCache, get_default_chart_cache, render_chart_png
+from dedup import unique_postings
+from prepared_data import prepare_job_data
+from python_functions import (calculate_salary_stats, filter_jobs, get_job_summary, get_top_values, get_unique_values,
+                              load_job_data, normalize_filter_params)
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_TIMEOUT = 60.0
+# Larger frames are refused rather than buffered
+MAX_MESSAGE_BYTES = 64 * 1024 ** 2
+
+FILTER_PARAMS = ['job_title', 'location', 'min_salary', 'max_salary',
+                 'min_experience', 'max_experience', 'keyword']
+
+_HEADER = struct.Struct('>I')
+
+logger = logging.getLogger('job_server')
+
+class JobServerError(RuntimeError):
+    """
+    A request the server answered with an error
+    """
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    body = json.dumps(message, allow_nan=False).encode('utf-8')
+    if len(body) > MAX_MESSAGE_BYTES:
+        raise ValueError(f"Message of {len(body)} bytes exceeds the {MAX_MESSAGE_BYTES} byte limit")
+    return _HEADER.pack(len(body)) + body
+
+def to_jsonable(value: Any) -> Any:
+    """
+    Convert a result to plain JSON types: NumPy scalars to Python ones,
+    DataFrames to frame payloads, Series to dicts and NaN/NaT to None
+    """
+    if isinstance(value, dict):
+        return {str(key): to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(item) for item in value]
+    if isinstance(value, pd.DataFrame):
+        return frame_to_payload(value)
+    if isinstance(value, pd.Series):
+        return to_jsonable(value.to_dict())
+    if isinstance(value, np.ndarray):
+        return to_jsonable(value.tolist())
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return float(value) if math.isfinite(value) else None
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if value is pd.NA or value is pd.NaT:
+        return None
+    return value
+
+def frame_to_payload(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    DataFrame as {'columns': [...], 'data': [[...], ...]} with missing values as None
+    """
+    return json.loads(df.to_json(orient='split', index=False, date_format='iso'))
+
+def payload_to_frame(payload: Dict[str, Any]) -> pd.DataFrame:
+    return pd.DataFrame(payload['data'], columns=payload['columns'])
+
+class Dataset:
+    """
+    A loaded job dataset and its prepared indexes
+    """
+
+    def __init__(self, name: str, df: pd.DataFrame, source_path: str = None):
+        self.name = name
+        self.df = df
+        self.prepared = prepare_job_data(df, source_path=source_path)
+        self.source_path = source_path
+        self.loaded_at = time.time()
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'rows': len(self.df),
+            'columns': [str(column) for column in self.df.columns],
+            'source_path': self.source_path,
+            'loaded_at': self.loaded_at
+        }
+
+    def filtered(self, params: Dict[str, Any]) -> pd.DataFrame:
+        filters = {name: params.get(name) for name in FILTER_PARAMS}
+        filters = normalize_filter_params(filters)
+        # Counts unique postings only; the dataset must carry Cluster_ID
+        unique_only = bool(params.get('unique_only'))
+        if all(value is None for value in filters.values()):
+            return unique_postings(self.df) if unique_only else self.df
+        return filter_jobs(self.prepared, unique_only=unique_only, **filters)
+
+class JobServer:
+    """
+    asyncio server sharing prepared job datasets between local clients
+
+    Requests run on a thread pool, at most max_concurrency at a time (further
+    requests wait their turn), and are abandoned with an error after
+    request_timeout seconds. Every request is logged with its method, dataset
+    and elapsed time on the 'job_server' logger. Bind to localhost only: the
+    protocol has no authentication.
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY, request_timeout: float = DEFAULT_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.max_concurrency = max_concurrency
+        self.request_timeout = request_timeout
+        self.datasets: Dict[str, Dataset] = {}
+        self.requests = 0
+        self.errors = 0
+        self._datasets_lock = threading.Lock()
+        # pyplot keeps global state, so figures are drawn one at a time
+        self._chart_lock = threading.Lock()
+        self._chart_cache = get_default_chart_cache()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            'ping': lambda params: 'pong',
+            'datasets': self._list_datasets,
+            'load': self._load,
+            'unload': self._unload,
+            'filter_jobs': self._filter_jobs,
+            'salary_stats': lambda params: calculate_salary_stats(self._rows(params)),
+            'job_summary': lambda params: get_job_summary(self._rows(params)),
+            'top_values': lambda params: get_top_values(self._rows(params), params['column'], int(params.get('n', 5))),
+            'unique_values': lambda params: get_unique_values(self._dataset(params).prepared, params['column']),
+            'aggregate': lambda params: aggregate_jobs(self._rows(params), params['metrics']),
+            'chart': self._chart,
+            'stats': lambda params: self.stats()
+        }
+
+    # Datasets
+
+    def load_dataset(self, name: str, file_path: str = None, df: pd.DataFrame = None) -> Dict[str, Any]:
+        """
+        Load (or replace) a named dataset from a file or an already loaded frame
+        """
+        if df is None:
+            df = load_job_data(file_path)
+        if 'Error' in df.columns and len(df.columns) == 1:
+            raise ValueError(f"Could not load {file_path}: {df['Error'].iloc[0]}")
+        dataset = Dataset(name, df, source_path=file_path)
+        with self._datasets_lock:
+            self.datasets[name] = dataset
+        logger.info("loaded dataset %s: %d rows", name, len(df))
+        return dataset.info()
+
+    def _dataset(self, params: Dict[str, Any]) -> Dataset:
+        name = params.get('dataset')
+        with self._datasets_lock:
+            if name is None and len(self.datasets) == 1:
+                return next(iter(self.datasets.values()))
+            if name not in self.datasets:
+                raise ValueError(f"Unknown dataset: {name}")
+            return self.datasets[name]
+
+    def _rows(self, params: Dict[str, Any]) -> pd.DataFrame:
+        return self._dataset(params).filtered(params)
+
+    # Handlers
+
+    def _list_datasets(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        with self._datasets_lock:
+            return [dataset.info() for dataset in self.datasets.values()]
+
+    def _load(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return self.load_dataset(params['name'], params['path'])
+
+    def _unload(self, params: Dict[str, Any]) -> bool:
+        with self._datasets_lock:
+            return self.datasets.pop(params['name'], None) is not None
+
+    def _filter_jobs(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        df = self._rows(params)
+        rows = len(df)
+        if params.get('columns'):
+            df = df[[column for column in params['columns'] if column in df.columns]]
+        limit = params.get('limit')
+        if limit is not None:
+            df = df.head(int(limit))
+        payload = frame_to_payload(df)
+        payload['rows'] = rows
+        return payload
+
+    def _chart(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        kind = params.get('kind', 'salary')
+        if kind not in CHART_DATA:
+            raise ValueError(f"Unknown chart: {kind}; expected one of {', '.join(CHART_DATA)}")
+        data = CHART_DATA[kind](self._rows(params))
+        title, dpi = params.get('title'), int(params.get('dpi', 100))
+        key = ChartCache.key(data, title, dpi)
+        image = self._chart_cache.get(key) if self._chart_cache is not None else None
+        cached = image is not None
+        if not cached:
+            with self._chart_lock:
+                image = render_chart_png(data, title=title, dpi=dpi)
+            if self._chart_cache is not None:
+                self._chart_cache.put(key, image)
+        return {'kind': kind, 'format': 'png', 'cached': cached, 'png': base64.b64encode(image).decode('ascii')}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'datasets': sorted(self.datasets),
+            'max_concurrency': self.max_concurrency
+        }
+
+    # Protocol
+
+    async def _run(self, handler: Callable[[Dict[str, Any]], Any], params: Dict[str, Any]) -> Any:
+        # A timed-out request cannot interrupt its worker thread, so its slot
+        # is released only when the work really finishes
+        await self._semaphore.acquire()
+        loop = asyncio.get_running_loop()
+
+        def release(_):
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(self._semaphore.release)
+
+        try:
+            future = self._executor.submit(handler, params)
+        except BaseException:
+            self._semaphore.release()
+            raise
+        future.add_done_callback(release)
+        return await asyncio.wrap_future(future)
+
+    async def _execute(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        request_id = request.get('id')
+        method = request.get('method')
+        params = request.get('params') or {}
+        start = time.perf_counter()
+        try:
+            handler = self._handlers.get(method)
+            if handler is None:
+                raise ValueError(f"Unknown method: {method}")
+            result = await asyncio.wait_for(self._run(handler, params), self.request_timeout)
+            response = {'id': request_id, 'ok': True, 'result': to_jsonable(result)}
+        except asyncio.TimeoutError:
+            response = {'id': request_id, 'ok': False,
+                        'error': f"{method} timed out after {self.request_timeout:g}s"}
+        except Exception as e:
+            response = {'id': request_id, 'ok': False, 'error': f"{type(e).__name__}: {e}"}
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        response['elapsed_ms'] = round(elapsed_ms, 3)
+        self.requests += 1
+        self.errors += not response['ok']
+        logger.info("%s dataset=%s %s %.1fms", method, params.get('dataset'),
+                    'ok' if response['ok'] else 'error', elapsed_ms)
+        return response
+
+    async def _respond(self, request: Dict[str, Any], writer: asyncio.StreamWriter, write_lock: asyncio.Lock) -> None:
+        response = await self._execute(request)
+        try:
+            data = encode_message(response)
+        except (TypeError, ValueError) as e:
+            data = encode_message({'id': response['id'], 'ok': False, 'error': f"{type(e).__name__}: {e}",
+                                   'elapsed_ms': response['elapsed_ms']})
+        async with write_lock:
+            writer.write(data)
+            await writer.drain()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # Requests on one connection run concurrently; responses are written as
+        # they complete and matched to requests by id
+        write_lock = asyncio.Lock()
+        pending = set()
+        self._connections[asyncio.current_task()] = writer
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(_HEADER.size)
+                except asyncio.IncompleteReadError:
+                    break
+                (length,) = _HEADER.unpack(header)
+                if length > MAX_MESSAGE_BYTES:
+                    logger.warning("closing connection: %d byte request exceeds the limit", length)
+                    break
+                body = await reader.readexactly(length)
+                try:
+                    request = json.loads(body)
+                    if not isinstance(request, dict):
+                        raise ValueError("Request must be a JSON object")
+                except ValueError as e:
+                    async with write_lock:
+                        writer.write(encode_message({'id': None, 'ok': False, 'error': f"Bad request: {e}"}))
+                    continue
+                task = asyncio.ensure_future(self._respond(request, writer, write_lock))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.pop(asyncio.current_task(), None)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    # Lifecycle
+
+    async def start(self) -> Tuple[str, int]:
+        """
+        Start listening; returns the bound (host, port), useful with port=0
+        """
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='job_server')
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.host, self.port = self._server.sockets[0].getsockname()[:2]
+        logger.info("listening on %s:%d", self.host, self.port)
+        return self.host, self.port
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _shutdown(self) -> None:
+        self._server.close()
+        # Closing the transports ends handlers still waiting on idle clients
+        connections = dict(self._connections)
+        for writer in connections.values():
+            writer.close()
+        await asyncio.gather(*connections, return_exceptions=True)
+        await self.close()
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    def start_in_thread(self) -> Tuple[str, int]:
+        """
+        Run the server on its own event loop in a daemon thread; returns (host, port)
+        """
+        started = threading.Event()
+        failure: List[BaseException] = []
+
+        def run():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(self.start())
+            except BaseException as e:
+                failure.append(e)
+                started.set()
+                loop.close()
+                return
+            started.set()
+            try:
+                loop.run_forever()
+            finally:
+                loop.run_until_complete(self.close())
+                loop.close()
+
+        self._thread = threading.Thread(target=run, name='job_server', daemon=True)
+        self._thread.start()
+        started.wait()
+        if failure:
+            raise failure[0]
+        return self.host, self.port
+
+    def stop(self) -> None:
+        """
+        Stop a server started with start_in_thread
+        """
+        if self._thread is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._thread = None
+
+class JobClient:
+    """
+    Blocking client for a JobServer that keeps its connection open between calls
+
+    call() sends one request and waits for its result; pipeline() sends a
+    batch of requests before reading any response, so the server works on
+    them concurrently and the batch costs about one round trip.
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, timeout: float = DEFAULT_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._socket: Optional[socket.socket] = None
+        self._next_id = 0
+        self.last_elapsed_ms: Dict[Any, float] = {}
+
+    def __enter__(self) -> 'JobClient':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _connection(self) -> socket.socket:
+        if self._socket is None:
+            self._socket = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return self._socket
+
+    def close(self) -> None:
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def _receive_exactly(self, size: int) -> bytes:
+        chunks, remaining = [], size
+        while remaining:
+            chunk = self._socket.recv(min(remaining, 1 << 20))
+            if not chunk:
+                raise ConnectionError("Server closed the connection")
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b''.join(chunks)
+
+    def _receive(self) -> Dict[str, Any]:
+        (length,) = _HEADER.unpack(self._receive_exactly(_HEADER.size))
+        return json.loads(self._receive_exactly(length))
+
+    def pipeline(self, requests: List[Tuple[str, Dict[str, Any]]], raise_errors: bool = True) -> List[Any]:
+        """
+        Send (method, params) requests together and return their results in order
+
+        With raise_errors=False a failed request gives a JobServerError in its
+        place instead of raising.
+        """
+        if not requests:
+            return []
+        ids = []
+        messages = []
+        for method, params in requests:
+            self._next_id += 1
+            ids.append(self._next_id)
+            messages.append(encode_message({'id': self._next_id, 'method': method, 'params': params or {}}))
+        connection = self._connection()
+        try:
+            connection.sendall(b''.join(messages))
+            responses = {}
+            while len(responses) < len(ids):
+                response = self._receive()
+                responses[response.get('id')] = response
+        except (OSError, ValueError):
+            # The stream position is unknown after a failure: reconnect next time
+            self.close()
+            raise
+
+        results = []
+        for request_id in ids:
+            response = responses[request_id]
+            self.last_elapsed_ms[request_id] = response.get('elapsed_ms')
+            if response['ok']:
+                results.append(response['result'])
+            elif raise_errors:
+                raise JobServerError(response['error'])
+            else:
+                results.append(JobServerError(response['error']))
+        return results
+
+    def call(self, method: str, **params) -> Any:
+        return self.pipeline([(method, params)])[0]
+
+    # Convenience wrappers mirroring python_functions
+
+    def filter_jobs(self, dataset: str = None, columns: List[str] = None, limit: int = None, **filters) -> pd.DataFrame:
+        payload = self.call('filter_jobs', dataset=dataset, columns=columns, limit=limit, **filters)
+        return payload_to_frame(payload)
+
+    def job_summary(self, dataset: str = None, **filters) -> Dict[str, Any]:
+        return self.call('job_summary', dataset=dataset, **filters)
+
+    def salary_stats(self, dataset: str = None, **filters) -> Dict[str, Any]:
+        return self.call('salary_stats', dataset=dataset, **filters)
+
+    def top_values(self, column: str, n: int = 5, dataset: str = None, **filters) -> Dict[str, int]:
+        return self.call('top_values', dataset=dataset, column=column, n=n, **filters)
+
+    def chart_png(self, kind: str, dataset: str = None, dpi: int = 100, **filters) -> bytes:
+        result = self.call('chart', dataset=dataset, kind=kind, dpi=dpi, **filters)
+        return base64.b64decode(result['png'])
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Serve job datasets to local Job Market Explorer clients')
+    parser.add_argument('datasets', nargs='*', metavar='[NAME=]PATH',
+                        help='job data files to load at startup (named after the file unless NAME= is given)')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--max-concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY)
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help='seconds per request')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(name)s %(message)s')
+    server = JobServer(args.host, args.port, args.max_concurrency, args.timeout)
+    for spec in args.datasets:
+        name, _, path = spec.rpartition('=')
+        if not name:
+            name = path.replace('\\', '/').rsplit('/', 1)[-1].rsplit('.', 1)[0]
+        server.load_dataset(name, path)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,245 @@
+"""
+Opt-in instrumentation for the Job Market Explorer functions
+Instrumented functions record call counts, latency percentiles, input/output
+row counts and (optionally) peak traced memory in an in-process registry.
+Collection is off by default; turn it on with JOB_EXPLORER_METRICS=1 (or
+=memory to also trace allocations) or with the collect_metrics() context
+manager. When off, an instrumented call costs one attribute check
+"""
+
+import functools
+import json
+import os
+import random
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+METRICS_ENV_VAR = 'JOB_EXPLORER_METRICS'
+# Latency samples kept per function for percentiles (reservoir sampling beyond this)
+RESERVOIR_SIZE = 2048
+PERCENTILES = (50, 95, 99)
+
+class _State:
+    """
+    Switches read on every instrumented call
+    """
+
+    def __init__(self):
+        setting = os.environ.get(METRICS_ENV_VAR, '').strip().lower()
+        self.enabled = setting in ('1', 'true', 'on', 'yes', 'memory')
+        self.memory = setting == 'memory'
+
+_state = _State()
+_local = threading.local()
+
+def _row_count(value: Any) -> Optional[int]:
+    """
+    Rows in a DataFrame, Series or prepared dataset, None for anything else
+    """
+    if hasattr(value, 'shape') and hasattr(value, 'index'):
+        return len(value)
+    if hasattr(value, 'df') and hasattr(value.df, 'index'):
+        return len(value.df)
+    return None
+
+class FunctionStats:
+    """
+    Accumulated measurements for one function
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.rows_in = 0
+        self.rows_out = 0
+        self.peak_bytes = None
+        self.samples: List[float] = []
+        self._random = random.Random(0)
+
+    def add(self, seconds: float, rows_in: Optional[int], rows_out: Optional[int],
+            peak_bytes: Optional[int], error: bool) -> None:
+        self.calls += 1
+        self.errors += int(error)
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.rows_in += rows_in or 0
+        self.rows_out += rows_out or 0
+        if peak_bytes is not None:
+            self.peak_bytes = max(self.peak_bytes or 0, peak_bytes)
+        if len(self.samples) < RESERVOIR_SIZE:
+            self.samples.append(seconds)
+        else:
+            slot = self._random.randrange(self.calls)
+            if slot < RESERVOIR_SIZE:
+                self.samples[slot] = seconds
+
+    def summary(self) -> Dict[str, Any]:
+        ordered = sorted(self.samples)
+        result = {
+            'calls': self.calls,
+            'errors': self.errors,
+            'total_ms': round(self.total_seconds * 1000, 3),
+            'mean_ms': round(self.total_seconds / self.calls * 1000, 3) if self.calls else 0.0
+        }
+        for level in PERCENTILES:
+            index = min(len(ordered) - 1, int(round(level / 100 * (len(ordered) - 1))))
+            result[f'p{level}_ms'] = round(ordered[index] * 1000, 3) if ordered else 0.0
+        result.update({
+            'max_ms': round(self.max_seconds * 1000, 3),
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'peak_bytes': self.peak_bytes
+        })
+        return result
+
+class MetricsRegistry:
+    """
+    Thread-safe collection of FunctionStats keyed by function name
+    """
+
+    def __init__(self):
+        self._stats: Dict[str, FunctionStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float, rows_in: Optional[int] = None, rows_out: Optional[int] = None,
+               peak_bytes: Optional[int] = None, error: bool = False) -> None:
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = FunctionStats(name)
+            stats.add(seconds, rows_in, rows_out, peak_bytes, error)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Summary per function, slowest total time first
+        """
+        with self._lock:
+            summaries = {name: stats.summary() for name, stats in self._stats.items()}
+        return dict(sorted(summaries.items(), key=lambda item: -item[1]['total_ms']))
+
+    def to_json(self, path: str = None) -> str:
+        """
+        Snapshot as JSON, also written to path when given
+        """
+        text = json.dumps(self.snapshot(), indent=2)
+        if path:
+            with open(path, 'w') as f:
+                f.write(text)
+        return text
+
+    def format_table(self) -> str:
+        """
+        Snapshot as a plain-text table
+        """
+        columns = ['calls', 'errors', 'total_ms', 'mean_ms'] + [f'p{level}_ms' for level in PERCENTILES] + \
+            ['max_ms', 'rows_in', 'rows_out', 'peak_bytes']
+        snapshot = self.snapshot()
+        rows = [['function'] + columns]
+        for name, summary in snapshot.items():
+            rows.append([name] + ['-' if summary[column] is None else str(summary[column]) for column in columns])
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        lines = ['  '.join(cell.ljust(widths[0]) if i == 0 else cell.rjust(widths[i]) for i, cell in enumerate(row))
+                 for row in rows]
+        lines.insert(1, '  '.join('-' * width for width in widths))
+        return '\n'.join(lines)
+
+REGISTRY = MetricsRegistry()
+
+def metrics_enabled() -> bool:
+    return _state.enabled
+
+def enable_metrics(memory: bool = False) -> None:
+    """
+    Start collecting; memory=True also traces peak allocations (slower)
+    """
+    _state.enabled = True
+    _state.memory = memory
+
+def disable_metrics() -> None:
+    _state.enabled = False
+    _state.memory = False
+
+@contextmanager
+def collect_metrics(memory: bool = False, reset: bool = False) -> Iterator[MetricsRegistry]:
+    """
+    Collect metrics inside a with-block, restoring the previous setting afterwards
+    """
+    previous = (_state.enabled, _state.memory)
+    if reset:
+        REGISTRY.reset()
+    enable_metrics(memory=memory)
+    try:
+        yield REGISTRY
+    finally:
+        _state.enabled, _state.memory = previous
+
+def _measure(name: str, func: Callable, args: tuple, kwargs: Dict[str, Any]) -> Any:
+    # Nested instrumented calls each need their own peak, but tracemalloc has a
+    # single peak counter: the caller's peak so far is carried on a stack
+    # before the counter is reset for the callee
+    frames = getattr(_local, 'frames', None)
+    if frames is None:
+        frames = _local.frames = []
+    trace = _state.memory
+    started_tracing = False
+    if trace:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+        current, peak = tracemalloc.get_traced_memory()
+        if frames:
+            frames[-1]['carried'] = max(frames[-1]['carried'], peak)
+        tracemalloc.reset_peak()
+        frames.append({'start': current, 'carried': 0})
+
+    error = False
+    result = None
+    start = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+        return result
+    except Exception:
+        error = True
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        peak_bytes = None
+        if trace:
+            frame = frames.pop()
+            _, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, frame['carried'])
+            peak_bytes = max(0, peak - frame['start'])
+            if frames:
+                frames[-1]['carried'] = max(frames[-1]['carried'], peak)
+            if started_tracing:
+                tracemalloc.stop()
+        rows_in = _row_count(args[0]) if args else None
+        REGISTRY.record(name, seconds, rows_in, _row_count(result), peak_bytes, error)
+
+def instrument(func: Callable = None, name: str = None) -> Callable:
+    """
+    Record metrics for func while collection is enabled
+
+    Use as @instrument or instrument(func, name='...').
+    """
+    if func is None:
+        return lambda f: instrument(f, name=name)
+    label = name or func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _state.enabled:
+            return func(*args, **kwargs)
+        return _measure(label, func, args, kwargs)
+
+    return wrapper
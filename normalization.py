@@ -0,0 +1,185 @@
+"""
+Vectorized salary and experience normalization for the Job Market Explorer
+Parses salary text such as '$120k', '$100,000-$140,000' or '$45/hr' into
+annual Salary_Min/Salary_Max/Salary_Mid, and experience text such as
+'2-4 years', '5+ years' or '6 months' into Experience_Min/Experience_Max (in
+years). Each distinct string is parsed once with vectorized regex extraction
+and the results are mapped back to the rows through their codes
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Tuple, Union
+
+SALARY_COLUMNS = ['Salary_Min', 'Salary_Max', 'Salary_Mid']
+EXPERIENCE_COLUMNS = ['Experience_Min', 'Experience_Max']
+
+# Annualization factors (40-hour weeks, 260 working days)
+PERIOD_MULTIPLIERS = {'hour': 2080, 'day': 260, 'week': 52, 'month': 12, 'year': 1}
+SUFFIX_MULTIPLIERS = {'k': 1e3, 'm': 1e6}
+
+_NUMBER = r'\d+(?:\.\d+)?'
+# A k/M suffix must not start a word such as 'month'
+_SUFFIX = r'[km](?![a-z])'
+SALARY_PATTERN = (rf'(?P<upto>up\s*to\D*?)?(?P<low>{_NUMBER})\s*(?P<low_suffix>{_SUFFIX})?\s*(?P<plus>\+)?'
+                  rf'(?:\s*(?:-|–|—|to|through|thru)\s*\D{{0,5}}?(?P<high>{_NUMBER})\s*(?P<high_suffix>{_SUFFIX})?)?')
+# Period words must stand alone ('hr' in 'through' or 'day' in 'today' is not a
+# period) but may follow a digit or '/' directly, as in '$45hr' or '$45/h'
+_PERIOD_WORDS = (r'hours?|hourly|hrs?|days?|daily|weeks?|weekly|wks?|months?|monthly|mos?'
+                 r'|years?|yearly|yrs?|annum|annual(?:ly)?')
+PERIOD_PATTERN = rf'(?P<period>(?<![a-z])(?:{_PERIOD_WORDS})(?![a-z])|/h(?![a-z]))'
+EXPERIENCE_PATTERN = (rf'(?P<upto>up\s*to\D*?)?(?P<low>{_NUMBER})\s*(?P<plus>\+)?'
+                      rf'(?:\s*(?:-|–|—|to|through|thru)\s*(?P<high>{_NUMBER}))?\s*\+?\s*'
+                      rf'(?P<unit>(?:years?|yrs?|months?|mos?)(?![a-z]))?')
+OPEN_ENDED_PATTERN = r'at\s*least|minimum|or more'
+NO_EXPERIENCE_PATTERN = r'\b(?:entry[\s-]*level|no experience|none|internship|graduate)\b'
+
+def _period_name(token: str) -> str:
+    if not isinstance(token, str):
+        return 'year'
+    token = token.lstrip('/')
+    if token.startswith('h'):
+        return 'hour'
+    if token.startswith('d'):
+        return 'day'
+    if token.startswith('w'):
+        return 'week'
+    if token.startswith('mo'):
+        return 'month'
+    return 'year'
+
+def _distinct(values: pd.Series) -> Tuple[pd.Series, np.ndarray]:
+    """
+    Distinct non-missing values as text plus a per-row code into them (-1 = missing)
+    """
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        if not (pd.api.types.is_string_dtype(values.dtype) and not pd.api.types.is_object_dtype(values.dtype)):
+            # Excel columns can mix numbers and text
+            values = values.where(values.isna(), values.astype(str))
+        values = values.astype('category')
+    texts = pd.Series(np.asarray(values.cat.categories, dtype=object), dtype=object).astype(str)
+    return texts, values.cat.codes.to_numpy()
+
+def _take(parsed: pd.DataFrame, codes: np.ndarray, index: pd.Index) -> pd.DataFrame:
+    """
+    Expand per-distinct-value results to rows; missing codes give NaN
+    """
+    columns = {}
+    for column in parsed.columns:
+        table = np.append(parsed[column].to_numpy(dtype=float), np.nan)
+        columns[column] = table[codes]
+    return pd.DataFrame(columns, index=index)
+
+def _parse_salary_texts(texts: pd.Series) -> pd.DataFrame:
+    lowered = texts.str.lower().str.replace(',', '', regex=False)
+    parts = lowered.str.extract(SALARY_PATTERN)
+    period = lowered.str.extract(PERIOD_PATTERN)['period'].map(_period_name)
+
+    low_suffix = parts['low_suffix'].fillna(parts['high_suffix'].where(parts['high'].notna()))
+    low = pd.to_numeric(parts['low'], errors='coerce') * low_suffix.map(SUFFIX_MULTIPLIERS).fillna(1)
+    high = pd.to_numeric(parts['high'], errors='coerce') * parts['high_suffix'].map(SUFFIX_MULTIPLIERS).fillna(1)
+
+    single = high.isna()
+    high = high.where(~single, low.where(parts['plus'].isna() & ~lowered.str.contains(OPEN_ENDED_PATTERN)))
+    low = low.where(~(single & parts['upto'].notna()))
+    low, high = np.fmin(low, high).where(low.notna() & high.notna(), low), \
+        np.fmax(low, high).where(low.notna() & high.notna(), high)
+
+    factor = period.map(PERIOD_MULTIPLIERS).astype(float)
+    low, high = low * factor, high * factor
+    mid = ((low + high) / 2).fillna(low).fillna(high)
+    return pd.DataFrame({'Salary_Min': low, 'Salary_Max': high, 'Salary_Mid': mid})
+
+def _parse_experience_texts(texts: pd.Series) -> pd.DataFrame:
+    lowered = texts.str.lower()
+    parts = lowered.str.extract(EXPERIENCE_PATTERN)
+    low = pd.to_numeric(parts['low'], errors='coerce')
+    high = pd.to_numeric(parts['high'], errors='coerce')
+
+    single = high.isna()
+    open_ended = parts['plus'].notna() | lowered.str.contains(r'\+|' + OPEN_ENDED_PATTERN)
+    high = high.where(~single, low.where(~open_ended))
+    upto = single & parts['upto'].notna()
+    low = low.where(~upto, 0.0)
+
+    months = parts['unit'].str.startswith('mo', na=False)
+    low, high = low.where(~months, low / 12), high.where(~months, high / 12)
+
+    none = low.isna() & lowered.str.contains(NO_EXPERIENCE_PATTERN, regex=True)
+    low, high = low.where(~none, 0.0), high.where(~none, 0.0)
+    return pd.DataFrame({'Experience_Min': low, 'Experience_Max': high})
+
+def parse_salary(values: pd.Series) -> pd.DataFrame:
+    """
+    Annual Salary_Min/Salary_Max/Salary_Mid for salary text or numbers
+
+    Handles $ signs, thousands separators, k/M suffixes, ranges ('-', 'to'),
+    open ranges ('$100k+', 'up to $90k') and hourly/daily/weekly/monthly pay,
+    which is annualized. Numeric input is taken as already annual. Unparsed
+    values give NaN; see parse_failure_report.
+    """
+    if pd.api.types.is_numeric_dtype(values.dtype) and not isinstance(values.dtype, pd.CategoricalDtype):
+        numbers = values.astype(float)
+        return pd.DataFrame({column: numbers for column in SALARY_COLUMNS}, index=values.index)
+    texts, codes = _distinct(values)
+    return _take(_parse_salary_texts(texts), codes, values.index)
+
+def parse_experience(values: pd.Series) -> pd.DataFrame:
+    """
+    Experience_Min/Experience_Max in years for text such as '2-4 years', '5+ years' or '6 months'
+
+    Open-ended values ('5+ years') have no maximum; 'entry level' and
+    'no experience' give 0.
+    """
+    if pd.api.types.is_numeric_dtype(values.dtype) and not isinstance(values.dtype, pd.CategoricalDtype):
+        numbers = values.astype(float)
+        return pd.DataFrame({column: numbers for column in EXPERIENCE_COLUMNS}, index=values.index)
+    texts, codes = _distinct(values)
+    return _take(_parse_experience_texts(texts), codes, values.index)
+
+def normalize_job_data(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add the parsed salary and experience columns in place
+
+    Salary is replaced by the annual midpoint and Experience_Years by the
+    minimum years, so single values keep their previous meaning.
+    """
+    if 'Salary' in df.columns:
+        salary = parse_salary(df['Salary'])
+        df['Salary'] = salary['Salary_Mid']
+        for column in SALARY_COLUMNS:
+            df[column] = salary[column]
+    if 'Experience' in df.columns:
+        experience = parse_experience(df['Experience'])
+        df['Experience_Years'] = experience['Experience_Min']
+        for column in EXPERIENCE_COLUMNS:
+            df[column] = experience[column]
+    return df
+
+def parse_failure_report(data: Union[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Raw Salary/Experience values that could not be parsed, with their row counts
+
+    data is a raw (uncleaned) DataFrame or the path of a CSV/Excel file.
+    """
+    if isinstance(data, str):
+        columns = lambda column: column in ('Salary', 'Experience')
+        if data.endswith('.csv'):
+            data = pd.read_csv(data, usecols=columns, dtype=str)
+        else:
+            data = pd.read_excel(data, usecols=columns, dtype=str)
+
+    parsers: Dict[str, Tuple] = {'Salary': (parse_salary, 'Salary_Mid'),
+                                 'Experience': (parse_experience, 'Experience_Min')}
+    reports = []
+    for column, (parser, result_column) in parsers.items():
+        if column not in data.columns:
+            continue
+        values = data[column]
+        failed = values.notna() & parser(values)[result_column].isna()
+        failed &= values.astype(str).str.strip().ne('')
+        counts = values[failed].astype(str).value_counts()
+        reports.append(pd.DataFrame({'column': column, 'value': counts.index, 'rows': counts.to_numpy()}))
+    if not reports:
+        return pd.DataFrame(columns=['column', 'value', 'rows'])
+    return pd.concat(reports, ignore_index=True).sort_values('rows', ascending=False, kind='stable').reset_index(drop=True)
@@ -0,0 +1,279 @@
+"""
+Prepared job datasets for the Job Market Explorer
+A PreparedJobData object is built once from load_job_data output and keeps
+sorted indexes on the numeric columns so repeated filter_jobs calls resolve
+salary and experience ranges with binary search instead of full scans,
+dictionary encodings of Job Title and Location so substring filters run once
+per distinct value, and an inverted index for keyword searches over job
+descriptions
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from typing import Any, List, Tuple
+from job_cache import CLEANING_VERSION, get_default_cache
+from search_index import InvertedIndex, text_fingerprint
+
+RANGE_COLUMNS = ['Salary', 'Experience_Years']
+DICTIONARY_COLUMNS = ['Job Title', 'Location']
+TEXT_COLUMN = 'Job Description'
+
+# Below this many candidate rows a keyword is checked directly on the candidates
+INDEX_MIN_CANDIDATES = 1024
+
+class SortedIndex:
+    """
+    Row positions of a numeric column ordered by value, with missing values dropped
+    """
+
+    def __init__(self, values: np.ndarray):
+        values = np.asarray(values, dtype=float)
+        order = np.argsort(values, kind='stable')
+        # NaN sorts last and never satisfies a range comparison
+        n_valid = int(np.count_nonzero(~np.isnan(values)))
+        self.values = values
+        self.order = order[:n_valid]
+        self.sorted_values = values[self.order]
+
+    def bounds(self, low: float = None, high: float = None) -> Tuple[int, int]:
+        """
+        Slice of the sorted order holding low <= value <= high
+        """
+        start = 0 if low is None else int(np.searchsorted(self.sorted_values, float(low), side='left'))
+        stop = len(self.sorted_values) if high is None else int(np.searchsorted(self.sorted_values, float(high), side='right'))
+        return start, max(start, stop)
+
+    def lookup(self, low: float = None, high: float = None) -> np.ndarray:
+        """
+        Row positions with low <= value <= high, in ascending row order
+        """
+        start, stop = self.bounds(low, high)
+        return np.sort(self.order[start:stop])
+
+    def check(self, rows: np.ndarray, low: float = None, high: float = None) -> np.ndarray:
+        """
+        Keep the given row positions whose value lies in [low, high]
+        """
+        values = self.values[rows]
+        keep = ~np.isnan(values)
+        if low is not None:
+            keep &= values >= float(low)
+        if high is not None:
+            keep &= values <= float(high)
+        return rows[keep]
+
+class DictionaryColumn:
+    """
+    Dictionary encoding of a low-cardinality text column: per-row codes into distinct values
+
+    Missing values get code -1. Categorical columns reuse their existing codes.
+    """
+
+    def __init__(self, values: pd.Series):
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            codes = values.cat.codes.to_numpy()
+            dictionary = values.cat.categories
+        else:
+            codes, dictionary = pd.factorize(values)
+        self.codes = np.asarray(codes, dtype=np.int32)
+        self.dictionary = pd.Series(np.asarray(dictionary, dtype=object), dtype=object)
+        self._sorted_values = None
+
+    def match(self, pattern: str, rows: np.ndarray = None, regex: bool = True) -> np.ndarray:
+        """
+        Boolean mask of rows whose value contains pattern (case-insensitive)
+
+        The pattern is tested once per distinct value; rows are then resolved
+        with a vectorized lookup of their codes.
+        """
+        lookup = self.dictionary_matches(pattern, regex=regex)
+        codes = self.codes if rows is None else self.codes[rows]
+        return lookup[codes]
+
+    def dictionary_matches(self, pattern: str, regex: bool = True) -> np.ndarray:
+        """
+        Match flag per distinct value, plus a trailing False for missing values (code -1)
+        """
+        matched = self.dictionary.str.contains(pattern, case=False, na=False, regex=regex).to_numpy(dtype=bool)
+        return np.append(matched, False)
+
+    def observed_values(self) -> List[Any]:
+        """
+        Sorted distinct values that occur in at least one row
+        """
+        if self._sorted_values is None:
+            counts = np.bincount(self.codes[self.codes >= 0], minlength=len(self.dictionary))
+            self._sorted_values = sorted(self.dictionary[counts > 0].tolist())
+        return self._sorted_values
+
+def contains_mask(values: pd.Series, pattern: str, regex: bool = True) -> pd.Series:
+    """
+    Case-insensitive substring match that works per distinct value for categoricals
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return pd.Series(DictionaryColumn(values).match(pattern, regex=regex), index=values.index)
+    return values.str.contains(pattern, case=False, na=False, regex=regex)
+
+class PreparedJobData:
+    """
+    Cleaned job data plus the indexes filter_jobs needs to answer queries quickly
+
+    Pass it to filter_jobs in place of the DataFrame; the result is the same
+    rows, in the same order, that filter_jobs returns for the plain DataFrame.
+    """
+
+    def __init__(self, df: pd.DataFrame, source_path: str = None):
+        self.df = df
+        self.source_path = source_path
+        self.indexes = {
+            column: SortedIndex(df[column].to_numpy(dtype=float, na_value=np.nan))
+            for column in RANGE_COLUMNS if column in df.columns
+        }
+        self.dictionaries = {
+            column: DictionaryColumn(df[column])
+            for column in DICTIONARY_COLUMNS if column in df.columns
+        }
+        self._search_index = None
+
+    @property
+    def search_index(self) -> InvertedIndex:
+        """
+        Inverted index over job descriptions, built on first use
+
+        When the data came from a cached source file the index is saved next to
+        the cache entry and reloaded by later sessions instead of rebuilt.
+        """
+        if self._search_index is None:
+            self._search_index = self._load_or_build_search_index()
+        return self._search_index
+
+    def _load_or_build_search_index(self) -> InvertedIndex:
+        texts = self.df[TEXT_COLUMN]
+        cache = get_default_cache() if self.source_path else None
+        path = fingerprint = None
+        if cache is not None:
+            try:
+                path = cache.artifact_path(self.source_path, CLEANING_VERSION, 'search')
+                # The source may have changed since self.df was loaded, so the
+                # saved index must match the texts, not just the file state
+                fingerprint = text_fingerprint(texts)
+                if os.path.exists(path):
+                    return InvertedIndex.load(path, texts, fingerprint=fingerprint)
+            except Exception:
+                # Missing fingerprint, stale or unreadable index: rebuild and replace it
+                pass
+
+        index = InvertedIndex.build(texts)
+        if path is not None and fingerprint is not None:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                index.save(path, fingerprint)
+            except Exception:
+                pass
+        return index
+
+    def search(self, query: str, mode: str = 'and', ranked: bool = False) -> pd.DataFrame:
+        """
+        Jobs whose description matches a query of terms and "quoted phrases"
+
+        mode='and' requires every term and phrase, mode='or' any of them;
+        ranked=True orders the rows by relevance.
+        """
+        return self.df.iloc[self.search_index.search(query, mode=mode, ranked=ranked)]
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    @property
+    def columns(self) -> pd.Index:
+        return self.df.columns
+
+    def _range_rows(self, ranges: List[Tuple[str, float, float]]) -> np.ndarray:
+        """
+        Resolve range predicates, returning candidate row positions or None for all rows
+        """
+        if not ranges:
+            return None
+        # Start from the most selective range (sizes come from two binary searches)
+        # and check the remaining ranges against that candidate set only
+        sized = []
+        for column, low, high in ranges:
+            start, stop = self.indexes[column].bounds(low, high)
+            sized.append((stop - start, column, low, high))
+        sized.sort(key=lambda item: item[0])
+
+        _, column, low, high = sized[0]
+        rows = self.indexes[column].lookup(low, high)
+        for _, column, low, high in sized[1:]:
+            rows = self.indexes[column].check(rows, low, high)
+        return rows
+
+    def unique_values(self, column: str) -> List[Any]:
+        """
+        Sorted distinct values of a column, read from its dictionary when it has one
+        """
+        if column not in self.dictionaries:
+            self.dictionaries[column] = DictionaryColumn(self.df[column])
+        return self.dictionaries[column].observed_values()
+
+    def _text_rows(self, rows: np.ndarray, column: str, pattern: str, regex: bool = True) -> np.ndarray:
+        """
+        Keep candidate rows whose column contains pattern (case-insensitive)
+        """
+        if column in self.dictionaries:
+            matches = self.dictionaries[column].match(pattern, rows=rows, regex=regex)
+            return np.flatnonzero(matches) if rows is None else rows[matches]
+        values = self.df[column] if rows is None else self.df[column].iloc[rows]
+        matches = values.str.contains(pattern, case=False, na=False, regex=regex).to_numpy(dtype=bool)
+        if rows is None:
+            return np.flatnonzero(matches)
+        return rows[matches]
+
+    def filter(self,
+               job_title: str = None,
+               location: str = None,
+               min_salary: float = None,
+               max_salary: float = None,
+               min_experience: float = None,
+               max_experience: float = None,
+               keyword: str = None) -> pd.DataFrame:
+        """
+        Filter jobs with the same criteria and results as filter_jobs
+        """
+        ranges = [
+            (column, low, high)
+            for column, low, high in [('Salary', min_salary, max_salary),
+                                      ('Experience_Years', min_experience, max_experience)]
+            if low is not None or high is not None
+        ]
+        rows = self._range_rows(ranges)
+
+        if job_title and job_title != 'All':
+            rows = self._text_rows(rows, 'Job Title', job_title)
+
+        if location and location != 'All':
+            rows = self._text_rows(rows, 'Location', location)
+
+        if keyword and keyword.strip():
+            if rows is not None and len(rows) <= INDEX_MIN_CANDIDATES:
+                rows = self._text_rows(rows, TEXT_COLUMN, keyword, regex=False)
+            else:
+                matches = self.search_index.contains(keyword)
+                rows = matches if rows is None else rows[np.isin(rows, matches, assume_unique=True)]
+
+        # Materialize the result once, from the final row set
+        if rows is None:
+            return self.df.copy()
+        return self.df.iloc[rows]
+
+def prepare_job_data(df: pd.DataFrame, source_path: str = None) -> PreparedJobData:
+    """
+    Build the indexed dataset used to speed up repeated filter_jobs calls
+
+    Pass the file df was loaded from as source_path to persist the search
+    index alongside the cached data.
+    """
+    if isinstance(df, PreparedJobData):
+        return df
+    return PreparedJobData(df, source_path=source_path)
@@ -3,30 +3,261 @@ Python functions for Job Market Explorer in Excel
 These functions will be used in Python-enabled Excel cells
 """
 
+import importlib
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
-from typing import List, Dict, Any
+from typing import TYPE_CHECKING, List, Dict, Any, Iterator
+from job_cache import CLEANING_VERSION, JobDataCache, get_default_cache
+from prepared_data import PreparedJobData, DictionaryColumn, prepare_job_data, contains_mask
+from aggregation import aggregate_jobs
+from result_cache import DEFAULT_RESULT_CACHE, memoize
+from normalization import normalize_job_data, parse_failure_report
+from compaction import compact_job_data, compaction_enabled, memory_report
+from metrics import REGISTRY, instrument, collect_metrics, enable_metrics, disable_metrics
 
-def load_job_data(file_path: str) -> pd.DataFrame:
+__all__ = [
+    'JOB_DATA_DTYPES', 'DEFAULT_CHUNKSIZE', 'CLEANING_VERSION',
+    'load_job_data', 'iter_job_data_chunks', 'load_job_data_chunked',
+    'filter_jobs', 'get_unique_values', 'calculate_salary_stats', 'get_job_summary', 'get_top_values',
+    'create_salary_chart', 'create_location_chart', 'create_experience_chart', 'export_filtered_data',
+    'normalize_filter_params', 'cached_filter_jobs', 'cached_job_summary', 'cached_salary_stats',
+    'cached_top_values', 'result_cache_stats', 'metrics_report',
+    'PreparedJobData', 'prepare_job_data', 'aggregate_jobs', 'compact_job_data', 'memory_report',
+    'parse_failure_report', 'collect_metrics', 'enable_metrics', 'disable_metrics',
+    'deduplicate_jobs', 'duplicate_report', 'unique_postings', 'render_charts', 'export_jobs'
+]
+
+# Helpers from modules that filter and summary cells never need are imported
+# on first use: name -> module
+_LAZY_EXPORTS = {
+    'deduplicate_jobs': 'dedup',
+    'duplicate_report': 'dedup',
+    'unique_postings': 'dedup',
+    'render_charts': 'charts',
+    'export_jobs': 'streaming_export'
+}
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_EXPORTS:
+        return getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+    from charts import render_charts
+    from dedup import deduplicate_jobs, duplicate_report, unique_postings
+    from streaming_export import export_jobs
+
+# Raw job columns are parsed as text so the cleanup below always sees strings
+JOB_DATA_DTYPES = {
+    'Job Title': str,
+    'Company': str,
+    'Location': str,
+    'Experience': str,
+    'Salary': str,
+    'Job Description': str
+}
+
+DEFAULT_CHUNKSIZE = 100_000
+
+def _clean_job_data(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return a copy of df with the Salary and Experience columns standardized
+    
+    Salary becomes the annual midpoint of the posted range and Experience_Years
+    the minimum years; the full ranges are added as Salary_Min/Salary_Max/
+    Salary_Mid and Experience_Min/Experience_Max (see normalization).
+    """
+    return normalize_job_data(df)
+
+def _read_job_file(file_path: str) -> pd.DataFrame:
+    """
+    Read and clean a job data file, raising on failure
+    """
+    if file_path.endswith('.csv'):
+        df = pd.read_csv(file_path)
+    else:
+        df = pd.read_excel(file_path)
+    
+    # Clean and standardize data
+    return _clean_job_data(df)
+
+def _load_cleaned_job_data(file_path: str, use_cache: bool = None) -> pd.DataFrame:
+    """
+    Load cleaned job data through the on-disk cache, raising on failure
+    """
+    cache = get_default_cache() if use_cache is not False else None
+    if cache is None and use_cache:
+        cache = JobDataCache()
+    
+    if cache is not None:
+        try:
+            cached = cache.get(file_path, CLEANING_VERSION)
+            if cached is not None:
+                return cached
+        except Exception:
+            # A corrupt or unreadable cache entry falls back to the source file
+            pass
+    
+    df = _read_job_file(file_path)
+    
+    if cache is not None:
+        try:
+            cache.put(file_path, df, CLEANING_VERSION)
+        except Exception:
+            pass
+    return df
+
+@instrument
+def load_job_data(file_path: str, use_cache: bool = None, compact: bool = None) -> pd.DataFrame:
     """
     Load job data from CSV or Excel file
+    
+    Cleaned data is cached on disk (see job_cache) and reused while the source
+    file is unchanged. use_cache=False bypasses the cache; None follows the
+    JOB_EXPLORER_CACHE environment variable. The result is compacted with
+    compact_job_data unless compact=False (None follows JOB_EXPLORER_COMPACT).
     """
     try:
-        if file_path.endswith('.csv'):
-            df = pd.read_csv(file_path)
-        else:
-            df = pd.read_excel(file_path)
-        
-        # Clean and standardize data
-        df['Salary'] = pd.to_numeric(df['Salary'].str.replace('$', '').str.replace(',', ''), errors='coerce')
-        df['Experience_Years'] = df['Experience'].str.extract(r'(\d+)').astype(float)
+        df = _load_cleaned_job_data(file_path, use_cache=use_cache)
+        if compact or (compact is None and compaction_enabled()):
+            df = compact_job_data(df)
+        return df
+    except Exception as e:
+        return pd.DataFrame({'Error': [str(e)]})
+
+def _rechunk(frames: Iterator[pd.DataFrame], chunksize: int) -> Iterator[pd.DataFrame]:
+    """
+    Regroup a stream of DataFrames into chunks of exactly chunksize rows
+    """
+    pending = []
+    pending_rows = 0
+    for frame in frames:
+        pending.append(frame)
+        pending_rows += len(frame)
+        while pending_rows >= chunksize:
+            combined = pd.concat(pending, ignore_index=True) if len(pending) > 1 else pending[0]
+            yield combined.iloc[:chunksize].reset_index(drop=True)
+            rest = combined.iloc[chunksize:]
+            pending = [rest] if len(rest) else []
+            pending_rows = len(rest)
+    if pending_rows:
+        yield pd.concat(pending, ignore_index=True) if len(pending) > 1 else pending[0].reset_index(drop=True)
+
+def _iter_csv_pyarrow(file_path: str, usecols: List[str], dtype: Dict[str, Any]) -> Iterator[pd.DataFrame]:
+    """
+    Stream a CSV file as record batches through pyarrow's multithreaded reader
+    """
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+    
+    column_types = {column: pa.string() for column, kind in dtype.items() if kind is str}
+    convert_options = pa_csv.ConvertOptions(
+        column_types=column_types,
+        include_columns=list(usecols) if usecols else None
+    )
+    reader = pa_csv.open_csv(file_path, convert_options=convert_options)
+    for batch in reader:
+        if batch.num_rows:
+            yield batch.to_pandas()
+
+def _iter_excel_rows(file_path: str, chunksize: int, usecols: List[str], dtype: Dict[str, Any]) -> Iterator[pd.DataFrame]:
+    """
+    Stream the first worksheet of an Excel file in read-only mode
+    """
+    from openpyxl import load_workbook
+    
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        header = [str(name) for name in next(rows, ())]
+        keep = [i for i, name in enumerate(header) if not usecols or name in usecols]
+        columns = [header[i] for i in keep]
         
+        batch = []
+        for row in rows:
+            batch.append([row[i] if i < len(row) else None for i in keep])
+            if len(batch) >= chunksize:
+                yield _apply_text_dtypes(pd.DataFrame(batch, columns=columns), dtype)
+                batch = []
+        if batch:
+            yield _apply_text_dtypes(pd.DataFrame(batch, columns=columns), dtype)
+    finally:
+        wb.close()
+
+def _apply_text_dtypes(df: pd.DataFrame, dtype: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Convert cell values to text for columns declared as str, keeping blanks as missing
+    """
+    for column, kind in dtype.items():
+        if column in df.columns:
+            if kind is str:
+                values = df[column]
+                df[column] = values.where(values.isna(), values.astype(str))
+            else:
+                df[column] = df[column].astype(kind)
+    return df
+
+def iter_job_data_chunks(file_path: str,
+                         chunksize: int = DEFAULT_CHUNKSIZE,
+                         usecols: List[str] = None,
+                         dtype: Dict[str, Any] = None,
+                         engine: str = None) -> Iterator[pd.DataFrame]:
+    """
+    Yield cleaned chunks of job data from a CSV or Excel file
+    
+    Only one chunk (plus the parser's buffer) is held in memory at a time.
+    engine selects the CSV parser: 'c' (default), 'python' or 'pyarrow'.
+    """
+    if chunksize <= 0:
+        raise ValueError("chunksize must be a positive number of rows")
+    dtype = dict(JOB_DATA_DTYPES if dtype is None else dtype)
+    if usecols:
+        dtype = {column: kind for column, kind in dtype.items() if column in usecols}
+    
+    if file_path.endswith('.csv'):
+        if engine == 'pyarrow':
+            chunks = _rechunk(_iter_csv_pyarrow(file_path, usecols, dtype), chunksize)
+        else:
+            chunks = pd.read_csv(file_path, chunksize=chunksize, usecols=usecols,
+                                 dtype=dtype, engine=engine or 'c')
+    else:
+        chunks = _iter_excel_rows(file_path, chunksize, usecols, dtype)
+    
+    for chunk in chunks:
+        yield _clean_job_data(chunk)
+
+@instrument
+def load_job_data_chunked(file_path: str,
+                          chunksize: int = DEFAULT_CHUNKSIZE,
+                          usecols: List[str] = None,
+                          dtype: Dict[str, Any] = None,
+                          engine: str = None,
+                          combine: bool = True,
+                          compact: bool = None):
+    """
+    Load job data chunk by chunk, cleaning each chunk as it is read
+    
+    With combine=False the cleaned chunks are returned as a generator;
+    otherwise they are concatenated into a single DataFrame, compacted as in
+    load_job_data.
+    """
+    chunks = iter_job_data_chunks(file_path, chunksize=chunksize, usecols=usecols,
+                                  dtype=dtype, engine=engine)
+    if not combine:
+        return chunks
+    try:
+        frames = list(chunks)
+        if not frames:
+            return pd.DataFrame(columns=usecols or list(JOB_DATA_DTYPES))
+        df = pd.concat(frames, ignore_index=True)
+        if compact or (compact is None and compaction_enabled()):
+            df = compact_job_data(df)
         return df
     except Exception as e:
         return pd.DataFrame({'Error': [str(e)]})
 
+@instrument
 def filter_jobs(df: pd.DataFrame, 
                 job_title: str = None, 
                 location: str = None, 
@@ -34,17 +265,35 @@ def filter_jobs(df: pd.DataFrame,
                 max_salary: float = None,
                 min_experience: float = None,
                 max_experience: float = None,
-                keyword: str = None) -> pd.DataFrame:
+                keyword: str = None,
+                unique_only: bool = False) -> pd.DataFrame:
     """
     Filter jobs based on multiple criteria
+    
+    df may also be a PreparedJobData (see prepare_job_data), which answers the
+    same query from its sorted indexes instead of scanning every column.
+    unique_only=True keeps only the first matching posting of each duplicate
+    cluster; the data must have been through deduplicate_jobs.
     """
-    filtered_df = df.copy()
+    if isinstance(df, PreparedJobData):
+        filtered = df.filter(job_title=job_title, location=location,
+                             min_salary=min_salary, max_salary=max_salary,
+                             min_experience=min_experience, max_experience=max_experience,
+                             keyword=keyword)
+        if unique_only:
+            from dedup import unique_postings
+            filtered = unique_postings(filtered)
+        return filtered
+    
+    # Shallow: every step below selects rows into a new frame, so read-only
+    # (e.g. shared memory-mapped) columns are never copied up front
+    filtered_df = df.copy(deep=False)
     
     if job_title and job_title != 'All':
-        filtered_df = filtered_df[filtered_df['Job Title'].str.contains(job_title, case=False, na=False)]
+        filtered_df = filtered_df[contains_mask(filtered_df['Job Title'], job_title)]
     
     if location and location != 'All':
-        filtered_df = filtered_df[filtered_df['Location'].str.contains(location, case=False, na=False)]
+        filtered_df = filtered_df[contains_mask(filtered_df['Location'], location)]
     
     if min_salary is not None:
         filtered_df = filtered_df[filtered_df['Salary'] >= min_salary]
@@ -59,129 +308,166 @@ def filter_jobs(df: pd.DataFrame,
         filtered_df = filtered_df[filtered_df['Experience_Years'] <= max_experience]
     
     if keyword and keyword.strip():
-        filtered_df = filtered_df[filtered_df['Job Description'].str.contains(keyword, case=False, na=False)]
+        filtered_df = filtered_df[filtered_df['Job Description'].str.contains(keyword, case=False, na=False, regex=False)]
+    
+    if unique_only:
+        from dedup import unique_postings
+        filtered_df = unique_postings(filtered_df)
     
     return filtered_df
 
+@instrument
 def get_unique_values(df: pd.DataFrame, column: str) -> List[str]:
     """
     Get unique values from a column for dropdown options
+    
+    Prepared datasets and categorical columns read the values from their
+    dictionary instead of rescanning the rows.
     """
+    if isinstance(df, PreparedJobData):
+        return ['All'] + df.unique_values(column)
+    if isinstance(df[column].dtype, pd.CategoricalDtype):
+        return ['All'] + DictionaryColumn(df[column]).observed_values()
     return ['All'] + sorted(df[column].dropna().unique().tolist())
 
-def calculate_salary_stats(df: pd.DataFrame) -> Dict[str, Any]:
+@instrument
+def calculate_salary_stats(df: pd.DataFrame, unique_only: bool = False) -> Dict[str, Any]:
     """
     Calculate salary statistics
+    
+    unique_only=True counts each duplicate cluster (see deduplicate_jobs) once.
     """
+    if unique_only:
+        from dedup import unique_postings
+        df = unique_postings(df)
     if df.empty:
         return {'mean': 0, 'median': 0, 'min': 0, 'max': 0, 'count': 0}
     
+    salary = aggregate_jobs(df, {'Salary': ['mean', 'median', 'min', 'max']})['Salary']
     return {
-        'mean': round(df['Salary'].mean(), 2),
-        'median': round(df['Salary'].median(), 2),
-        'min': round(df['Salary'].min(), 2),
-        'max': round(df['Salary'].max(), 2),
+        'mean': round(salary['mean'], 2),
+        'median': round(salary['median'], 2),
+        'min': round(salary['min'], 2),
+        'max': round(salary['max'], 2),
         'count': len(df)
     }
 
-def create_salary_chart(df: pd.DataFrame) -> plt.Figure:
+@instrument
+def create_salary_chart(df: pd.DataFrame) -> 'Figure':
     """
     Create salary distribution chart
     """
-    if df.empty:
-        fig, ax = plt.subplots(figsize=(10, 6))
-        ax.text(0.5, 0.5, 'No data to display', ha='center', va='center', transform=ax.transAxes)
-        return fig
-    
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
-    
-    # Salary by Job Title
-    salary_by_title = df.groupby('Job Title')['Salary'].mean().sort_values(ascending=True)
-    salary_by_title.plot(kind='barh', ax=ax1, color='skyblue')
-    ax1.set_title('Average Salary by Job Title')
-    ax1.set_xlabel('Salary ($)')
-    ax1.tick_params(axis='y', labelsize=8)
-    
-    # Salary Distribution
-    ax2.hist(df['Salary'], bins=10, color='lightgreen', alpha=0.7, edgecolor='black')
-    ax2.set_title('Salary Distribution')
-    ax2.set_xlabel('Salary ($)')
-    ax2.set_ylabel('Frequency')
-    
-    plt.tight_layout()
-    return fig
+    from charts import render_chart, salary_chart_data
+
+    return render_chart(salary_chart_data(df))
 
-def create_location_chart(df: pd.DataFrame) -> plt.Figure:
+@instrument
+def create_location_chart(df: pd.DataFrame) -> 'Figure':
     """
     Create location distribution chart
     """
-    if df.empty:
-        fig, ax = plt.subplots(figsize=(10, 6))
-        ax.text(0.5, 0.5, 'No data to display', ha='center', va='center', transform=ax.transAxes)
-        return fig
-    
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
-    
-    # Jobs by Location
-    location_counts = df['Location'].value_counts()
-    location_counts.plot(kind='pie', ax=ax1, autopct='%1.1f%%')
-    ax1.set_title('Job Distribution by Location')
-    ax1.set_ylabel('')
-    
-    # Average Salary by Location
-    salary_by_location = df.groupby('Location')['Salary'].mean().sort_values(ascending=True)
-    salary_by_location.plot(kind='barh', ax=ax2, color='orange')
-    ax2.set_title('Average Salary by Location')
-    ax2.set_xlabel('Salary ($)')
-    
-    plt.tight_layout()
-    return fig
+    from charts import render_chart, location_chart_data
 
-def create_experience_chart(df: pd.DataFrame) -> plt.Figure:
+    return render_chart(location_chart_data(df))
+
+@instrument
+def create_experience_chart(df: pd.DataFrame) -> 'Figure':
     """
     Create experience level chart
     """
-    if df.empty:
-        fig, ax = plt.subplots(figsize=(10, 6))
-        ax.text(0.5, 0.5, 'No data to display', ha='center', va='center', transform=ax.transAxes)
-        return fig
-    
-    fig, ax = plt.subplots(figsize=(12, 6))
-    
-    # Experience distribution
-    experience_counts = df['Experience'].value_counts()
-    experience_counts.plot(kind='bar', ax=ax, color='purple', alpha=0.7)
-    ax.set_title('Job Distribution by Experience Level')
-    ax.set_xlabel('Experience Level')
-    ax.set_ylabel('Number of Jobs')
-    ax.tick_params(axis='x', rotation=45)
-    
-    plt.tight_layout()
-    return fig
+    from charts import render_chart, experience_chart_data
+
+    return render_chart(experience_chart_data(df))
 
+@instrument
 def export_filtered_data(df: pd.DataFrame, filename: str = 'filtered_jobs.xlsx') -> str:
     """
     Export filtered data to Excel file
+    
+    Streams the rows through export_jobs, so large results split across sheets;
+    .csv, .csv.gz and .parquet file names export in those formats instead.
     """
+    from streaming_export import export_jobs
+
     try:
-        df.to_excel(filename, index=False)
+        export_jobs(df, filename)
         return f"Data exported successfully to {filename}"
     except Exception as e:
         return f"Export failed: {str(e)}"
 
-def get_job_summary(df: pd.DataFrame) -> Dict[str, Any]:
+@instrument
+def get_job_summary(df: pd.DataFrame, unique_only: bool = False) -> Dict[str, Any]:
     """
     Get comprehensive job market summary
+    
+    unique_only=True counts each duplicate cluster (see deduplicate_jobs) once.
     """
+    if unique_only:
+        from dedup import unique_postings
+        df = unique_postings(df)
     if df.empty:
         return {'total_jobs': 0, 'unique_companies': 0, 'unique_locations': 0, 'avg_salary': 0}
     
+    stats = aggregate_jobs(df, {
+        'Company': ['nunique', 'top3'],
+        'Location': ['nunique', 'top3'],
+        'Salary': ['mean', 'min', 'max']
+    })
     return {
-        'total_jobs': len(df),
-        'unique_companies': df['Company'].nunique(),
-        'unique_locations': df['Location'].nunique(),
-        'avg_salary': round(df['Salary'].mean(), 2),
-        'salary_range': f"${df['Salary'].min():,.0f} - ${df['Salary'].max():,.0f}",
-        'top_locations': df['Location'].value_counts().head(3).to_dict(),
-        'top_companies': df['Company'].value_counts().head(3).to_dict()
+        'total_jobs': stats['rows'],
+        'unique_companies': stats['Company']['nunique'],
+        'unique_locations': stats['Location']['nunique'],
+        'avg_salary': round(stats['Salary']['mean'], 2),
+        'salary_range': f"${stats['Salary']['min']:,.0f} - ${stats['Salary']['max']:,.0f}",
+        'top_locations': stats['Location']['top3'],
+        'top_companies': stats['Company']['top3']
     }
+
+@instrument
+def get_top_values(df: pd.DataFrame, column: str, n: int = 5) -> pd.Series:
+    """
+    Get the most frequent values of a column
+    
+    Ties keep first-appearance order and unused categories are skipped, so a
+    compacted frame gives the same result as the plain one.
+    """
+    top = aggregate_jobs(df, {column: [f'top{n}']})[column][f'top{n}']
+    return pd.Series(top, name='count', dtype=np.int64).rename_axis(column)
+
+def normalize_filter_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map equivalent filter_jobs arguments (as read from Excel cells) to one form
+    """
+    normalized = dict(params)
+    for name in ('job_title', 'location'):
+        value = normalized.get(name)
+        normalized[name] = None if not value or value == 'All' else value
+    for name in ('min_salary', 'max_salary', 'min_experience', 'max_experience'):
+        value = normalized.get(name)
+        if isinstance(value, str):
+            value = value.strip()
+            value = float(value.replace('$', '').replace(',', '')) if value else None
+        normalized[name] = None if value is None else float(value)
+    keyword = normalized.get('keyword')
+    normalized['keyword'] = keyword if keyword and keyword.strip() else None
+    return normalized
+
+# Memoized variants for dashboard cells: Excel recalculations with unchanged
+# inputs return the stored result, and every dashboard cell reuses the same
+# filtered frame. Results are shared, so treat them as read-only.
+cached_filter_jobs = instrument(memoize(filter_jobs, normalize=normalize_filter_params), name='cached_filter_jobs')
+cached_job_summary = instrument(memoize(get_job_summary), name='cached_job_summary')
+cached_salary_stats = instrument(memoize(calculate_salary_stats), name='cached_salary_stats')
+cached_top_values = instrument(memoize(get_top_values), name='cached_top_values')
+
+def result_cache_stats() -> Dict[str, Any]:
+    """
+    Hit/miss counters and size of the dashboard result cache
+    """
+    return DEFAULT_RESULT_CACHE.stats()
+
+def metrics_report(as_json: bool = False) -> str:
+    """
+    Per-function call counts, latency, row counts and peak memory as a text table or JSON
+    """
+    return REGISTRY.to_json() if as_json else REGISTRY.format_table()
@@ -0,0 +1,199 @@
+"""
+In-memory memoization of filter and aggregate results for the Job Market Explorer
+Excel recalculates dashboard cells even when no filter cell changed; memoized
+functions return the stored result for a dataset fingerprint plus normalized
+parameters instead of recomputing it
+"""
+
+import functools
+import hashlib
+import inspect
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 512 * 1024 ** 2
+
+# id(DataFrame) -> (weak reference, fingerprint); entries drop when the frame is freed
+_fingerprints: Dict[int, Tuple[weakref.ref, str]] = {}
+
+def _hash_frame(df: pd.DataFrame) -> str:
+    digest = hashlib.sha1()
+    digest.update(repr((df.shape, list(df.columns), [str(dtype) for dtype in df.dtypes])).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+def dataset_fingerprint(data: Any) -> str:
+    """
+    Content fingerprint of a DataFrame, Series or prepared dataset
+
+    The hash is computed once per object and remembered for as long as the
+    object is alive, so results for a frame should be treated as read-only:
+    modifying a frame in place after it was fingerprinted is not detected.
+    """
+    if hasattr(data, 'df') and isinstance(data.df, pd.DataFrame):
+        return 'prepared:' + dataset_fingerprint(data.df)
+    if isinstance(data, pd.Series):
+        data = data.to_frame()
+    if not isinstance(data, pd.DataFrame):
+        raise TypeError(f"Cannot fingerprint {type(data).__name__}")
+
+    key = id(data)
+    cached = _fingerprints.get(key)
+    if cached is not None and cached[0]() is data:
+        return cached[1]
+
+    fingerprint = _hash_frame(data)
+    _fingerprints[key] = (weakref.ref(data, lambda _, key=key: _fingerprints.pop(key, None)), fingerprint)
+    return fingerprint
+
+def estimate_bytes(value: Any) -> int:
+    """
+    Approximate memory held by a cached result
+
+    Frames are measured deeply, once when the entry is stored: text columns
+    hold most of a job frame, and Arrow-backed ones report their buffer sizes.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(index=True, deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_bytes(k) + estimate_bytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_bytes(item) for item in value)
+    return sys.getsizeof(value)
+
+class ResultCache:
+    """
+    LRU cache bounded by entry count and approximate bytes, with hit/miss counters
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[Hashable, Tuple[Any, int]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+            return default
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = estimate_bytes(value)
+        with self._lock:
+            if key in self._entries:
+                self.bytes -= self._entries.pop(key)[1]
+            # Results larger than the whole budget are not worth keeping
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Usage counters for the cache
+        """
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+DEFAULT_RESULT_CACHE = ResultCache()
+
+def _freeze(value: Any) -> Hashable:
+    """
+    Turn an argument into a hashable cache-key component
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)) or hasattr(value, 'df'):
+        return ('dataset', dataset_fingerprint(value))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (np.integer, np.floating)):
+        return value.item()
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+def memoize(func: Callable = None, cache: ResultCache = None,
+            normalize: Callable[[Dict[str, Any]], Dict[str, Any]] = None) -> Callable:
+    """
+    Memoize a function whose first argument is a dataset
+
+    Cached results are shared between callers and must not be modified.
+    normalize receives the bound arguments (without the dataset) and may map
+    equivalent parameter values to one form, so e.g. 'All' and None share a
+    cache entry. Use as @memoize or memoize(func, cache=..., normalize=...).
+    """
+    if func is None:
+        return lambda f: memoize(f, cache=cache, normalize=normalize)
+
+    signature = inspect.signature(func)
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        target = wrapper.cache
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        params = dict(bound.arguments)
+        data_name = next(iter(params))
+        data = params.pop(data_name)
+        if normalize is not None:
+            params = normalize(params)
+        try:
+            key = (name, _freeze(data), _freeze(params))
+        except TypeError:
+            return func(data, **params)
+
+        sentinel = wrapper
+        result = target.get(key, sentinel)
+        if result is sentinel:
+            # Call with the normalized parameters so equivalent inputs give equal results
+            result = func(data, **params)
+            target.put(key, result)
+        return result
+
+    wrapper.cache = cache if cache is not None else DEFAULT_RESULT_CACHE
+    return wrapper
@@ -0,0 +1,182 @@
+"""
+Batch what-if scenarios for the Job Market Explorer
+Evaluates many filter_jobs parameter sets in one pass: each row is assigned
+once to a group by which title/location/keyword patterns it matches and which
+salary/experience bins it falls in, the groups are aggregated once, and each
+scenario is then answered from the small group table instead of the rows
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Tuple, Union
+from prepared_data import DictionaryColumn, PreparedJobData
+from python_functions import normalize_filter_params
+
+FILTER_PARAMS = ['job_title', 'location', 'min_salary', 'max_salary',
+                 'min_experience', 'max_experience', 'keyword']
+STAT_COLUMNS = ['count', 'mean', 'median', 'min', 'max']
+
+def _signatures(matches: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Collapse a boolean (items x patterns) matrix to a signature id per item
+
+    Returns the id of each item and the distinct match rows, indexed by id.
+    """
+    if matches.shape[1] == 0:
+        return np.zeros(matches.shape[0], dtype=np.int64), np.zeros((1, 0), dtype=bool)
+    distinct, ids = np.unique(np.packbits(matches, axis=1), axis=0, return_inverse=True)
+    table = np.unpackbits(distinct, axis=1, count=matches.shape[1]).astype(bool)
+    return ids.reshape(-1).astype(np.int64), table
+
+def _pattern_dimension(column: DictionaryColumn, patterns: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-row signature of which patterns the row's value contains
+
+    Patterns are tested once per distinct value, never per row.
+    """
+    matches = np.column_stack([column.dictionary_matches(pattern) for pattern in patterns])
+    value_ids, table = _signatures(matches)
+    return value_ids[column.codes], table
+
+def _range_dimension(values: np.ndarray, bounds: List[float]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-row bin key against the sorted distinct bounds of every scenario
+
+    For edges e, key 2i+1 means value == e[i] and 2i means e[i-1] < value < e[i];
+    missing values get -1. Then value >= e[j] <=> key >= 2j+1 and
+    value <= e[j] <=> 0 <= key <= 2j+1.
+    """
+    edges = np.unique(np.asarray(bounds, dtype=float))
+    missing = np.isnan(values)
+    positions = np.searchsorted(edges, values, side='left')
+    clipped = np.minimum(positions, max(len(edges) - 1, 0))
+    equal = (positions < len(edges)) & (edges[clipped] == values) if len(edges) else np.zeros(len(values), bool)
+    keys = 2 * positions + equal.astype(np.int64)
+    keys[missing] = -1
+    return keys.astype(np.int64), edges
+
+def _normalize_scenarios(scenarios: Union[pd.DataFrame, List[Dict[str, Any]]]) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    table = scenarios if isinstance(scenarios, pd.DataFrame) else pd.DataFrame(list(scenarios))
+    table = table.reset_index(drop=True)
+    specs = []
+    for record in table.to_dict('records'):
+        params = {name: record.get(name) for name in FILTER_PARAMS}
+        params = {name: None if isinstance(value, float) and np.isnan(value) else value
+                  for name, value in params.items()}
+        specs.append(normalize_filter_params(params))
+    return table, specs
+
+def evaluate_scenarios(data: Union[pd.DataFrame, PreparedJobData],
+                       scenarios: Union[pd.DataFrame, List[Dict[str, Any]]],
+                       include_median: bool = False) -> pd.DataFrame:
+    """
+    Count and salary statistics for many filter_jobs parameter sets at once
+
+    scenarios is a table (or list of dicts) with any of the filter_jobs
+    argument names as columns; other columns are passed through. Each result
+    row holds the same count/mean/min/max as
+    calculate_salary_stats(filter_jobs(data, **scenario)). Medians cannot be
+    combined from groups, so include_median=True adds one row scan per scenario.
+    """
+    prepared = data if isinstance(data, PreparedJobData) else None
+    df = data.df if prepared is not None else data
+    table, specs = _normalize_scenarios(scenarios)
+
+    def dictionary(column: str) -> DictionaryColumn:
+        if prepared is not None and column in prepared.dictionaries:
+            return prepared.dictionaries[column]
+        return DictionaryColumn(df[column])
+
+    def distinct(name: str) -> List[Any]:
+        return sorted({spec[name] for spec in specs if spec[name] is not None}, key=str)
+
+    n_rows = len(df)
+    titles, locations, keywords = distinct('job_title'), distinct('location'), distinct('keyword')
+
+    # Row -> group key, one dimension at a time
+    title_ids, title_table = _pattern_dimension(dictionary('Job Title'), titles) if titles else \
+        (np.zeros(n_rows, dtype=np.int64), np.zeros((1, 0), dtype=bool))
+    location_ids, location_table = _pattern_dimension(dictionary('Location'), locations) if locations else \
+        (np.zeros(n_rows, dtype=np.int64), np.zeros((1, 0), dtype=bool))
+
+    if keywords:
+        keyword_masks = []
+        for keyword in keywords:
+            if prepared is not None:
+                mask = np.zeros(n_rows, dtype=bool)
+                mask[prepared.search_index.contains(keyword)] = True
+            else:
+                mask = df['Job Description'].str.contains(keyword, case=False, na=False, regex=False).to_numpy(dtype=bool)
+            keyword_masks.append(mask)
+        keyword_ids, keyword_table = _signatures(np.column_stack(keyword_masks))
+    else:
+        keyword_ids, keyword_table = np.zeros(n_rows, dtype=np.int64), np.zeros((1, 0), dtype=bool)
+
+    salary = df['Salary'].to_numpy(dtype=float, na_value=np.nan)
+    experience = df['Experience_Years'].to_numpy(dtype=float, na_value=np.nan) if 'Experience_Years' in df.columns \
+        else np.full(n_rows, np.nan)
+    salary_keys, salary_edges = _range_dimension(
+        salary, [spec[name] for spec in specs for name in ('min_salary', 'max_salary') if spec[name] is not None])
+    experience_keys, experience_edges = _range_dimension(
+        experience, [spec[name] for spec in specs for name in ('min_experience', 'max_experience') if spec[name] is not None])
+
+    # Combine the dimensions into one group id, re-densifying after each step
+    # so the mixed-radix key never overflows
+    group_of_row = np.zeros(n_rows, dtype=np.int64)
+    for values in [title_ids, location_ids, keyword_ids, salary_keys + 1, experience_keys + 1]:
+        group_of_row = pd.factorize(group_of_row * (int(values.max(initial=0)) + 1) + values)[0]
+    n_groups = int(group_of_row.max(initial=-1)) + 1
+    # factorize numbers groups by first appearance, so a group starts where the id exceeds all earlier ids
+    seen = np.maximum.accumulate(np.concatenate([[-1], group_of_row[:-1]]))
+    first_row = np.flatnonzero(group_of_row > seen)
+
+    # Aggregate each group once
+    grouped = pd.Series(salary).groupby(group_of_row, sort=True).agg(['size', 'count', 'sum', 'min', 'max'])
+    group_rows = grouped['size'].to_numpy()
+    group_salaries = grouped['count'].to_numpy()
+    group_sum = grouped['sum'].to_numpy()
+    group_min = grouped['min'].to_numpy()
+    group_max = grouped['max'].to_numpy()
+    group_title = title_ids[first_row]
+    group_location = location_ids[first_row]
+    group_keyword = keyword_ids[first_row]
+    group_salary = salary_keys[first_row]
+    group_experience = experience_keys[first_row]
+
+    results = []
+    for spec in specs:
+        mask = np.ones(n_groups, dtype=bool)
+        if spec['job_title'] is not None:
+            mask &= title_table[group_title, titles.index(spec['job_title'])]
+        if spec['location'] is not None:
+            mask &= location_table[group_location, locations.index(spec['location'])]
+        if spec['keyword'] is not None:
+            mask &= keyword_table[group_keyword, keywords.index(spec['keyword'])]
+        for keys, edges, low, high in [
+            (group_salary, salary_edges, spec['min_salary'], spec['max_salary']),
+            (group_experience, experience_edges, spec['min_experience'], spec['max_experience'])
+        ]:
+            if low is not None:
+                mask &= keys >= 2 * int(np.searchsorted(edges, low)) + 1
+            if high is not None:
+                mask &= (keys >= 0) & (keys <= 2 * int(np.searchsorted(edges, high)) + 1)
+
+        count = int(group_rows[mask].sum())
+        if count == 0:
+            results.append({'count': 0, 'mean': 0, 'median': 0, 'min': 0, 'max': 0})
+            continue
+        salaries = int(group_salaries[mask].sum())
+        stats = {
+            'count': count,
+            'mean': round(group_sum[mask].sum() / salaries, 2) if salaries else np.nan,
+            'min': np.nanmin(group_min[mask]) if salaries else np.nan,
+            'max': np.nanmax(group_max[mask]) if salaries else np.nan
+        }
+        if include_median:
+            row_mask = mask[group_of_row] & ~np.isnan(salary)
+            stats['median'] = round(float(np.median(salary[row_mask])), 2) if salaries else np.nan
+        results.append(stats)
+
+    columns = [column for column in STAT_COLUMNS if include_median or column != 'median']
+    stats_table = pd.DataFrame(results).reindex(columns=columns)
+    return pd.concat([table, stats_table], axis=1)
@@ -0,0 +1,335 @@
+"""
+Inverted index over job descriptions for the Job Market Explorer
+Descriptions are tokenized once into a compressed postings layout (CSR) so
+keyword, multi-term and phrase queries only touch the postings they match
+"""
+
+import functools
+import re
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple
+from result_cache import dataset_fingerprint
+
+# Tokens are maximal runs of letters and digits, lowercased. pyarrow's
+# \p{L}\p{N} classes are used when available, for queries and indexing alike,
+# so both always split Unicode text the same way
+TOKEN_PATTERN = r'[^\W_]+'
+ARROW_SEPARATOR_PATTERN = r'[^\p{L}\p{N}]+'
+_TOKEN_RE = re.compile(TOKEN_PATTERN)
+
+# BM25 ranking parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+def _arrow_compute():
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        return None, None
+    return pa, pc
+
+@functools.lru_cache(maxsize=4096)
+def _tokenize_one(text: str) -> Tuple[str, ...]:
+    # The Arrow kernel compiles its pattern per call, so repeated queries are memoized
+    codes, _, vocab = _tokenize_all(np.asarray([text], dtype=object))
+    return tuple(vocab[codes])
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase search tokens
+    """
+    return list(_tokenize_one(str(text)))
+
+def text_fingerprint(texts: pd.Series) -> str:
+    """
+    Content hash of the indexed texts, stored with saved indexes
+    """
+    return dataset_fingerprint(texts.rename(None).reset_index(drop=True))
+
+def parse_query(query: str) -> Tuple[List[str], List[List[str]]]:
+    """
+    Split a query into loose terms and quoted phrases
+    """
+    phrases = [tokenize(phrase) for phrase in re.findall(r'"([^"]*)"', query)]
+    terms = tokenize(re.sub(r'"[^"]*"', ' ', query))
+    return terms, [phrase for phrase in phrases if phrase]
+
+def _tokenize_all(texts: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Tokenize many texts at once into (token codes, tokens per text, vocabulary)
+
+    Uses pyarrow's vectorized string kernels when available.
+    """
+    pa, pc = _arrow_compute()
+    if pa is not None:
+        array = pc.utf8_lower(pa.array(texts, type=pa.large_string()))
+        tokens = pc.utf8_split_whitespace(pc.replace_substring_regex(array, ARROW_SEPARATOR_PATTERN, ' '))
+        # Splitting leaves empty strings where a text starts or ends with a separator
+        flat = tokens.flatten()
+        keep = pc.not_equal(flat, '')
+        parents = pc.filter(pc.list_parent_indices(tokens), keep).to_numpy(zero_copy_only=False)
+        counts = np.bincount(parents, minlength=len(texts))
+        encoded = pc.dictionary_encode(pc.filter(flat, keep))
+        codes = encoded.indices.to_numpy(zero_copy_only=False)
+        vocab = np.asarray(encoded.dictionary.to_pylist(), dtype=object)
+    else:
+        tokens = [_TOKEN_RE.findall(str(text).lower()) for text in texts]
+        counts = np.fromiter((len(doc_tokens) for doc_tokens in tokens), dtype=np.int64, count=len(tokens))
+        codes, vocab = pd.factorize(pd.Series([token for doc_tokens in tokens for token in doc_tokens], dtype=object))
+        vocab = np.asarray(vocab, dtype=object)
+    return np.asarray(codes, dtype=np.int64), np.asarray(counts, dtype=np.int64), vocab
+
+class InvertedIndex:
+    """
+    Term -> sorted row positions, with term frequencies and document lengths
+
+    Postings for term i are doc_ids[offsets[i]:offsets[i + 1]]. Row positions
+    refer to the DataFrame the index was built from.
+    """
+
+    def __init__(self, vocab: np.ndarray, offsets: np.ndarray, doc_ids: np.ndarray,
+                 term_freqs: np.ndarray, doc_lengths: np.ndarray, texts: pd.Series = None):
+        self.vocab = vocab
+        self.offsets = offsets
+        self.doc_ids = doc_ids
+        self.term_freqs = term_freqs
+        self.doc_lengths = doc_lengths
+        self.texts = texts
+        self.term_ids = {term: i for i, term in enumerate(vocab)}
+        self._vocab_series = None
+        self._substring_cache = {}
+        self._ascii_docs = None
+
+    @property
+    def n_docs(self) -> int:
+        return len(self.doc_lengths)
+
+    @classmethod
+    def build(cls, texts: pd.Series) -> 'InvertedIndex':
+        """
+        Tokenize every distinct text once and lay out the postings by term
+        """
+        n_docs = len(texts)
+        # Reposted jobs share descriptions, so tokenize each distinct text once
+        text_codes, unique_texts = pd.factorize(texts.fillna('').astype(str))
+        token_codes, token_counts, vocab = _tokenize_all(np.asarray(unique_texts, dtype=object))
+
+        # Distinct (text, term) pairs with their term frequencies
+        n_unique = max(len(unique_texts), 1)
+        text_of_token = np.repeat(np.arange(len(unique_texts), dtype=np.int64), token_counts)
+        pair_keys, pair_freqs = np.unique(text_of_token * max(len(vocab), 1) + token_codes, return_counts=True)
+        pair_texts = pair_keys // max(len(vocab), 1)
+        pair_terms = pair_keys % max(len(vocab), 1)
+        pair_starts = np.searchsorted(pair_texts, np.arange(n_unique))
+        pair_lengths = np.bincount(pair_texts, minlength=n_unique)
+
+        # Expand to one posting per (doc, term), docs ascending, then group by term
+        text_codes = np.asarray(text_codes, dtype=np.int64)
+        per_doc = pair_lengths[text_codes]
+        docs = np.repeat(np.arange(n_docs, dtype=np.int64), per_doc)
+        segment_starts = np.repeat(np.cumsum(per_doc) - per_doc, per_doc)
+        pairs = np.repeat(pair_starts[text_codes], per_doc) + np.arange(len(docs)) - segment_starts
+        terms = pair_terms[pairs]
+        order = np.argsort(terms, kind='stable')
+        offsets = np.searchsorted(terms[order], np.arange(len(vocab) + 1))
+
+        return cls(vocab, offsets.astype(np.int64), docs[order], pair_freqs[pairs][order].astype(np.int32),
+                   np.asarray(token_counts, dtype=np.int32)[text_codes], texts)
+
+    def postings(self, term: str) -> np.ndarray:
+        """
+        Sorted row positions containing the exact token
+        """
+        i = self.term_ids.get(term)
+        if i is None:
+            return np.empty(0, dtype=np.int64)
+        return self.doc_ids[self.offsets[i]:self.offsets[i + 1]]
+
+    def _term_slices(self, terms: List[str]) -> List[Tuple[np.ndarray, np.ndarray, int]]:
+        slices = []
+        for term in terms:
+            i = self.term_ids.get(term)
+            if i is None:
+                slices.append((np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int32), 0))
+            else:
+                start, stop = self.offsets[i], self.offsets[i + 1]
+                slices.append((self.doc_ids[start:stop], self.term_freqs[start:stop], stop - start))
+        return slices
+
+    def _intersect(self, arrays: List[np.ndarray]) -> np.ndarray:
+        if not arrays:
+            return np.empty(0, dtype=np.int64)
+        arrays = sorted(arrays, key=len)
+        result = arrays[0]
+        for other in arrays[1:]:
+            if not len(result):
+                break
+            result = result[np.isin(result, other, assume_unique=True)]
+        return result
+
+    def _union(self, arrays: List[np.ndarray]) -> np.ndarray:
+        arrays = [array for array in arrays if len(array)]
+        if not arrays:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(arrays))
+
+    def _verify(self, rows: np.ndarray, pattern: str, regex: bool) -> np.ndarray:
+        if self.texts is None:
+            raise ValueError("This index has no texts attached; pass texts when loading it")
+        if not len(rows):
+            return rows
+        matches = self.texts.iloc[rows].str.contains(pattern, case=False, na=False, regex=regex)
+        return rows[matches.to_numpy(dtype=bool)]
+
+    def phrase(self, tokens: List[str]) -> np.ndarray:
+        """
+        Rows containing the tokens consecutively, in order
+        """
+        rows = self._intersect([self.postings(token) for token in tokens])
+        if len(tokens) < 2:
+            return rows
+        pattern = r'(?<![^\W_])' + r'[\W_]+'.join(re.escape(token) for token in tokens) + r'(?![^\W_])'
+        return self._verify(rows, pattern, regex=True)
+
+    def _clause_rows(self, query: str) -> Tuple[List[str], List[np.ndarray]]:
+        terms, phrases = parse_query(query)
+        clauses = [self.postings(term) for term in terms]
+        clauses += [self.phrase(phrase) for phrase in phrases]
+        return terms + [token for phrase in phrases for token in phrase], clauses
+
+    def search(self, query: str, mode: str = 'and', ranked: bool = False) -> np.ndarray:
+        """
+        Row positions matching a query of terms and "quoted phrases"
+
+        mode='and' requires every term and phrase, mode='or' any of them.
+        With ranked=True rows are ordered by BM25 relevance instead of position.
+        """
+        if mode not in ('and', 'or'):
+            raise ValueError("mode must be 'and' or 'or'")
+        scoring_terms, clauses = self._clause_rows(query)
+        rows = self._intersect(clauses) if mode == 'and' else self._union(clauses)
+        if not ranked:
+            return rows
+        scores = self._bm25(scoring_terms, rows)
+        return rows[np.argsort(-scores, kind='stable')]
+
+    def score(self, query: str, mode: str = 'and') -> pd.Series:
+        """
+        BM25 relevance of each matching row position, highest first
+        """
+        rows = self.search(query, mode=mode)
+        scoring_terms, _ = self._clause_rows(query)
+        scores = pd.Series(self._bm25(scoring_terms, rows), index=rows, name='score')
+        return scores.sort_values(ascending=False, kind='stable')
+
+    def _bm25(self, terms: List[str], rows: np.ndarray) -> np.ndarray:
+        scores = np.zeros(len(rows))
+        if not len(rows) or not self.n_docs:
+            return scores
+        avg_length = max(self.doc_lengths.mean(), 1e-9)
+        for docs, freqs, doc_freq in self._term_slices(sorted(set(terms))):
+            if not doc_freq:
+                continue
+            positions = np.searchsorted(docs, rows)
+            present = positions < len(docs)
+            present[present] = docs[positions[present]] == rows[present]
+            tf = np.zeros(len(rows))
+            tf[present] = freqs[positions[present]]
+            idf = np.log(1 + (self.n_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[rows] / avg_length)
+            scores += idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return scores
+
+    def _substring_postings(self, fragment: str) -> np.ndarray:
+        """
+        Rows holding any token that contains fragment, found by scanning the vocabulary
+        """
+        if fragment not in self._substring_cache:
+            if self._vocab_series is None:
+                self._vocab_series = pd.Series(self.vocab, dtype=object)
+            term_ids = np.flatnonzero(self._vocab_series.str.contains(fragment, regex=False).to_numpy(dtype=bool))
+            self._substring_cache[fragment] = self._union(
+                [self.doc_ids[self.offsets[i]:self.offsets[i + 1]] for i in term_ids]
+            )
+        return self._substring_cache[fragment]
+
+    def _ascii_rows(self) -> np.ndarray:
+        """
+        Whether each text is pure ASCII, computed once from the attached texts
+        """
+        if self._ascii_docs is None:
+            if self.texts is None:
+                raise ValueError("This index has no texts attached; pass texts when loading it")
+            pa, pc = _arrow_compute()
+            if pa is not None:
+                texts = pa.array(self.texts.fillna('').astype(str).to_numpy(dtype=object), type=pa.large_string())
+                self._ascii_docs = pc.string_is_ascii(texts).to_numpy(zero_copy_only=False)
+            else:
+                self._ascii_docs = np.fromiter((str(text).isascii() for text in self.texts.fillna('')),
+                                               dtype=bool, count=self.n_docs)
+        return self._ascii_docs
+
+    def contains(self, keyword: str) -> np.ndarray:
+        """
+        Rows whose text contains keyword as a literal, case-insensitive substring
+
+        Every letter/digit run of keyword must lie inside some token of a
+        matching text, so the candidates come from the postings of vocabulary
+        tokens containing those runs; only the candidates are checked literally.
+        """
+        fragments = tokenize(keyword)
+        if not fragments:
+            rows = np.arange(self.n_docs)
+        else:
+            rows = self._intersect([self._substring_postings(fragment) for fragment in set(fragments)])
+            if len(fragments) == 1 and fragments[0] == keyword.lower() and keyword.isascii():
+                # For ASCII texts token containment is exactly a case-insensitive
+                # substring match; Unicode case mapping (e.g. 'İ' lowering to
+                # 'i' plus a combining dot) can differ, so those rows are checked
+                ascii_rows = self._ascii_rows()[rows]
+                checked = self._verify(rows[~ascii_rows], keyword, regex=False)
+                return np.sort(np.concatenate([rows[ascii_rows], checked]))
+        return self._verify(rows, keyword, regex=False)
+
+    def save(self, path: str, fingerprint: str = '') -> None:
+        """
+        Write the index to an .npz file, with the text_fingerprint it was built from
+        """
+        vocab_blob = np.frombuffer('\n'.join(self.vocab).encode('utf-8'), dtype=np.uint8)
+        with open(path, 'wb') as f:
+            np.savez(f, vocab=vocab_blob, n_terms=np.array([len(self.vocab)]),
+                     offsets=self.offsets, doc_ids=self.doc_ids,
+                     term_freqs=self.term_freqs, doc_lengths=self.doc_lengths,
+                     fingerprint=np.array([fingerprint]))
+
+    @classmethod
+    def load(cls, path: str, texts: pd.Series = None, fingerprint: str = None) -> 'InvertedIndex':
+        """
+        Read an index written by save, attaching the texts used for phrase checks
+
+        With a fingerprint, an index saved for different texts raises ValueError.
+        """
+        with np.load(path) as data:
+            if fingerprint is not None:
+                saved = str(data['fingerprint'][0]) if 'fingerprint' in data.files else ''
+                if saved != fingerprint:
+                    raise ValueError(f"Search index {path} was built from different texts")
+            n_terms = int(data['n_terms'][0])
+            vocab_text = data['vocab'].tobytes().decode('utf-8')
+            vocab = np.asarray(vocab_text.split('\n') if n_terms else [], dtype=object)
+            return cls(vocab, data['offsets'], data['doc_ids'], data['term_freqs'],
+                       data['doc_lengths'], texts)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Size of the index
+        """
+        return {'documents': self.n_docs, 'terms': len(self.vocab), 'postings': len(self.doc_ids)}
+
+def build_search_index(df: pd.DataFrame, column: str = 'Job Description') -> InvertedIndex:
+    """
+    Build an inverted index over a text column
+    """
+    return InvertedIndex.build(df[column])
@@ -0,0 +1,160 @@
+"""
+Shared read-only job datasets for multi-process workers
+A cleaned DataFrame is published once as an uncompressed Arrow IPC file, in
+/dev/shm when available. Worker processes attach by path: the file is
+memory-mapped and numeric columns become NumPy views of the mapped pages, text
+columns Arrow-backed strings over the same pages, so every worker shares one
+copy of the data in the page cache instead of holding its own
+"""
+
+import json
+import os
+import pandas as pd
+import pyarrow as pa
+from typing import Any, Dict, Union
+from compaction import _arrow_string_dtype
+from job_cache import CACHE_DIR_ENV_VAR, DEFAULT_CACHE_DIR, _short_hash
+from result_cache import dataset_fingerprint
+
+# Point shared datasets somewhere else than /dev/shm or the cache directory
+SHARED_DIR_ENV_VAR = 'JOB_EXPLORER_SHARED_DIR'
+SHARED_SUFFIX = '.arrow'
+SHM_DIR = '/dev/shm'
+# Schema metadata key describing the published frame's index
+INDEX_METADATA_KEY = b'job_explorer_index'
+
+# path -> (mtime_ns, frame) for datasets already attached in this process
+_attached: Dict[str, tuple] = {}
+
+def shared_dir() -> str:
+    """
+    Directory for published datasets: the environment override, a subdirectory
+    of /dev/shm when it is writable, or the job data cache directory
+    """
+    override = os.environ.get(SHARED_DIR_ENV_VAR)
+    if override:
+        return override
+    if os.path.isdir(SHM_DIR) and os.access(SHM_DIR, os.W_OK):
+        return os.path.join(SHM_DIR, 'job_market_explorer')
+    return os.path.join(os.environ.get(CACHE_DIR_ENV_VAR) or DEFAULT_CACHE_DIR, 'shared')
+
+def _to_arrow(values: pd.Series) -> pa.Array:
+    """
+    Arrow array for a column, laid out so attaching it needs no conversion
+    """
+    dtype = values.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        codes = values.cat.codes.to_numpy()
+        categories = pa.array(dtype.categories.astype(object), from_pandas=True)
+        return pa.DictionaryArray.from_arrays(pa.array(codes, mask=codes < 0), categories)
+    if dtype.kind in 'fiub':
+        # Missing floats stay NaN values rather than Arrow nulls, which would
+        # force a copy back to NaN on every attach
+        return pa.array(values.to_numpy(), from_pandas=False)
+    return pa.array(values.to_numpy(dtype=object, na_value=None), from_pandas=True)
+
+def _string_dtype(arrow_type: pa.DataType):
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return _arrow_string_dtype()
+    return None
+
+def _index_columns(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Index description for the file metadata, plus any index levels stored as columns
+
+    A RangeIndex is stored as its start/stop/step; other indexes as extra
+    columns named __index_level_<i>__.
+    """
+    index = df.index
+    if isinstance(index, pd.RangeIndex):
+        meta = {'range': [index.start, index.stop, index.step], 'names': [index.name]}
+        return {'meta': meta, 'columns': {}}
+    columns = {f"__index_level_{i}__": index.get_level_values(i).to_series(index=None)
+               for i in range(index.nlevels)}
+    return {'meta': {'columns': list(columns), 'names': list(index.names)}, 'columns': columns}
+
+def _restore_index(df: pd.DataFrame, meta: Dict[str, Any]) -> pd.DataFrame:
+    if 'range' in meta:
+        df.index = pd.RangeIndex(*meta['range'], name=meta['names'][0])
+    elif meta.get('columns'):
+        df = df.set_index(meta['columns'])
+        df.index.names = meta['names']
+    return df
+
+def publish_job_data(data: Union[pd.DataFrame, str], path: str = None) -> str:
+    """
+    Write a cleaned job DataFrame as a shared Arrow file and return its path
+
+    data may also be a source file, loaded with load_job_data. The index is
+    kept, so filtered or reindexed frames attach with the same row labels. The default
+    path is named after the dataset fingerprint, so publishing the same data
+    again reuses the existing file. Pass the returned path to worker
+    processes and call attach_job_data there.
+    """
+    if isinstance(data, str):
+        from python_functions import load_job_data
+        data = load_job_data(data)
+        if 'Error' in data.columns:
+            raise ValueError(f"Could not load job data: {data['Error'].iloc[0]}")
+    index = _index_columns(data)
+    if path is None:
+        # The fingerprint covers index values but not index names
+        key = _short_hash([dataset_fingerprint(data), index['meta']])
+        path = os.path.join(shared_dir(), f"{key}{SHARED_SUFFIX}")
+        if os.path.exists(path):
+            return path
+
+    arrays = {str(column): _to_arrow(data[column]) for column in data.columns}
+    arrays.update({name: _to_arrow(values) for name, values in index['columns'].items()})
+    table = pa.table(arrays).replace_schema_metadata({INDEX_METADATA_KEY: json.dumps(index['meta'], default=str)})
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        # One record batch keeps every column a single contiguous buffer
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table, max_chunksize=max(len(table), 1))
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+def attach_job_data(path: str) -> pd.DataFrame:
+    """
+    Memory-map a published dataset as a read-only DataFrame
+
+    Numeric columns are zero-copy views of the mapped file and cannot be
+    written to; the python_functions API filters and aggregates them as
+    usual. Repeated attaches of an unchanged file in one process return the
+    same frame.
+    """
+    mtime = os.stat(path).st_mtime_ns
+    cached = _attached.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    source = pa.memory_map(path, 'r')
+    table = pa.ipc.open_file(source).read_all()
+    df = table.to_pandas(split_blocks=True, types_mapper=_string_dtype)
+    metadata = table.schema.metadata or {}
+    if INDEX_METADATA_KEY in metadata:
+        df = _restore_index(df, json.loads(metadata[INDEX_METADATA_KEY]))
+    _attached[path] = (mtime, df)
+    return df
+
+def detach_job_data(path: str) -> None:
+    """
+    Forget a dataset attached in this process
+    """
+    _attached.pop(path, None)
+
+def unpublish_job_data(path: str) -> None:
+    """
+    Remove a published dataset; processes that attached it keep their mapping
+    """
+    detach_job_data(path)
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,172 @@
+"""
+Deterministic synthetic job postings for the Job Market Explorer
+Generates raw rows in the same shape as sample_data/jobs_sample.csv (text
+experience ranges, $-formatted salaries) at any size from a seed. Rows are
+built in fixed-size blocks, each seeded from (seed, block number), so the first
+N rows are identical whatever the total size, and every text column is a
+lookup into a small table of precomputed strings
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterator, List, Tuple
+
+BLOCK_ROWS = 100_000
+
+# Title -> (relative frequency, median salary)
+DEFAULT_TITLES = {
+    'Software Engineer': (0.16, 120000), 'Data Scientist': (0.07, 130000),
+    'Product Manager': (0.06, 115000), 'UX Designer': (0.04, 95000),
+    'DevOps Engineer': (0.06, 125000), 'Marketing Manager': (0.05, 85000),
+    'Data Analyst': (0.08, 75000), 'Frontend Developer': (0.08, 100000),
+    'Backend Developer': (0.08, 115000), 'Sales Representative': (0.07, 70000),
+    'Business Analyst': (0.05, 90000), 'Cybersecurity Specialist': (0.04, 135000),
+    'Mobile Developer': (0.04, 110000), 'QA Engineer': (0.05, 85000),
+    'Project Manager': (0.05, 105000), 'Machine Learning Engineer': (0.03, 145000)
+}
+
+# Location -> (relative frequency, salary multiplier)
+DEFAULT_LOCATIONS = {
+    'San Francisco': (0.10, 1.25), 'New York': (0.12, 1.20), 'Seattle': (0.07, 1.15),
+    'Boston': (0.06, 1.10), 'Los Angeles': (0.07, 1.08), 'Washington DC': (0.05, 1.08),
+    'Austin': (0.06, 1.00), 'Denver': (0.05, 0.98), 'Chicago': (0.07, 1.00),
+    'San Diego': (0.04, 1.02), 'Atlanta': (0.05, 0.95), 'Portland': (0.04, 0.97),
+    'Miami': (0.04, 0.95), 'Phoenix': (0.04, 0.92), 'Dallas': (0.05, 0.96),
+    'Remote': (0.09, 1.00)
+}
+
+# Experience string -> relative frequency; salaries rise with the first number
+DEFAULT_EXPERIENCE = {
+    '0-1 years': 0.06, '1-2 years': 0.12, '1-3 years': 0.10, '2-3 years': 0.11,
+    '2-4 years': 0.15, '3-4 years': 0.08, '3-5 years': 0.14, '4-6 years': 0.09,
+    '5-7 years': 0.08, '7+ years': 0.05, '10+ years': 0.02
+}
+
+COMPANY_PREFIXES = ['Tech', 'Data', 'Cloud', 'Net', 'Bright', 'Blue', 'Green', 'Quantum', 'Apex',
+                    'Nova', 'Pixel', 'Cyber', 'Health', 'Fin', 'Retail', 'Secure', 'Smart', 'Global',
+                    'Urban', 'Prime']
+COMPANY_SUFFIXES = ['Corp', 'Inc', 'Labs', 'Works', 'Systems', 'Solutions', 'Studio', 'Group',
+                    'Analytics', 'Dynamics', 'Soft', 'Logic']
+
+DESCRIPTION_TEMPLATES = [
+    'Develop {0} applications using {1} and {2}',
+    'Build and maintain {0} services with {1} and {2}',
+    'Analyze {0} data and report insights using {1} and {2}',
+    'Design {0} solutions and collaborate with teams on {1} and {2}',
+    'Lead {0} projects and mentor engineers in {1} and {2}',
+    'Improve {0} reliability with {1} and {2} automation'
+]
+DESCRIPTION_AREAS = ['web', 'mobile', 'cloud', 'customer', 'financial', 'healthcare', 'marketing',
+                     'security', 'machine learning', 'e-commerce']
+DESCRIPTION_SKILLS = ['Python', 'JavaScript', 'SQL', 'Java', 'React', 'AWS', 'Docker', 'Kubernetes',
+                      'Excel', 'Tableau', 'Go', 'TypeScript', 'Spark', 'Figma', 'Salesforce', 'Linux']
+
+def _weights(config: Dict[str, Any]) -> Tuple[List[str], np.ndarray]:
+    names = list(config)
+    weights = np.array([value[0] if isinstance(value, (tuple, list)) else value for value in config.values()],
+                       dtype=float)
+    return names, weights / weights.sum()
+
+def _experience_years(label: str) -> float:
+    digits = ''.join(ch if ch.isdigit() else ' ' for ch in label).split()
+    return float(digits[0]) if digits else 0.0
+
+def _description_table() -> np.ndarray:
+    """
+    Every description the generator can produce, indexed by one combined code
+    """
+    skills = DESCRIPTION_SKILLS
+    return np.array([template.format(area, first, second)
+                     for template in DESCRIPTION_TEMPLATES
+                     for area in DESCRIPTION_AREAS
+                     for first in skills
+                     for second in skills if second != first], dtype=object)
+
+def _generate_block(rng: np.random.Generator, n_rows: int, config: Dict[str, Any],
+                    descriptions: np.ndarray) -> pd.DataFrame:
+    titles, title_p = _weights(config['titles'])
+    locations, location_p = _weights(config['locations'])
+    experience, experience_p = _weights(config['experience'])
+    companies = np.array([prefix + suffix for prefix in COMPANY_PREFIXES for suffix in COMPANY_SUFFIXES], dtype=object)
+    # Zipf-like company sizes: a few large employers post most of the jobs
+    company_p = 1.0 / np.arange(1, len(companies) + 1) ** 0.8
+    company_p /= company_p.sum()
+
+    title_codes = rng.choice(len(titles), size=n_rows, p=title_p)
+    location_codes = rng.choice(len(locations), size=n_rows, p=location_p)
+    experience_codes = rng.choice(len(experience), size=n_rows, p=experience_p)
+    company_codes = rng.choice(len(companies), size=n_rows, p=company_p)
+    description_codes = rng.integers(0, len(descriptions), size=n_rows)
+
+    medians = np.array([config['titles'][title][1] for title in titles], dtype=float)
+    multipliers = np.array([config['locations'][location][1] for location in locations], dtype=float)
+    years = np.array([_experience_years(label) for label in experience])
+    salary = (medians[title_codes] * multipliers[location_codes] * (1 + 0.04 * years[experience_codes])
+              * rng.lognormal(0.0, config['salary_spread'], size=n_rows))
+    # Postings quote round thousands, so salaries index a small table of formatted strings
+    thousands = np.clip(np.rint(salary / 1000), 1, None).astype(np.int64)
+    low, high = thousands.min(initial=1), thousands.max(initial=1)
+    salary_table = np.array([config['salary_format'].format(k * 1000) for k in range(low, high + 1)], dtype=object)
+    salary_text = salary_table[thousands - low]
+    if config['missing_salary_rate'] > 0:
+        salary_text[rng.random(n_rows) < config['missing_salary_rate']] = None
+
+    return pd.DataFrame({
+        'Job Title': np.array(titles, dtype=object)[title_codes],
+        'Company': companies[company_codes],
+        'Location': np.array(locations, dtype=object)[location_codes],
+        'Experience': np.array(experience, dtype=object)[experience_codes],
+        'Salary': salary_text,
+        'Job Description': descriptions[description_codes]
+    })
+
+def iter_synthetic_jobs(n_rows: int,
+                        seed: int = 0,
+                        titles: Dict[str, Tuple[float, float]] = None,
+                        locations: Dict[str, Tuple[float, float]] = None,
+                        experience: Dict[str, float] = None,
+                        salary_format: str = '${:.0f}',
+                        salary_spread: float = 0.15,
+                        missing_salary_rate: float = 0.02) -> Iterator[pd.DataFrame]:
+    """
+    Yield synthetic raw job postings in blocks of BLOCK_ROWS rows
+
+    titles maps title -> (weight, median salary), locations maps
+    location -> (weight, salary multiplier) and experience maps an experience
+    string such as '3-5 years' -> weight. salary_format formats whole dollars
+    (e.g. '${:,.0f}' for '$120,000'); salary_spread is the log-normal sigma.
+    """
+    config = {
+        'titles': titles or DEFAULT_TITLES,
+        'locations': locations or DEFAULT_LOCATIONS,
+        'experience': experience or DEFAULT_EXPERIENCE,
+        'salary_format': salary_format,
+        'salary_spread': salary_spread,
+        'missing_salary_rate': missing_salary_rate
+    }
+    descriptions = _description_table()
+    for block, start in enumerate(range(0, n_rows, BLOCK_ROWS)):
+        rng = np.random.default_rng([seed, block])
+        frame = _generate_block(rng, min(BLOCK_ROWS, n_rows - start), config, descriptions)
+        frame.index = pd.RangeIndex(start, start + len(frame))
+        yield frame
+
+def generate_jobs(n_rows: int, seed: int = 0, **config) -> pd.DataFrame:
+    """
+    Synthetic raw job postings as one DataFrame (see iter_synthetic_jobs for options)
+    """
+    blocks = list(iter_synthetic_jobs(n_rows, seed=seed, **config))
+    if not blocks:
+        return next(iter_synthetic_jobs(1, seed=seed, **config)).iloc[:0]
+    return pd.concat(blocks)
+
+def write_synthetic_jobs(filename: str, n_rows: int, seed: int = 0, **config) -> Dict[str, Any]:
+    """
+    Stream synthetic postings to a CSV, gzip CSV, Parquet or Excel file
+
+    Memory stays at one block, so 10M-row files can be written. Returns the
+    export_jobs statistics.
+    """
+    from streaming_export import export_jobs
+
+    return export_jobs(iter_synthetic_jobs(n_rows, seed=seed, **config), filename)
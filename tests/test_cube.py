@@ -0,0 +1,29 @@
+"""
+Tests for the saved, incrementally refreshed job cube
+"""
+
+import os
+import python_functions as pf
+from cube import refresh_cube
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'sample_data', 'jobs_sample.csv')
+
+def test_refresh_reads_a_last_line_without_line_break(tmp_path):
+    with open(SAMPLE, 'rb') as f:
+        content = f.read().rstrip(b'\n')
+    path = tmp_path / 'jobs.csv'
+    path.write_bytes(content)
+    cube_path = str(tmp_path / 'jobs.cube.npz')
+
+    # The first refresh cannot tell the last line from one still being written
+    cube, info = refresh_cube(str(path), cube_path)
+    assert (info['rows_added'], cube.rows) == (14, 14)
+    cube, info = refresh_cube(str(path), cube_path)
+    assert (info['rows_added'], info['rebuilt']) == (1, False)
+    cube, info = refresh_cube(str(path), cube_path)
+    assert info['rows_added'] == 0
+
+    expected = pf.get_job_summary(pf.load_job_data(SAMPLE, use_cache=False))
+    summary = cube.job_summary()
+    for field in ('total_jobs', 'unique_locations', 'avg_salary', 'salary_range', 'top_locations'):
+        assert summary[field] == expected[field]
@@ -0,0 +1,40 @@
+"""
+Tests for incremental loading of a growing CSV file
+"""
+
+import os
+import pytest
+from incremental import IncrementalJobLoader
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'sample_data', 'jobs_sample.csv')
+
+@pytest.fixture
+def unterminated_csv(tmp_path):
+    # The sample without the line break after its last record
+    with open(SAMPLE, 'rb') as f:
+        content = f.read().rstrip(b'\n')
+    path = tmp_path / 'jobs.csv'
+    path.write_bytes(content)
+    return str(path)
+
+def test_last_line_without_line_break_is_read_once_the_file_settles(unterminated_csv):
+    loader = IncrementalJobLoader(unterminated_csv)
+    # It may still be being written, so the first refresh holds it back
+    assert len(loader.refresh()) == 14
+    assert len(loader.refresh()) == 1
+    assert len(loader.refresh()) == 0
+    assert loader.summary.rows == len(loader.data) == 15
+
+def test_a_growing_file_keeps_its_partial_last_line_back(unterminated_csv):
+    loader = IncrementalJobLoader(unterminated_csv)
+    loader.refresh()
+    with open(unterminated_csv, 'ab') as f:
+        f.write(b'\nQA Engineer,Acme,"Austin, TX",2 years')
+    # The size changed, so the previous last line is complete but the new one may not be
+    assert len(loader.refresh()) == 1
+    with open(unterminated_csv, 'ab') as f:
+        f.write(b',$90000,Test web applications\n')
+    delta = loader.refresh()
+    assert delta['Company'].tolist() == ['Acme']
+    assert delta['Salary'].tolist() == [90000]
+    assert loader.summary.rows == 16
@@ -0,0 +1,28 @@
+"""
+Tests for salary and experience parsing
+"""
+
+import pandas as pd
+import pytest
+from normalization import parse_experience, parse_salary
+
+def _salary(text: str) -> tuple:
+    row = parse_salary(pd.Series([text])).iloc[0]
+    return row['Salary_Min'], row['Salary_Max']
+
+@pytest.mark.parametrize('text', ['$100k through $120k', '$100k thru $120k', 'Starting today: $100k to $120k'])
+def test_period_words_inside_other_words_are_not_periods(text):
+    # 'hr' in 'through'/'thru' and 'day' in 'today' used to annualize these as hourly/daily pay
+    assert _salary(text) == (100_000, 120_000)
+
+@pytest.mark.parametrize('text, expected', [
+    ('$45/hr', 93_600), ('$45hr', 93_600), ('$45 per hour', 93_600), ('$45/h', 93_600),
+    ('$500/day', 130_000), ('$2000 weekly', 104_000), ('$8000/mo', 96_000),
+    ('$120k per annum', 120_000), ('$120k/yr', 120_000)
+])
+def test_pay_periods_are_annualized(text, expected):
+    assert _salary(text) == (expected, expected)
+
+def test_month_units_need_a_whole_word():
+    parsed = parse_experience(pd.Series(['6 months', '6 mo', '3 monitoring']))
+    assert parsed['Experience_Min'].tolist() == [0.5, 0.5, 3.0]